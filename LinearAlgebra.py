@@ -27,9 +27,18 @@
 #
 #########################################################################################
 import math
+import os
 import bpy
 import bmesh
+import types
 import random
+import hashlib
+import tempfile
+import zipfile
+import json
+import inspect
+import functools
+import contextlib
 import numpy as np
 
 try:
@@ -154,8 +163,33 @@ def object_data_add(context, obdata, operator=None, name=None):
 #
 #
 #
+def tagged(datablock):
+	"""
+	Marks a datablock as created by this module, so that clear() and the incremental mode can remove it,
+	and returns it
+	Parameters:
+	   datablock: any datablock
+	"""
+	datablock["LinearAlgebra"] = True
+	return datablock
+#
+#
+#
+def session_uids(collection):
+	"""
+	Returns the array of the session_uid of the datablocks of a collection of bpy.data, read with
+	foreach_get. The session_uid of a new datablock is greater than the ones of the existing datablocks
+	Parameters:
+	   collection: a collection of bpy.data, for instance bpy.data.objects
+	"""
+	uids = np.empty(len(collection),dtype=np.int32)
+	collection.foreach_get("session_uid",uids)
+	return uids
+#
+#
+#
 def create_mesh_object(context,verts,edges,faces,name):
-	mesh = bpy.data.meshes.new(name)
+	mesh = tagged(bpy.data.meshes.new(name))
 	mesh.from_pydata(verts, edges, faces)
 	mesh.update()
 	return object_data_add(context, mesh, operator=None)
@@ -206,7 +240,7 @@ def createFaces(vertIdx1,vertIdx2,closed=False,flipped=False):
 #
 #
 #
-def draw_parametric_surface(eq,range_u_min,range_u_max,range_u_step,range_v_min,range_v_max,range_v_step,name,wrap_u=False,wrap_v=False,close_v=False):
+def parametric_surface_data(eq,range_u_min,range_u_max,range_u_step,range_v_min,range_v_max,range_v_step,wrap_u=False,wrap_v=False,close_v=False):
 	verts = []
 	faces = []
 	if not callable(range_u_min) and not callable(range_u_max):
@@ -249,837 +283,3252 @@ def draw_parametric_surface(eq,range_u_min,range_u_max,range_u_step,range_v_min,
 		for uN in range(1, range_u_step - 1):
 			faces.append([range_u_step - 1,range_u_step - 1 - uN,range_u_step - 2 - uN])
 			faces.append([range_v_step * uRange,range_v_step * uRange + uN,range_v_step * uRange + uN + 1])
+	return verts, faces
+#
+#
+#
+def draw_parametric_surface(eq,range_u_min,range_u_max,range_u_step,range_v_min,range_v_max,range_v_step,name,wrap_u=False,wrap_v=False,close_v=False):
+	verts, faces = parametric_surface_data(eq,range_u_min,range_u_max,range_u_step,range_v_min,range_v_max,range_v_step,wrap_u=wrap_u,wrap_v=wrap_v,close_v=close_v)
 	create_mesh_object(bpy.context,verts, [], faces, name)
 #
 #
 #
-class Color():
+def revolution_mesh_data(profiles,segments=128,axis='Z',caps=False,eps=1e-9,angles=False):
 	"""
-    Class that defines a color in RGB format
-    """
-	def __init__(self,r,g,b,name):
-		self.r = r
-		self.g = g
-		self.b = b
-		self.name = name
+	Revolves a list of polylines around a coordinate axis and returns the arrays verts, loops and
+	sizes of the mesh. The points of the polylines on the axis are shared by all the angles, so
+	the faces around them are triangles. If angles is True, the array with the angle of rotation
+	of every vertex is also returned
+	Parameters:
+	   profiles: list of arrays of shape (n,3) with the points of the polylines
+
+	   segments: number of angular steps of the revolution
+
+	   axis: axis of revolution. It must be 'X', 'Y' or 'Z'
+
+	   caps: if True, the ends of the polylines that are not on the axis are closed with a disk
+
+	   eps: points whose distance to the axis is smaller than eps are on the axis
+
+	   angles: if True, the angles of the vertices are also returned
+	"""
+	k = "XYZ".index(axis)
+	i = (k + 1) % 3
+	j = (k + 2) % 3
+	theta = np.linspace(0.0,2 * math.pi,segments,endpoint=False)
+	c = np.cos(theta)
+	s = np.sin(theta)
+	verts = []
+	thetas = []
+	quads = []
+	triangles = []
+	count = 0
+	for profile in profiles:
+		p = np.asarray(profile,dtype=float).reshape(-1,3)
+		if len(p) < 2:
+			continue
+		pole = np.hypot(p[:,i],p[:,j]) < eps
+		ring = p[~pole]
+		rings = np.empty((len(ring),segments,3))
+		rings[:,:,k] = ring[:,k,None]
+		rings[:,:,i] = ring[:,i,None] * c - ring[:,j,None] * s
+		rings[:,:,j] = ring[:,i,None] * s + ring[:,j,None] * c
+		poles = np.zeros((pole.sum(),3))
+		poles[:,k] = p[pole,k]
+		index = np.empty((len(p),segments),dtype=np.int64)
+		index[~pole] = count + np.arange(len(ring) * segments).reshape(-1,segments)
+		index[pole] = count + len(ring) * segments + np.arange(len(poles))[:,None]
+		verts.append(rings.reshape(-1,3))
+		verts.append(poles)
+		thetas.append(np.tile(theta,len(ring)))
+		thetas.append(np.zeros(len(poles)))
+		count += len(ring) * segments + len(poles)
+		a = index[:-1]
+		b = index[1:]
+		an = np.roll(a,-1,axis=1)
+		bn = np.roll(b,-1,axis=1)
+		pa = np.repeat(pole[:-1,None],segments,axis=1)
+		pb = np.repeat(pole[1:,None],segments,axis=1)
+		faces = np.stack([a,an,bn,b],axis=-1)
+		quads.append(faces[~pa & ~pb])
+		triangles.append(faces[pa & ~pb][:,[0,2,3]])
+		triangles.append(faces[~pa & pb][:,[0,1,2]])
+		if caps:
+			for end, first in ((0,True),(-1,False)):
+				if pole[end]:
+					continue
+				center = np.zeros(3)
+				center[k] = p[end,k]
+				verts.append(center[None,:])
+				thetas.append(np.zeros(1))
+				row = index[end]
+				fan = np.full(segments,count)
+				if first:
+					triangles.append(np.stack([fan,np.roll(row,-1),row],axis=-1))
+				else:
+					triangles.append(np.stack([fan,row,np.roll(row,-1)],axis=-1))
+				count += 1
+	verts = np.concatenate(verts) if len(verts) > 0 else np.zeros((0,3))
+	quads = np.concatenate(quads) if len(quads) > 0 else np.zeros((0,4),dtype=np.int64)
+	triangles = np.concatenate(triangles) if len(triangles) > 0 else np.zeros((0,3),dtype=np.int64)
+	loops = np.concatenate([quads.ravel(),triangles.ravel()])
+	sizes = np.concatenate([np.full(len(quads),4),np.full(len(triangles),3)])
+	if angles:
+		thetas = np.concatenate(thetas) if len(thetas) > 0 else np.zeros(0)
+		return verts, loops, sizes, thetas
+	return verts, loops, sizes
 #
 #
 #
-class Colors():
+def mesh_from_arrays(name,verts,loops,sizes,smooth=True):
 	"""
-	Class that defines a list of colors by name
+	Creates a mesh from arrays with foreach_set
+	Parameters:
+	   name: name of the mesh
+
+	   verts: array of shape (n,3) with the coordinates of the vertices
+
+	   loops: array with the indices of the vertices of all the faces
+
+	   sizes: array with the number of vertices of every face
+
+	   smooth: if True, the faces are smooth shaded
 	"""
-	colorsbyname = {
-		'Black' : Color(0,0,0,'Black'),
-		'GrayObscure' : Color(0.2,0.2,0.2,'GrayObscure'),
-		'GrayDark' : Color(0.4,0.4,0.4,'GrayDark'),
-		'GrayLight' : Color(0.6,0.6,0.6,'GrayLight'),
-		'GrayPale' : Color(0.8,0.8,0.8,'GrayPale'),
-		'White' : Color(1,1,1,'White'),
-		'Red' : Color(1,0,0,'Red'),
-		'RedDarkHard' : Color(0.8,0,0,'RedDarkHard'),
-		'RedLightHard' : Color(1,0.2,0.2,'RedLightHard'),
-		'RedDarkFaded' : Color(0.6,0,0,'RedDarkFaded'),
-		'RedMediumFaded' : Color(0.8,0.2,0.2,'RedMediumFaded'),
-		'RedLightFaded' : Color(1,0.4,0.4,'RedLightFaded'),
-		'RedObscureDull' : Color(0.4,0,0,'RedObscureDull'),
-		'RedDarkDull' : Color(0.6,0.2,0.2,'RedDarkDull'),
-		'RedLightDull' : Color(0.8,0.4,0.4,'RedLightDull'),
-		'RedPaleDull' : Color(1,0.6,0.6,'RedPaleDull'),
-		'RedObscureWeak' : Color(0.2,0,0,'RedObscureWeak'),
-		'RedDarkWeak' : Color(0.4,0.2,0.2,'RedDarkWeak'),
-		'RedMediumWeak' : Color(0.6,0.4,0.4,'RedMediumWeak'),
-		'RedLightWeak' : Color(0.8,0.6,0.6,'RedLightWeak'),
-		'RedPaleWeak' : Color(1,0.8,0.8,'RedPaleWeak'),
-		'Orange' : Color(1,0.37,0.12,'Orange'),
-		'OrangeRedDark' : Color(0.6,0.2,0,'OrangeRedDark'),
-		'OrangeRedMedium' : Color(0.8,0.4,0.2,'OrangeRedMedium'),
-		'OrangeRedLight' : Color(1,0.6,0.4,'OrangeRedLight'),
-		'OrangeOrangeRed' : Color(1,0.4,0,'OrangeOrangeRed'),
-		'RedOrangeDark' : Color(0.8,0.2,0,'RedOrangeDark'),
-		'RedOrangeLight' : Color(1,0.4,0.2,'RedOrangeLight'),
-		'RedRedOrange' : Color(1,0.2,0,'RedRedOrange'),
-		'OrangeDarkHard' : Color(0.8,0.4,0,'OrangeDarkHard'),
-		'OrangeLightHard' : Color(1,0.6,0.2,'OrangeLightHard'),
-		'OrangeObscureDull' : Color(0.4,0.2,0,'OrangeObscureDull'),
-		'OrangeDarkDull' : Color(0.6,0.4,0.2,'OrangeDarkDull'),
-		'OrangeLightDull' : Color(0.8,0.6,0.4,'OrangeLightDull'),
-		'OrangePaleDull' : Color(1,0.8,0.6,'OrangePaleDull'),
-		'OrangeYellowDark' : Color(0.6,0.4,0,'OrangeYellowDark'),
-		'OrangeYellowMedium' : Color(0.8,0.6,0.2,'OrangeYellowMedium'),
-		'OrangeYellowLight' : Color(1,0.8,0.4,'OrangeYellowLight'),
-		'OrangeOrangeYellow' : Color(1,0.6,0,'OrangeOrangeYellow'),
-		'YellowOrangeDark' : Color(0.8,0.6,0,'YellowOrangeDark'),
-		'YellowOrangeLight' : Color(1,0.8,0.2,'YellowOrangeLight'),
-		'YellowYellowOrange' : Color(1,0.8,0,'YellowYellowOrange'),
-		'Yellow' : Color(1,1,0,'Yellow'),
-		'YellowDarkHard' : Color(0.8,0.8,0,'YellowDarkHard'),
-		'YellowLightHard' : Color(1,1,0.2,'YellowLightHard'),
-		'YellowDarkFaded' : Color(0.6,0.6,0,'YellowDarkFaded'),
-		'YellowMediumFaded' : Color(0.8,0.8,0.2,'YellowMediumFaded'),
-		'YellowLightFaded' : Color(1,1,0.4,'YellowLightFaded'),
-		'YellowObscureDull' : Color(0.4,0.4,0,'YellowObscureDull'),
-		'YellowDarkDull' : Color(0.6,0.6,0.2,'YellowDarkDull'),
-		'YellowLightDull' : Color(0.8,0.8,0.4,'YellowLightDull'),
-		'YellowPaleDull' : Color(1,1,0.6,'YellowPaleDull'),
-		'YellowObscureWeak' : Color(0.2,0.2,0,'YellowObscureWeak'),
-		'YellowDarkWeak' : Color(0.4,0.4,0.2,'YellowDarkWeak'),
-		'YellowMediumWeak' : Color(0.6,0.6,0.4,'YellowMediumWeak'),
-		'YellowLightWeak' : Color(0.8,0.8,0.6,'YellowLightWeak'),
-		'YellowPaleWeak' : Color(1,1,0.8,'YellowPaleWeak'),
-		'SpringYellowDark' : Color(0.4,0.6,0,'SpringYellowDark'),
-		'SpringYellowMedium' : Color(0.6,0.8,0.2,'SpringYellowMedium'),
-		'SpringYellowLight' : Color(0.8,1,0.4,'SpringYellowLight'),
-		'SpringSpringYellow' : Color(0.6,1,0,'SpringSpringYellow'),
-		'YellowSpringDark' : Color(0.6,0.8,0,'YellowSpringDark'),
-		'YellowSpringLight' : Color(0.8,1,0.2,'YellowSpringLight'),
-		'YellowYellowSpring' : Color(0.8,1,0,'YellowYellowSpring'),
-		'SpringDarkHard' : Color(0.4,0.8,0,'SpringDarkHard'),
-		'SpringLightHard' : Color(0.6,1,0.2,'SpringLightHard'),
-		'SpringObscureDull' : Color(0.2,0.4,0,'SpringObscureDull'),
-		'SpringDarkDull' : Color(0.4,0.6,0.2,'SpringDarkDull'),
-		'SpringLightDull' : Color(0.6,0.8,0.4,'SpringLightDull'),
-		'SpringPaleDull' : Color(0.8,1,0.6,'SpringPaleDull'),
-		'SpringGreenDark' : Color(0.2,0.6,0,'SpringGreenDark'),
-		'SpringGreenMedium' : Color(0.4,0.8,0.2,'SpringGreenMedium'),
-		'SpringGreenLight' : Color(0.6,1,0.4,'SpringGreenLight'),
-		'SpringSpringGreen' : Color(0.4,1,0,'SpringSpringGreen'),
-		'GreenSpringDark' : Color(0.2,0.8,0,'GreenSpringDark'),
-		'GreenSpringLight' : Color(0.4,1,0.2,'GreenSpringLight'),
-		'GreenGreenSpring' : Color(0.2,1,0,'GreenGreenSpring'),
-		'Green' : Color(0,1,0,'Green'),
-		'GreenDarkHard' : Color(0,0.8,0,'GreenDarkHard'),
-		'GreenLightHard' : Color(0.2,1,0.2,'GreenLightHard'),
-		'GreenDarkFaded' : Color(0,0.6,0,'GreenDarkFaded'),
-		'GreenMediumFaded' : Color(0.2,0.8,0.2,'GreenMediumFaded'),
-		'GreenLightFaded' : Color(0.4,1,0.4,'GreenLightFaded'),
-		'GreenObscureDull' : Color(0,0.4,0,'GreenObscureDull'),
-		'GreenDarkDull' : Color(0.2,0.6,0.2,'GreenDarkDull'),
-		'GreenLightDull' : Color(0.4,0.8,0.4,'GreenLightDull'),
-		'GreenPaleDull' : Color(0.6,1,0.6,'GreenPaleDull'),
-		'GreenObscureWeak' : Color(0,0.2,0,'GreenObscureWeak'),
-		'GreenDarkWeak' : Color(0.2,0.4,0.2,'GreenDarkWeak'),
-		'GreenMediumWeak' : Color(0.4,0.6,0.4,'GreenMediumWeak'),
-		'GreenLightWeak' : Color(0.6,0.8,0.6,'GreenLightWeak'),
-		'GreenPaleWeak' : Color(0.8,1,0.8,'GreenPaleWeak'),
-		'TealGreenDark' : Color(0,0.6,0.2,'TealGreenDark'),
-		'TealGreenMedium' : Color(0.2,0.8,0.4,'TealGreenMedium'),
-		'TealGreenLight' : Color(0.4,1,0.6,'TealGreenLight'),
-		'TealTealGreen' : Color(0,1,0.4,'TealTealGreen'),
-		'GreenTealDark' : Color(0,0.8,0.2,'GreenTealDark'),
-		'GreenTealLight' : Color(0.2,1,0.4,'GreenTealLight'),
-		'GreenGreenTeal' : Color(0,1,0.2,'GreenGreenTeal'),
-		'TealDarkHard' : Color(0,0.8,0.4,'TealDarkHard'),
-		'TealLightHard' : Color(0.2,1,0.6,'TealLightHard'),
-		'TealObscureDull' : Color(0,0.4,0.2,'TealObscureDull'),
-		'TealDarkDull' : Color(0.2,0.6,0.4,'TealDarkDull'),
-		'TealLightDull' : Color(0.4,0.8,0.6,'TealLightDull'),
-		'TealPaleDull' : Color(0.6,1,0.8,'TealPaleDull'),
-		'TealCyanDark' : Color(0,0.6,0.4,'TealCyanDark'),
-		'TealCyanMedium' : Color(0.2,0.8,0.6,'TealCyanMedium'),
-		'TealCyanLight' : Color(0.4,1,0.8,'TealCyanLight'),
-		'TealTealCyan' : Color(0,1,0.6,'TealTealCyan'),
-		'CyanTealDark' : Color(0,0.8,0.6,'CyanTealDark'),
-		'CyanTealLight' : Color(0.2,1,0.8,'CyanTealLight'),
-		'CyanCyanTeal' : Color(0,1,0.8,'CyanCyanTeal'),
-		'Cyan' : Color(0,1,1,'Cyan'),
-		'CyanDarkHard' : Color(0,0.8,0.8,'CyanDarkHard'),
-		'CyanLightHard' : Color(0.2,1,1,'CyanLightHard'),
-		'CyanDarkFaded' : Color(0,0.6,0.6,'CyanDarkFaded'),
-		'CyanMediumFaded' : Color(0.2,0.8,0.8,'CyanMediumFaded'),
-		'CyanLightFaded' : Color(0.4,1,1,'CyanLightFaded'),
-		'CyanObscureDull' : Color(0,0.4,0.4,'CyanObscureDull'),
-		'CyanDarkDull' : Color(0.2,0.6,0.6,'CyanDarkDull'),
-		'CyanLightDull' : Color(0.4,0.8,0.8,'CyanLightDull'),
-		'CyanPaleDull' : Color(0.6,1,1,'CyanPaleDull'),
-		'CyanObscureWeak' : Color(0,0.2,0.2,'CyanObscureWeak'),
-		'CyanDarkWeak' : Color(0.2,0.4,0.4,'CyanDarkWeak'),
-		'CyanMediumWeak' : Color(0.4,0.6,0.6,'CyanMediumWeak'),
-		'CyanLightWeak' : Color(0.6,0.8,0.8,'CyanLightWeak'),
-		'CyanPaleWeak' : Color(0.8,1,1,'CyanPaleWeak'),
-		'AzureCyanDark' : Color(0,0.4,0.6,'AzureCyanDark'),
-		'AzureCyanMedium' : Color(0.2,0.6,0.8,'AzureCyanMedium'),
-		'AzureCyanLight' : Color(0.4,0.8,1,'AzureCyanLight'),
-		'AzureAzureCyan' : Color(0,0.6,1,'AzureAzureCyan'),
-		'CyanAzureDark' : Color(0,0.6,0.8,'CyanAzureDark'),
-		'CyanAzureLight' : Color(0.2,0.8,1,'CyanAzureLight'),
-		'CyanCyanAzure' : Color(0,0.8,1,'CyanCyanAzure'),
-		'AzureDarkHard' : Color(0,0.4,0.8,'AzureDarkHard'),
-		'AzureLightHard' : Color(0.2,0.6,1,'AzureLightHard'),
-		'AzureObscureDull' : Color(0,0.2,0.4,'AzureObscureDull'),
-		'AzureDarkDull' : Color(0.2,0.4,0.6,'AzureDarkDull'),
-		'AzureLightDull' : Color(0.4,0.6,0.8,'AzureLightDull'),
-		'AzurePaleDull' : Color(0.6,0.8,1,'AzurePaleDull'),
-		'AzureBlueDark' : Color(0,0.2,0.6,'AzureBlueDark'),
-		'AzureBlueMedium' : Color(0.2,0.4,0.8,'AzureBlueMedium'),
-		'AzureBlueLight' : Color(0.4,0.6,1,'AzureBlueLight'),
-		'AzureAzureBlue' : Color(0,0.4,1,'AzureAzureBlue'),
-		'BlueAzureDark' : Color(0,0.2,0.8,'BlueAzureDark'),
-		'BlueAzureLight' : Color(0.2,0.4,1,'BlueAzureLight'),
-		'BlueBlueAzure' : Color(0,0.2,1,'BlueBlueAzure'),
-		'Blue' : Color(0,0,1,'Blue'),
-		'BlueDarkHard' : Color(0,0,0.8,'BlueDarkHard'),
-		'BlueLightHard' : Color(0.2,0.2,1,'BlueLightHard'),
-		'BlueDarkFaded' : Color(0,0,0.6,'BlueDarkFaded'),
-		'BlueMediumFaded' : Color(0.2,0.2,0.8,'BlueMediumFaded'),
-		'BlueLightFaded' : Color(0.4,0.4,1,'BlueLightFaded'),
-		'BlueObscureDull' : Color(0,0,0.4,'BlueObscureDull'),
-		'BlueDarkDull' : Color(0.2,0.2,0.6,'BlueDarkDull'),
-		'BlueLightDull' : Color(0.4,0.4,0.8,'BlueLightDull'),
-		'BluePaleDull' : Color(0.6,0.6,1,'BluePaleDull'),
-		'BlueObscureWeak' : Color(0,0,0.2,'BlueObscureWeak'),
-		'BlueDarkWeak' : Color(0.2,0.2,0.4,'BlueDarkWeak'),
-		'BlueMediumWeak' : Color(0.4,0.4,0.6,'BlueMediumWeak'),
-		'BlueLightWeak' : Color(0.6,0.6,0.8,'BlueLightWeak'),
-		'BluePaleWeak' : Color(0.8,0.8,1,'BluePaleWeak'),
-		'VioletBlueDark' : Color(0.2,0,0.6,'VioletBlueDark'),
-		'VioletBlueMedium' : Color(0.4,0.2,0.8,'VioletBlueMedium'),
-		'VioletBlueLight' : Color(0.6,0.4,1,'VioletBlueLight'),
-		'VioletVioletBlue' : Color(0.4,0,1,'VioletVioletBlue'),
-		'BlueVioletDark' : Color(0.2,0,0.8,'BlueVioletDark'),
-		'BlueVioletLight' : Color(0.4,0.2,1,'BlueVioletLight'),
-		'BlueBlueViolet' : Color(0.2,0,1,'BlueBlueViolet'),
-		'VioletDarkHard' : Color(0.4,0,0.8,'VioletDarkHard'),
-		'VioletLightHard' : Color(0.6,0.2,1,'VioletLightHard'),
-		'VioletObscureDull' : Color(0.2,0,0.4,'VioletObscureDull'),
-		'VioletDarkDull' : Color(0.4,0.2,0.6,'VioletDarkDull'),
-		'VioletLightDull' : Color(0.6,0.4,0.8,'VioletLightDull'),
-		'VioletPaleDull' : Color(0.8,0.6,1,'VioletPaleDull'),
-		'VioletMagentaDark' : Color(0.4,0,0.6,'VioletMagentaDark'),
-		'VioletMagentaMedium' : Color(0.6,0.2,0.8,'VioletMagentaMedium'),
-		'VioletMagentaLight' : Color(0.8,0.4,1,'VioletMagentaLight'),
-		'VioletVioletMagenta' : Color(0.6,0,1,'VioletVioletMagenta'),
-		'MagentaVioletDark' : Color(0.6,0,0.8,'MagentaVioletDark'),
-		'MagentaVioletLight' : Color(0.8,0.2,1,'MagentaVioletLight'),
-		'MagentaMagentaViolet' : Color(0.8,0,1,'MagentaMagentaViolet'),
-		'Magenta' : Color(1,0,1,'Magenta'),
-		'MagentaDarkHard' : Color(0.8,0,0.8,'MagentaDarkHard'),
-		'MagentaLightHard' : Color(1,0.2,1,'MagentaLightHard'),
-		'MagentaDarkFaded' : Color(0.6,0,0.6,'MagentaDarkFaded'),
-		'MagentaMediumFaded' : Color(0.8,0.2,0.8,'MagentaMediumFaded'),
-		'MagentaLightFaded' : Color(1,0.4,1,'MagentaLightFaded'),
-		'MagentaObscureDull' : Color(0.4,0,0.4,'MagentaObscureDull'),
-		'MagentaDarkDull' : Color(0.6,0.2,0.6,'MagentaDarkDull'),
-		'MagentaLightDull' : Color(0.8,0.4,0.8,'MagentaLightDull'),
-		'MagentaPaleDull' : Color(1,0.6,1,'MagentaPaleDull'),
-		'MagentaObscureWeak' : Color(0.2,0,0.2,'MagentaObscureWeak'),
-		'MagentaDarkWeak' : Color(0.4,0.2,0.4,'MagentaDarkWeak'),
-		'MagentaMediumWeak' : Color(0.6,0.4,0.6,'MagentaMediumWeak'),
-		'MagentaLightWeak' : Color(0.8,0.6,0.8,'MagentaLightWeak'),
-		'MagentaPaleWeak' : Color(1,0.8,1,'MagentaPaleWeak'),
-		'PinkMagentaDark' : Color(0.6,0,0.4,'PinkMagentaDark'),
-		'PinkMagentaMedium' : Color(0.8,0.2,0.6,'PinkMagentaMedium'),
-		'PinkMagentaLight' : Color(1,0.4,0.8,'PinkMagentaLight'),
-		'PinkPinkMagenta' : Color(1,0,0.6,'PinkPinkMagenta'),
-		'MagentaPinkDark' : Color(0.8,0,0.6,'MagentaPinkDark'),
-		'MagentaPinkLight' : Color(1,0.2,0.8,'MagentaPinkLight'),
-		'MagentaMagentaPink' : Color(1,0,0.8,'MagentaMagentaPink'),
-		'PinkDarkHard' : Color(0.8,0,0.4,'PinkDarkHard'),
-		'PinkLightHard' : Color(1,0.2,0.6,'PinkLightHard'),
-		'PinkObscureDull' : Color(0.4,0,0.2,'PinkObscureDull'),
-		'PinkDarkDull' : Color(0.6,0.2,0.4,'PinkDarkDull'),
-		'PinkLightDull' : Color(0.8,0.4,0.6,'PinkLightDull'),
-		'PinkPaleDull' : Color(1,0.6,0.8,'PinkPaleDull'),
-		'PinkRedDark' : Color(0.6,0,0.2,'PinkRedDark'),
-		'PinkRedMedium' : Color(0.8,0.2,0.4,'PinkRedMedium'),
-		'PinkRedLight' : Color(1,0.4,0.6,'PinkRedLight'),
-		'PinkPinkRed' : Color(1,0,0.4,'PinkPinkRed'),
-		'RedPinkDark' : Color(0.8,0,0.2,'RedPinkDark'),
-		'RedPinkLight' : Color(1,0.2,0.4,'RedPinkLight'),
-		'RedRedPink' : Color(1,0,0.2,'RedRedPink')
+	mesh = tagged(bpy.data.meshes.new(name))
+	mesh.vertices.add(len(verts))
+	mesh.vertices.foreach_set("co",np.asarray(verts,dtype=np.float32).ravel())
+	mesh.loops.add(len(loops))
+	mesh.loops.foreach_set("vertex_index",np.asarray(loops,dtype=np.int32))
+	mesh.polygons.add(len(sizes))
+	starts = np.concatenate([[0],np.cumsum(sizes)[:-1]]).astype(np.int32)
+	mesh.polygons.foreach_set("loop_start",starts)
+	if bpy.app.version[0] < 4:
+		mesh.polygons.foreach_set("loop_total",np.asarray(sizes,dtype=np.int32))
+	mesh.polygons.foreach_set("use_smooth",np.full(len(sizes),smooth,dtype=bool))
+	mesh.update(calc_edges=True)
+	mesh.validate()
+	return mesh
+#
+#
+#
+def arrows_mesh_data(origins,vectors,radius=0.05,segments=8):
+	"""
+	Returns the arrays verts, loops and sizes, as required by mesh_from_arrays, of a family of arrows.
+	Every arrow is a cylinder followed by a cone and all of them are computed at once. The null vectors
+	are skipped, so the arrays are empty if all the vectors are null
+	Parameters:
+	   origins: a point or an array of shape (n,3) with the origins of the arrows
+
+	   vectors: array of shape (n,3) with the vectors
+
+	   radius: radius of the cylinders
+
+	   segments: number of sides of the cylinders and the cones
+	"""
+	vectors = np.asarray(vectors,dtype=float).reshape(-1,3)
+	origins = np.broadcast_to(np.asarray(origins,dtype=float).reshape(-1,3),vectors.shape)
+	length = np.linalg.norm(vectors,axis=1)
+	keep = length > 0.0
+	vectors, origins, length = vectors[keep], origins[keep], length[keep]
+	n = len(vectors)
+	if n == 0:
+		return np.empty((0,3)), np.empty(0,dtype=np.int64), np.empty(0,dtype=np.int64)
+	w = vectors / length[:,None]
+	#
+	# Orthonormal vectors e1, e2 perpendicular to every vector
+	#
+	a = np.zeros((n,3))
+	a[np.arange(n),np.argmin(np.abs(w),axis=1)] = 1.0
+	e1 = np.cross(w,a)
+	e1 /= np.linalg.norm(e1,axis=1)[:,None]
+	e2 = np.cross(w,e1)
+	phi = 2 * math.pi * np.arange(segments) / segments
+	ring = np.cos(phi)[None,:,None] * e1[:,None,:] + np.sin(phi)[None,:,None] * e2[:,None,:]
+	head = np.minimum(0.4 * length,10 * radius)
+	base = origins + (length - head)[:,None] * w
+	verts = np.concatenate([origins[:,None,:] + radius * ring,
+							base[:,None,:] + radius * ring,
+							base[:,None,:] + 1.5 * radius * ring,
+							(origins + vectors)[:,None,:]],axis=1)
+	#
+	# Faces of one arrow: bottom cap, sides of the cylinder, base of the cone and sides of the cone
+	#
+	k = np.arange(segments)
+	k1 = (k + 1) % segments
+	apex = 3 * segments
+	loops = np.concatenate([k[::-1],
+							np.stack([k,k1,segments + k1,segments + k],axis=1).ravel(),
+							2 * segments + k[::-1],
+							np.stack([2 * segments + k,2 * segments + k1,np.full(segments,apex)],axis=1).ravel()])
+	sizes = np.concatenate([[segments],np.full(segments,4),[segments],np.full(segments,3)])
+	loops = (loops[None,:] + verts.shape[1] * np.arange(n)[:,None]).ravel()
+	return verts.reshape(-1,3), loops, np.tile(sizes,n)
+#
+#
+#
+def fibonacci_sphere(n):
+	"""
+	Returns an array of shape (n,3) with n unit vectors almost uniformly distributed on the sphere
+	Parameters:
+	   n: number of vectors
+	"""
+	k = np.arange(n) + 0.5
+	z = 1.0 - 2.0 * k / n
+	r = np.sqrt(1.0 - z**2)
+	theta = math.pi * (3.0 - math.sqrt(5.0)) * k
+	return np.stack([r * np.cos(theta),r * np.sin(theta),z],axis=1)
+#
+#
+#
+def null_space(matrix,tol):
+	"""
+	Returns an array whose rows are an orthonormal basis of the null space of a matrix
+	Parameters:
+	   matrix: a square matrix
+
+	   tol: singular values smaller than tol are zero
+	"""
+	u, s, vh = np.linalg.svd(matrix)
+	return vh[np.sum(s > tol):]
+#
+#
+#
+def invariant_subspaces(matrix,eps=1e-6):
+	"""
+	Returns the lists lines and planes of the real invariant subspaces of a 3x3 matrix given by its
+	eigenvalues. Every element of lines is a pair (eigenvalue,vector) with a real eigenvalue and a unit
+	vector of an eigenspace of dimension 1. Every element of planes is a tuple (eigenvalue,v1,v2) where
+	v1 and v2 generate an invariant plane, that can be:
+	   an eigenspace of dimension 2 or the null space of (A - eigenvalue I)^2 for a defective eigenvalue
+
+	   the plane generated by two lines of different real eigenvalues. In this case eigenvalue is the
+	   pair of eigenvalues
+
+	   the plane generated by the real and imaginary parts of an eigenvector of a complex eigenvalue
+	The eigenvalues closer than 100 eps are considered equal
+	Parameters:
+	   matrix: a 3x3 matrix
+
+	   eps: relative tolerance
+	"""
+	A = np.array(matrix,dtype=float)
+	tol = eps * max(1.0,np.linalg.norm(A))
+	values, vectors = np.linalg.eig(A)
+	real = np.sort(values[np.abs(values.imag) <= tol].real)
+	clusters = []
+	for x in real:
+		if len(clusters) > 0 and x - clusters[-1][-1] <= 100 * tol:
+			clusters[-1].append(x)
+		else:
+			clusters.append([x])
+	lines = []
+	planes = []
+	identity = np.identity(3)
+	for cluster in clusters:
+		value = float(np.mean(cluster))
+		B = A - value * identity
+		kernel = null_space(B,tol)
+		if len(kernel) == 0:
+			kernel = null_space(B,np.linalg.svd(B,compute_uv=False)[-1])
+		if len(kernel) >= 3:
+			lines.extend((value,w) for w in kernel)
+		elif len(kernel) == 2:
+			planes.append((value,kernel[0],kernel[1]))
+		else:
+			lines.append((value,kernel[0]))
+			if len(cluster) > 1:
+				kernel = null_space(B @ B,tol)
+				if len(kernel) == 2:
+					planes.append((value,kernel[0],kernel[1]))
+	simple = [(value,w) for value, w in lines if sum(1 for c in lines if c[0] == value) == 1]
+	for i in range(len(simple)):
+		for j in range(i + 1,len(simple)):
+			planes.append(((simple[i][0],simple[j][0]),simple[i][1],simple[j][1]))
+	for i in range(len(values)):
+		if values[i].imag > tol:
+			planes.append((values[i],vectors[:,i].real,vectors[:,i].imag))
+	return lines, planes
+#
+#
+#
+def action_fcurves(obj):
+	"""
+	Returns the collection of F-curves of the action of an object, creating the action if needed.
+	With layered actions (Blender 4.4 and later) the channelbag of the slot of the object is used
+	Parameters:
+	   obj: the object or any other animatable datablock, for instance the shape keys of a mesh
+	"""
+	if obj.animation_data is None:
+		obj.animation_data_create()
+	animation = obj.animation_data
+	if animation.action is None:
+		animation.action = tagged(bpy.data.actions.new(obj.name + "Action"))
+	action = animation.action
+	try:
+		return action.fcurves
+	except AttributeError:
+		from bpy_extras import anim_utils
+		if animation.action_slot is None:
+			animation.action_slot = action.slots.new(id_type=obj.id_type,name=obj.name)
+		return anim_utils.action_ensure_channelbag_for_slot(action,animation.action_slot)
+#
+#
+#
+def insert_keyframes(obj,data_path,frames,values,interpolation='LINEAR'):
+	"""
+	Inserts all the keyframes of a property at once, without changing the current frame. As
+	keyframe_insert does, the existing keyframes between the first and the last frame are replaced
+	Parameters:
+	   obj: the object or any other animatable datablock
+
+	   data_path: path of the property, for instance "rotation_quaternion"
+
+	   frames: list of n frames
+
+	   values: list of n values or array of shape (n,k) for properties with k components
+
+	   interpolation: interpolation of the keyframes
+	"""
+	frames = np.asarray(frames,dtype=float)
+	values = np.asarray(values,dtype=float)
+	if values.ndim == 1:
+		values = values[:,None]
+	fcurves = action_fcurves(obj)
+	for index in range(values.shape[1]):
+		fcurve = fcurves.find(data_path,index=index)
+		if fcurve is None:
+			fcurve = fcurves.new(data_path,index=index)
+		points = fcurve.keyframe_points
+		old = np.empty(2 * len(points))
+		points.foreach_get("co",old)
+		old = old[0::2]
+		replaced = np.nonzero((old > frames.min() - 1e-4) & (old < frames.max() + 1e-4))[0]
+		for i in replaced[::-1]:
+			points.remove(points[int(i)],fast=True)
+		start = len(points)
+		points.add(len(frames))
+		co = np.empty(2 * len(points))
+		points.foreach_get("co",co)
+		co[2 * start::2] = frames
+		co[2 * start + 1::2] = values[:,index]
+		points.foreach_set("co",co)
+		for point in points[start:]:
+			point.interpolation = interpolation
+		fcurve.update()
+#
+# Errors raised by the functions that can't be evaluated on arrays
+#
+ARRAY_ERRORS = (TypeError,ValueError)
+if "SympifyError" in globals():
+	ARRAY_ERRORS += (SympifyError,)
+#
+#
+#
+def evaluate_curve(fun,t):
+	"""
+	Returns an array of shape (n,3) with the points of the parametric curve fun at the array t of n
+	parameters. The function is evaluated once on the whole array if it accepts arrays, and at
+	every parameter otherwise. Raises ValueError if the points don't have 3 components
+	Parameters:
+	   fun: the parametric function
+
+	   t: array of parameters
+	"""
+	try:
+		points = np.empty((len(t),3))
+		for k, x in enumerate(fun(t)):
+			points[:,k] = x
+		if k == 2:
+			return points
+	except ARRAY_ERRORS:
+		pass
+	points = [[float(x) for x in fun(u)] for u in t.tolist()]
+	if any(len(p) != 3 for p in points):
+		raise ValueError("The points of the curve must have 3 components")
+	return np.array(points,dtype=float).reshape(len(t),3)
+#
+#
+#
+def curve_points(fun,tmin,tmax,steps):
+	"""
+	Returns an array with the steps + 1 points of the parametric curve fun(t) for t from tmin to tmax
+	Parameters:
+	   fun: the parametric function
+
+	   tmin, tmax: limits of the parameter
+
+	   steps: number of steps
+	"""
+	return evaluate_curve(fun,np.linspace(tmin,tmax,steps + 1))
+#
+#
+#
+def adaptive_curve_points(fun,tmin,tmax,steps,tolerance,angle=math.pi/36,depth=12):
+	"""
+	Returns an array with the points of the parametric curve fun(t) for t from tmin to tmax, sampled
+	according to its shape. The curve is first sampled with steps + 1 points. Every other point is
+	removed if its distance to the chord of its neighbours is smaller than tolerance and the curve
+	turns less than angle at it, and this is repeated until no point can be removed. Then the
+	segments whose midpoint is farther than tolerance from the chord, or where the curve turns more
+	than angle, are subdivided until depth levels. Finally, the evaluated points farther than
+	tolerance from the polyline are inserted again. The tolerance is only guaranteed at the
+	evaluated points, so it is approximate for curves with details smaller than the initial steps
+	Parameters:
+	   fun: the parametric function
+
+	   tmin, tmax: limits of the parameter
+
+	   steps: number of steps of the initial sampling
+
+	   tolerance: maximum distance between the evaluated points of the curve and the polyline
+
+	   angle: maximum turning angle, in radians, at every point
+
+	   depth: maximum number of subdivisions of the initial segments
+	"""
+	def deviation(a,m,b):
+		u = m - a
+		v = b - m
+		chord = b - a
+		length = np.maximum(np.linalg.norm(chord,axis=1),1e-300)
+		distance = np.linalg.norm(np.cross(u,chord),axis=1) / length
+		cos = np.einsum('ij,ij->i',u,v) / np.maximum(np.linalg.norm(u,axis=1) * np.linalg.norm(v,axis=1),1e-300)
+		return (distance > tolerance) | (cos < math.cos(angle))
+
+	def distance(p,a,b):
+		chord = b - a
+		length2 = np.maximum(np.einsum('ij,ij->i',chord,chord),1e-300)
+		s = np.clip(np.einsum('ij,ij->i',p - a,chord) / length2,0.0,1.0)
+		return np.linalg.norm(p - a - s[:,None] * chord,axis=1)
+
+	t = np.linspace(tmin,tmax,steps + 1)
+	points = evaluate_curve(fun,t)
+	samples = t
+	sampled = points
+	while len(t) > 2:
+		odd = np.arange(1,len(t) - 1,2)
+		keep = np.ones(len(t),dtype=bool)
+		keep[odd] = deviation(points[odd - 1],points[odd],points[odd + 1])
+		if keep.all():
+			break
+		t = t[keep]
+		points = points[keep]
+	for level in range(depth):
+		tm = 0.5 * (t[:-1] + t[1:])
+		middle = evaluate_curve(fun,tm)
+		split = deviation(points[:-1],middle,points[1:])
+		if not split.any():
+			break
+		t = np.insert(t,np.nonzero(split)[0] + 1,tm[split])
+		points = np.insert(points,np.nonzero(split)[0] + 1,middle[split],axis=0)
+		samples = np.concatenate([samples,tm])
+		sampled = np.concatenate([sampled,middle])
+	#
+	# The chords grow in every pass of the decimation, so the removed points are checked again
+	# against the final polyline
+	#
+	while len(t) > 1:
+		i = np.clip(np.searchsorted(t,samples,side='right') - 1,0,len(t) - 2)
+		far = distance(sampled,points[i],points[i + 1]) > tolerance
+		if not far.any():
+			break
+		t = np.concatenate([t,samples[far]])
+		points = np.concatenate([points,sampled[far]])
+		order = np.argsort(t,kind='stable')
+		t = t[order]
+		points = points[order]
+	return points
+#
+#
+#
+def poly_spline(curve,points):
+	"""
+	Adds to a curve a poly spline through an array of points and returns it
+	Parameters:
+	   curve: the curve
+
+	   points: array of shape (n,3)
+	"""
+	co = np.ones((len(points),4),dtype=np.float32)
+	co[:,:3] = points
+	line = curve.splines.new('POLY')
+	line.points.add(len(points) - 1)
+	line.points.foreach_set("co",co.ravel())
+	return line
+#
+#
+#
+def transform_array(matrix,points,out=None,affine=True):
+	"""
+	Returns the array of shape (n,3) obtained multiplying every row of an array by a matrix
+	Parameters:
+	   matrix: a 3x3 or 4x4 matrix. If it is 4x4 and affine is True, the translation is added
+
+	   points: array of shape (n,3)
+
+	   out: if not None, array of shape (n,3) where the result is written
+
+	   affine: if False, only the linear part of a 4x4 matrix is applied
+	"""
+	mat = np.array(matrix,dtype=float)
+	points = np.asarray(points,dtype=float).reshape(-1,3)
+	if out is None:
+		out = np.empty(points.shape)
+	np.matmul(points,mat[:3,:3].T,out=out)
+	if affine and len(mat) == 4:
+		out += mat[:3,3]
+	return out
+#
+#
+#
+def affine_map_matrix(matrix,origin=(0,0,0),world=None,vector=(0,0,0)):
+	"""
+	Returns the 4x4 array of the affine map x -> origin + matrix (x - origin) + vector. If world is the
+	matrix_world of an object, the map is expressed in the local coordinates of the object
+	Parameters:
+	   matrix: a 3x3 matrix or the 4x4 matrix of an affine map. In the last case origin and vector are ignored
+
+	   origin: fixed point of the linear part of the map
+
+	   world: None or a 4x4 matrix
+
+	   vector: vector of translation
+	"""
+	matrix = np.array(matrix,dtype=float)
+	if len(matrix) == 4:
+		mat = matrix
+	else:
+		mat = np.identity(4)
+		mat[:3,:3] = matrix
+		origin = np.array(origin,dtype=float)
+		mat[:3,3] = origin - matrix @ origin + np.array(vector,dtype=float)
+	if world is not None:
+		world = np.array(world,dtype=float)
+		mat = np.linalg.inv(world) @ mat @ world
+	return mat
+#
+#
+#
+def point_collections(data):
+	"""
+	Returns the list of tuples (points,attribute,size) with the collections of points of a mesh or a curve,
+	the name of the attribute with the coordinates and its number of components
+	Parameters:
+	   data: the mesh or the curve
+	"""
+	if isinstance(data,bpy.types.Mesh):
+		return [(data.vertices,"co",3)]
+	collections = []
+	for spline in data.splines:
+		if spline.type == 'BEZIER':
+			collections.extend((spline.bezier_points,attribute,3) for attribute in ("co","handle_left","handle_right"))
+		else:
+			collections.append((spline.points,"co",4))
+	return collections
+#
+#
+#
+def data_coordinates(data):
+	"""
+	Returns the array of shape (n,3) with the coordinates of the vertices of a mesh or of the control
+	points and handles of a curve
+	Parameters:
+	   data: the mesh or the curve
+	"""
+	arrays = [np.empty((0,3))]
+	for points, attribute, size in point_collections(data):
+		co = np.empty(size * len(points))
+		points.foreach_get(attribute,co)
+		arrays.append(co.reshape(-1,size)[:,:3])
+	return np.concatenate(arrays)
+#
+#
+#
+def set_data_coordinates(data,co):
+	"""
+	Sets the coordinates of the vertices of a mesh or of the control points and handles of a curve
+	with foreach_set. The weights of the points of the curves are kept
+	Parameters:
+	   data: the mesh or the curve
+
+	   co: array of shape (n,3) in the order of data_coordinates
+	"""
+	start = 0
+	for points, attribute, size in point_collections(data):
+		n = len(points)
+		values = np.empty((n,size))
+		if size > 3:
+			points.foreach_get(attribute,values.ravel())
+		values[:,:3] = co[start:start + n]
+		points.foreach_set(attribute,values.ravel())
+		start += n
+	if isinstance(data,bpy.types.Mesh):
+		data.update()
+	else:
+		data.update_tag()
+#
+#
+#
+def transform_data(data,matrix):
+	"""
+	Applies an affine map to the vertices of a mesh or to the control points and handles of a curve
+	Parameters:
+	   data: the mesh or the curve
+
+	   matrix: 4x4 matrix of the affine map
+	"""
+	set_data_coordinates(data,transform_array(matrix,data_coordinates(data)))
+#
+#
+#
+def apply_maps(data,maps):
+	"""
+	Sets the coordinates of a mesh or a curve to the images of its original coordinates by a sequence
+	of affine maps. The original coordinates and the matrices are stored in the custom properties
+	"LinearAlgebra original" and "LinearAlgebra maps" of the data. If the sequence is empty the
+	original coordinates are restored and the properties are removed
+	Parameters:
+	   data: the mesh or the curve
+
+	   maps: list of 4x4 matrices
+	"""
+	if "LinearAlgebra original" in data:
+		co = np.array(data["LinearAlgebra original"].to_list()).reshape(-1,3)
+	else:
+		co = data_coordinates(data)
+		data["LinearAlgebra original"] = co.ravel().tolist()
+	mat = np.identity(4)
+	for m in maps:
+		mat = m @ mat
+	set_data_coordinates(data,transform_array(mat,co))
+	if len(maps) > 0:
+		data["LinearAlgebra maps"] = np.concatenate([m.ravel() for m in maps]).tolist()
+	else:
+		del data["LinearAlgebra original"]
+		if "LinearAlgebra maps" in data:
+			del data["LinearAlgebra maps"]
+#
+#
+#
+def stored_maps(data):
+	"""
+	Returns the list of 4x4 matrices stored by apply_maps in a mesh or a curve
+	Parameters:
+	   data: the mesh or the curve
+	"""
+	if "LinearAlgebra maps" not in data:
+		return []
+	return list(np.array(data["LinearAlgebra maps"].to_list()).reshape(-1,4,4))
+#
+#
+#
+def node_surface(obj):
+	"""
+	Returns True if the geometry of an object is generated by the Geometry Nodes modifier of a surface
+	drawn with backend='nodes', that ignores the vertices of the mesh
+	Parameters:
+	   obj: the object
+	"""
+	modifier = obj.modifiers.get("Surface")
+	return modifier is not None and modifier.type == 'NODES'
+#
+#
+#
+def fingerprint(value,digest,seen=None):
+	"""
+	Feeds a normalized representation of 'value' into the hash object 'digest'. Numbers are
+	normalized to floats, sequences and dictionaries are traversed and functions are hashed from
+	their compiled code, default values, closure cells and the global values they use. Bound
+	methods and other objects are hashed with their attributes. Raises TypeError for instances
+	of LinearAlgebra, whose state can't be hashed
+	Parameters:
+	   value: any value used to generate some geometry
+
+	   digest: a hashlib object
+
+	   seen: set of identifiers of the functions and containers already visited
+	"""
+	if seen is None:
+		seen = set()
+	if value is None or isinstance(value,(bool,str,bytes)):
+		digest.update(repr(value).encode())
+	elif isinstance(value,(int,float,np.integer,np.floating)):
+		digest.update(repr(float(value)).encode())
+	elif isinstance(value,np.ndarray):
+		digest.update(str(value.dtype).encode())
+		digest.update(repr(value.shape).encode())
+		digest.update(np.ascontiguousarray(value).tobytes())
+	elif isinstance(value,(dict,list,tuple)) and id(value) in seen:
+		digest.update(b'<cycle>')
+	elif isinstance(value,dict):
+		seen.add(id(value))
+		digest.update(b'{')
+		for k in sorted(value,key=repr):
+			fingerprint(k,digest,seen)
+			fingerprint(value[k],digest,seen)
+		digest.update(b'}')
+	elif isinstance(value,(list,tuple,Vector,Matrix,Quaternion)):
+		if isinstance(value,(list,tuple)):
+			seen.add(id(value))
+		digest.update(b'[')
+		for x in value:
+			fingerprint(x,digest,seen)
+		digest.update(b']')
+	elif isinstance(value,types.CodeType):
+		digest.update(value.co_code)
+		digest.update(repr(value.co_names).encode())
+		for c in value.co_consts:
+			fingerprint(c,digest,seen)
+	elif isinstance(value,types.FunctionType):
+		if id(value) in seen:
+			digest.update(value.__qualname__.encode())
+			return
+		seen.add(id(value))
+		fingerprint(value.__code__,digest,seen)
+		fingerprint(value.__defaults__,digest,seen)
+		if value.__closure__ is not None:
+			for cell in value.__closure__:
+				try:
+					fingerprint(cell.cell_contents,digest,seen)
+				except ValueError:
+					digest.update(b'<empty>')
+		for n in value.__code__.co_names:
+			if n in value.__globals__:
+				digest.update(n.encode())
+				fingerprint(value.__globals__[n],digest,seen)
+	elif isinstance(value,types.MethodType):
+		fingerprint(value.__func__,digest,seen)
+		fingerprint(value.__self__,digest,seen)
+	elif isinstance(value,(types.ModuleType,types.BuiltinFunctionType,type)):
+		digest.update(getattr(value,'__name__',repr(value)).encode())
+	elif isinstance(value,LinearAlgebra):
+		raise TypeError("The state of LinearAlgebra can't be hashed")
+	elif isinstance(value,Rotation):
+		fingerprint(value.quaternion,digest,seen)
+	elif isinstance(value,Color):
+		digest.update(value.name.encode())
+	elif hasattr(value,'__float__'):
+		#
+		# Symbolic expressions of sympy have __float__ but can't be converted if they have free symbols
+		#
+		try:
+			digest.update(repr(float(value)).encode())
+		except (TypeError,ValueError):
+			digest.update(repr(value).encode())
+	elif hasattr(value,'__dict__') and not isinstance(value,(types.ModuleType,type)):
+		digest.update(type(value).__qualname__.encode())
+		if id(value) in seen:
+			digest.update(b'<cycle>')
+			return
+		seen.add(id(value))
+		fingerprint(vars(value),digest,seen)
+	else:
+		digest.update(repr(value).encode())
+#
+# Reflections of the symmetries of the curves
+#
+SYMMETRIES = {'XY': (1,1,-1),'XZ': (1,-1,1),'YZ': (-1,1,1),'X': (1,-1,-1),'Y': (-1,1,-1),'Z': (-1,-1,1),'O': (-1,-1,-1)}
+#
+# Kinds of datablocks created by the drawing methods
+#
+DATABLOCKS = ("objects","meshes","curves","materials","lights","node_groups","collections","actions")
+#
+#
+#
+COLLECTION_PARAMETER = """
+		   collection: keyword only. If True, the objects of the call are moved to a new child collection
+		   of the scene collection, with the parameter name of the call as name. If it's a string, it's the
+		   name of the collection. If False, the objects stay in the scene collection. If None, the value
+		   given by set_collections is used
+"""
+#
+#
+#
+def incremental(method):
+	"""
+	Decorator for the drawing methods of LinearAlgebra. Every call made outside other drawing
+	methods is tracked by LinearAlgebra.tracked_call, that records the objects it creates and,
+	in incremental mode, reuses them if the call is repeated with the same parameters.
+	The decorated method accepts the keyword only parameter collection, that is added to its
+	signature and its docstring
+	Parameters:
+	   method: method of LinearAlgebra
+	"""
+	signature = inspect.signature(method)
+	@functools.wraps(method)
+	def wrapper(self,*args,**kwargs):
+		return self.tracked_call(method,signature,args,kwargs)
+	parameters = list(signature.parameters.values())
+	parameters.append(inspect.Parameter("collection",inspect.Parameter.KEYWORD_ONLY,default=None))
+	wrapper.__signature__ = signature.replace(parameters=parameters)
+	wrapper.__doc__ = (method.__doc__ or "").rstrip() + "\n" + COLLECTION_PARAMETER
+	return wrapper
+#
+#
+#
+def encode_result(value):
+	"""
+	Returns a representation of the value returned by a drawing method that can be stored
+	with json. Objects are stored by name. Raises TypeError for values that can't be stored
+	Parameters:
+	   value: value returned by a drawing method
+	"""
+	if value is None or isinstance(value,(bool,int,float,str)):
+		return value
+	if isinstance(value,bpy.types.Object):
+		return {"object": value.name}
+	if isinstance(value,Vector):
+		return {"vector": list(value)}
+	if isinstance(value,tuple):
+		return {"tuple": [encode_result(x) for x in value]}
+	if isinstance(value,list):
+		return [encode_result(x) for x in value]
+	raise TypeError("Can't store a value of type %s" % type(value).__name__)
+#
+#
+#
+def decode_result(value):
+	"""
+	Inverse of encode_result. Raises KeyError if an object doesn't exist anymore, for instance
+	because it has been renamed
+	Parameters:
+	   value: value returned by encode_result
+	"""
+	if isinstance(value,list):
+		return [decode_result(x) for x in value]
+	if isinstance(value,dict):
+		if "object" in value:
+			if value["object"] not in bpy.data.objects:
+				raise KeyError(value["object"])
+			return bpy.data.objects[value["object"]]
+		if "vector" in value:
+			return Vector(value["vector"])
+		if "tuple" in value:
+			return tuple(decode_result(x) for x in value["tuple"])
+	return value
+#
+#
+#
+def contains_objects(value):
+	"""
+	Returns True if value is a Blender object or a list or tuple containing objects
+	Parameters:
+	   value: any value
+	"""
+	if isinstance(value,bpy.types.Object):
+		return True
+	if isinstance(value,(list,tuple)):
+		return any(contains_objects(x) for x in value)
+	return False
+#
+# Math nodes used to compile the functions of numpy, math and sympy
+#
+NODE_OPERATIONS = {"sin": 'SINE',"cos": 'COSINE',"tan": 'TANGENT',
+	"asin": 'ARCSINE',"arcsin": 'ARCSINE',"acos": 'ARCCOSINE',"arccos": 'ARCCOSINE',
+	"atan": 'ARCTANGENT',"arctan": 'ARCTANGENT',"atan2": 'ARCTAN2',"arctan2": 'ARCTAN2',
+	"sinh": 'SINH',"cosh": 'COSH',"tanh": 'TANH',"exp": 'EXPONENT',"log": 'LOGARITHM',
+	"sqrt": 'SQRT',"fabs": 'ABSOLUTE',"Abs": 'ABSOLUTE',"pow": 'POWER',"power": 'POWER',
+	"minimum": 'MINIMUM',"maximum": 'MAXIMUM',"sign": 'SIGN'}
+#
+#
+#
+class NodeExpr():
+	"""
+	Class used to compile a closed-form expression into math nodes of a Geometry Nodes tree.
+	The arithmetic operators and the functions of NODE_OPERATIONS applied to a NodeExpr add a
+	node to the tree and return the NodeExpr of its output
+	"""
+	def __init__(self,tree,socket):
+		"""
+		Initializes the expression
+		Parameters:
+		   tree: the node tree
+
+		   socket: output socket with the value of the expression
+		"""
+		self.tree = tree
+		self.socket = socket
+	#
+	#
+	#
+	def apply(self,operation,*operands):
+		"""
+		Adds a math node and returns its output
+		Parameters:
+		   operation: operation of the math node
+
+		   operands: NodeExpr or numbers
+		"""
+		node = self.tree.nodes.new('ShaderNodeMath')
+		node.operation = operation
+		for i, x in enumerate(operands):
+			if isinstance(x,NodeExpr):
+				self.tree.links.new(x.socket,node.inputs[i])
+			else:
+				node.inputs[i].default_value = float(x)
+		return NodeExpr(self.tree,node.outputs[0])
+	#
+	#
+	#
+	def __add__(self,other):
+		return self.apply('ADD',self,other)
+	def __radd__(self,other):
+		return self.apply('ADD',other,self)
+	def __sub__(self,other):
+		return self.apply('SUBTRACT',self,other)
+	def __rsub__(self,other):
+		return self.apply('SUBTRACT',other,self)
+	def __mul__(self,other):
+		return self.apply('MULTIPLY',self,other)
+	def __rmul__(self,other):
+		return self.apply('MULTIPLY',other,self)
+	def __truediv__(self,other):
+		return self.apply('DIVIDE',self,other)
+	def __rtruediv__(self,other):
+		return self.apply('DIVIDE',other,self)
+	def __pow__(self,other):
+		if not isinstance(other,NodeExpr) and float(other) == 2.0:
+			return self.apply('MULTIPLY',self,self)
+		return self.apply('POWER',self,other)
+	def __rpow__(self,other):
+		return self.apply('POWER',other,self)
+	def __neg__(self):
+		return self.apply('MULTIPLY',self,-1.0)
+	def __pos__(self):
+		return self
+	def __abs__(self):
+		return self.apply('ABSOLUTE',self)
+	def __bool__(self):
+		raise TypeError("The value of a NodeExpr is not known when the nodes are created")
+	#
+	# Methods called by the numpy functions
+	#
+	def sin(self):
+		return self.apply('SINE',self)
+	def cos(self):
+		return self.apply('COSINE',self)
+	def tan(self):
+		return self.apply('TANGENT',self)
+	def arcsin(self):
+		return self.apply('ARCSINE',self)
+	def arccos(self):
+		return self.apply('ARCCOSINE',self)
+	def arctan(self):
+		return self.apply('ARCTANGENT',self)
+	def arctan2(self,other):
+		return self.apply('ARCTAN2',self,other)
+	def sinh(self):
+		return self.apply('SINH',self)
+	def cosh(self):
+		return self.apply('COSH',self)
+	def tanh(self):
+		return self.apply('TANH',self)
+	def exp(self):
+		return self.apply('EXPONENT',self)
+	def log(self):
+		return self.apply('LOGARITHM',self,math.e)
+	def sqrt(self):
+		return self.apply('SQRT',self)
+	def sign(self):
+		return self.apply('SIGN',self)
+#
+#
+#
+def node_operation(name,fallback):
+	"""
+	Returns a function that adds a math node if some of its arguments is a NodeExpr and calls
+	fallback otherwise
+	Parameters:
+	   name: name of the function in NODE_OPERATIONS
+
+	   fallback: the original function
+	"""
+	operation = NODE_OPERATIONS[name]
+	def function(*args):
+		for x in args:
+			if isinstance(x,NodeExpr):
+				if operation == 'LOGARITHM' and len(args) == 1:
+					args = (args[0],math.e)
+				return x.apply(operation,*args)
+		return fallback(*args)
+	return function
+#
+#
+#
+def node_traceable(fun,seen=None):
+	"""
+	Returns a copy of the function 'fun' that can be called with NodeExpr arguments. The modules
+	math and numpy and the functions of NODE_OPERATIONS used by 'fun', by the functions it calls
+	and by the functions of its closure, are replaced by versions that add math nodes
+	Parameters:
+	   fun: a function
+
+	   seen: dictionary with the copies of the functions already visited
+	"""
+	if seen is None:
+		seen = {}
+	if id(fun) in seen:
+		return seen[id(fun)]
+	names = dict(fun.__globals__)
+	functions = []
+	for n in fun.__code__.co_names:
+		if n not in names:
+			continue
+		g = names[n]
+		if g is math or g is np:
+			module = types.SimpleNamespace(**{k: getattr(g,k) for k in dir(g) if not k.startswith('_')})
+			for k in NODE_OPERATIONS:
+				if hasattr(g,k):
+					setattr(module,k,node_operation(k,getattr(g,k)))
+			names[n] = module
+		elif isinstance(g,types.FunctionType) and g.__module__ != __name__:
+			functions.append(n)
+		elif n in NODE_OPERATIONS and callable(g):
+			names[n] = node_operation(n,g)
+	closure = None
+	if fun.__closure__ is not None:
+		closure = []
+		for cell in fun.__closure__:
+			try:
+				contents = cell.cell_contents
+			except ValueError:
+				closure.append(cell)
+				continue
+			if isinstance(contents,types.FunctionType) and contents is not fun:
+				closure.append(types.CellType(node_traceable(contents,seen)))
+			else:
+				closure.append(cell)
+		closure = tuple(closure)
+	copy = types.FunctionType(fun.__code__,names,fun.__name__,fun.__defaults__,closure)
+	seen[id(fun)] = copy
+	for n in functions:
+		names[n] = node_traceable(names[n],seen)
+	copy.__kwdefaults__ = fun.__kwdefaults__
+	return copy
+#
+#
+#
+def central_quadric(u,v,a2=1.0,b2=1.0,c2=1.0,s=1.0,d=1.0,zmax=5.0):
+	"""
+	Returns the point of the quadric x^2/a2 + y^2/b2 + s*z^2/c2 = d with polar angle u and height
+	v*zmax. The heights where the quadric doesn't exist are moved to its nearest vertex, so the same
+	parametrization works for ellipsoids, hyperboloids, cones and cylinders. For the hyperboloids of
+	two sheets, v < 0 gives the lower sheet and v >= 0 the upper one, so the faces between both sheets
+	collapse to the segment joining the vertices
+	Parameters:
+	   u: polar angle
+
+	   v: value in [-1,1]
+
+	   a2, b2, c2, s, d: coefficients of the equation
+
+	   zmax: maximum height
+	"""
+	limit = np.maximum(c2 * d * s / np.maximum(s * s,1e-12),0.0)
+	closed = np.maximum(np.sign(s),0.0) * np.maximum(np.sign(d),0.0)
+	top = closed * np.minimum(zmax,np.sqrt(limit)) + (1 - closed) * zmax
+	sheets = np.maximum(-np.sign(s),0.0) * np.maximum(-np.sign(d),0.0)
+	z = v * top
+	#
+	# Sign of z that is 1 at z = 0, so that no row of the grid is moved to the center
+	#
+	side = 1.0 - 2.0 * np.maximum(-np.sign(z),0.0)
+	z = side * np.maximum(abs(z),sheets * np.sqrt(limit))
+	r = np.sqrt(np.maximum(d - s * z * z / c2,0.0))
+	return (np.sqrt(a2) * r * np.cos(u),np.sqrt(b2) * r * np.sin(u),z)
+#
+#
+#
+def paraboloid_quadric(u,v,a2=1.0,b2=1.0,s=1.0,rmax=3.0):
+	"""
+	Returns the point of the paraboloid z = x^2/a2 + s*y^2/b2 with polar angle u and polar radius
+	v*rmax in the coordinates (x/a,y/b)
+	Parameters:
+	   u: polar angle
+
+	   v: value in [0,1]
+
+	   a2, b2, s: coefficients of the equation
+
+	   rmax: maximum polar radius
+	"""
+	x = v * rmax * np.cos(u)
+	y = v * rmax * np.sin(u)
+	return (np.sqrt(a2) * x,np.sqrt(b2) * y,x * x + s * y * y)
+#
+#
+#
+def node_group_socket(tree,name,in_out,socket_type):
+	"""
+	Adds an input or output socket to the interface of a node group
+	Parameters:
+	   tree: the node group
+
+	   name: name of the socket
+
+	   in_out: 'INPUT' or 'OUTPUT'
+
+	   socket_type: type of the socket, for instance 'NodeSocketFloat'
+	"""
+	if bpy.app.version[0] < 4:
+		if in_out == 'INPUT':
+			return tree.inputs.new(socket_type,name)
+		return tree.outputs.new(socket_type,name)
+	return tree.interface.new_socket(name=name,in_out=in_out,socket_type=socket_type)
+#
+#
+#
+def node_group_input(tree,name):
+	"""
+	Returns the identifier of an input of a node group, used as key of the Geometry Nodes modifiers
+	Parameters:
+	   tree: the node group
+
+	   name: name of the input
+	"""
+	if bpy.app.version[0] < 4:
+		return tree.inputs[name].identifier
+	return tree.interface.items_tree[name].identifier
+#
+# Sequences of axes of the Euler angles
+#
+EULER_AXES = ('XYZ','XZY','YXZ','YZX','ZXY','ZYX','XYX','XZX','YXY','YZY','ZXZ','ZYZ')
+#
+#
+#
+def quaternion_product(p,q):
+	"""
+	Returns the array of products p @ q of two arrays of quaternions of shape (n,4) in the order w, x, y, z.
+	The arrays are broadcast, so one of them can have shape (1,4)
+	Parameters:
+	   p, q: arrays of quaternions
+	"""
+	w1, x1, y1, z1 = np.moveaxis(np.asarray(p,dtype=float),-1,0)
+	w2, x2, y2, z2 = np.moveaxis(np.asarray(q,dtype=float),-1,0)
+	return np.stack([w1*w2 - x1*x2 - y1*y2 - z1*z2,
+		w1*x2 + x1*w2 + y1*z2 - z1*y2,
+		w1*y2 - x1*z2 + y1*w2 + z1*x2,
+		w1*z2 + x1*y2 - y1*x2 + z1*w2],axis=-1)
+#
+#
+#
+def quaternion_matrices(q):
+	"""
+	Returns the array of shape (n,3,3) with the matrices of the rotations of an array of unit
+	quaternions of shape (n,4) in the order w, x, y, z
+	Parameters:
+	   q: array of quaternions
+	"""
+	w, x, y, z = np.moveaxis(np.asarray(q,dtype=float),-1,0)
+	return np.stack([np.stack([1 - 2*(y*y + z*z),2*(x*y - w*z),2*(x*z + w*y)],axis=-1),
+		np.stack([2*(x*y + w*z),1 - 2*(x*x + z*z),2*(y*z - w*x)],axis=-1),
+		np.stack([2*(x*z - w*y),2*(y*z + w*x),1 - 2*(x*x + y*y)],axis=-1)],axis=-2)
+#
+#
+#
+def axis_rotation_matrices(axis,angles):
+	"""
+	Returns the array of shape (n,3,3) with the matrices of the rotations of an array of angles
+	around a coordinate axis
+	Parameters:
+	   axis: index of the axis, 0 for X, 1 for Y and 2 for Z
+
+	   angles: array of n angles in radians
+	"""
+	angles = np.asarray(angles,dtype=float)
+	a = (axis + 1) % 3
+	b = (axis + 2) % 3
+	c = np.cos(angles)
+	s = np.sin(angles)
+	mat = np.zeros(angles.shape + (3,3))
+	mat[...,axis,axis] = 1.0
+	mat[...,a,a] = c
+	mat[...,a,b] = -s
+	mat[...,b,a] = s
+	mat[...,b,b] = c
+	return mat
+#
+#
+#
+def euler_decomposition(matrices,axis='ZXZ',eps=0.0):
+	"""
+	Returns the arrays psi, theta and phi, in radians, of the Euler angles of an array of rotation
+	matrices of shape (n,3,3), such that every matrix is R3(phi) @ R2(theta) @ R1(psi) where R1, R2
+	and R3 are the rotations around the axis in 'axis'. It also returns the boolean array of the
+	matrices in gimbal lock, whose angle phi is 0. Every sequence of axes is reduced to the indices
+	i, j, k and the parity of the permutation, so the same formulas are used for all of them
+	Parameters:
+	   matrices: array of rotation matrices
+
+	   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+
+	   eps: the matrices whose coefficient that determines theta differs from 1 or -1 less than eps
+	        are in gimbal lock
+	"""
+	A = np.asarray(matrices,dtype=float)
+	i, j, l = ["XYZ".index(c) for c in axis]
+	k = 3 - i - j
+	e = 1.0 if (j - i) % 3 == 1 else -1.0
+	if l == i:
+		g = A[...,i,i]
+		theta = np.arccos(np.clip(g,-1.0,1.0))
+		phi = np.arctan2(A[...,j,i],-e * A[...,k,i])
+	else:
+		g = -e * A[...,k,i]
+		theta = np.arcsin(np.clip(g,-1.0,1.0))
+		phi = np.arctan2(e * A[...,j,i],A[...,i,i])
+	gimbal = np.abs(g) >= 1.0 - eps
+	phi = np.where(gimbal,0.0,phi)
+	B = np.swapaxes(axis_rotation_matrices(j,theta),-1,-2) @ np.swapaxes(axis_rotation_matrices(l,phi),-1,-2) @ A
+	a = (i + 1) % 3
+	b = (i + 2) % 3
+	psi = np.arctan2(B[...,b,a],B[...,a,a])
+	return psi, theta, phi, gimbal
+#
+#
+#
+def euler_angles(matrices,axis='ZXZ',randomize=False,radians=False):
+	"""
+	Returns the Euler angles psi, theta and phi of a rotation matrix or an array of shape (n,3,3) of rotation
+	matrices, between 0 and 360 degrees. In gimbal lock only psi + phi or psi - phi is determined: phi is 0
+	or, if randomize is True, a random angle and psi is changed to keep the rotation
+	Parameters:
+	   matrices: a rotation matrix or an array of rotation matrices
+
+	   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+
+	   randomize: if True, phi is random in gimbal lock
+
+	   radians: if True, the angles returned are in radians, if not, are returned in degrees
+	"""
+	psi, theta, phi, gimbal = euler_decomposition(matrices,axis)
+	angles = np.mod(np.stack(np.broadcast_arrays(psi,theta,phi),axis=-1),2 * math.pi)
+	if randomize and np.any(gimbal):
+		i, j, l = ["XYZ".index(c) for c in axis]
+		sign = np.round(axis_rotation_matrices(j,angles[...,1])[...,l,i])[gimbal]
+		locked = angles[gimbal]
+		locked[:,2] = np.mod(sign * locked[:,0],2 * math.pi) * np.array([random.random() for k in range(len(locked))])
+		locked[:,0] = np.mod(locked[:,0] - sign * locked[:,2],2 * math.pi)
+		angles[gimbal] = locked
+	if radians:
+		T = 359.9 * math.pi / 180.0
+	else:
+		angles = np.degrees(angles)
+		T = 359.9
+	angles[angles > T] = 0.0
+	return angles
+#
+#
+#
+def euler_benchmark(n=1000000,axis='ZXZ',loop=10000):
+	"""
+	Returns a dictionary with the seconds needed to compute the Euler angles of n random rotation matrices
+	with euler_angles and of loop random rotations with Rotation.to_euler_angles, and the number of
+	matrices per second of both methods
+	Parameters:
+	   n: number of matrices of the vectorized computation
+
+	   axis: sequence of axes of the Euler angles
+
+	   loop: number of rotations of the computation one by one
+	"""
+	import time
+	matrices = RotationArray.random(n,seed=0).to_matrices()
+	start = time.perf_counter()
+	euler_angles(matrices,axis)
+	vectorized = time.perf_counter() - start
+	rotations = [Rotation(quaternion=Quaternion(q)) for q in RotationArray.random(loop,seed=1).quaternions]
+	start = time.perf_counter()
+	for r in rotations:
+		r.to_euler_angles(axis)
+	scalar = time.perf_counter() - start
+	return {"vectorized": vectorized,"scalar": scalar,
+		"vectorized per second": n / vectorized,"scalar per second": loop / scalar}
+#
+#
+#
+class Color():
+	"""
+    Class that defines a color in RGB format
+    """
+	def __init__(self,r,g,b,name):
+		self.r = r
+		self.g = g
+		self.b = b
+		self.name = name
+#
+#
+#
+class Colors():
+	"""
+	Class that defines a list of colors by name
+	"""
+	colorsbyname = {
+		'Black' : Color(0,0,0,'Black'),
+		'GrayObscure' : Color(0.2,0.2,0.2,'GrayObscure'),
+		'GrayDark' : Color(0.4,0.4,0.4,'GrayDark'),
+		'GrayLight' : Color(0.6,0.6,0.6,'GrayLight'),
+		'GrayPale' : Color(0.8,0.8,0.8,'GrayPale'),
+		'White' : Color(1,1,1,'White'),
+		'Red' : Color(1,0,0,'Red'),
+		'RedDarkHard' : Color(0.8,0,0,'RedDarkHard'),
+		'RedLightHard' : Color(1,0.2,0.2,'RedLightHard'),
+		'RedDarkFaded' : Color(0.6,0,0,'RedDarkFaded'),
+		'RedMediumFaded' : Color(0.8,0.2,0.2,'RedMediumFaded'),
+		'RedLightFaded' : Color(1,0.4,0.4,'RedLightFaded'),
+		'RedObscureDull' : Color(0.4,0,0,'RedObscureDull'),
+		'RedDarkDull' : Color(0.6,0.2,0.2,'RedDarkDull'),
+		'RedLightDull' : Color(0.8,0.4,0.4,'RedLightDull'),
+		'RedPaleDull' : Color(1,0.6,0.6,'RedPaleDull'),
+		'RedObscureWeak' : Color(0.2,0,0,'RedObscureWeak'),
+		'RedDarkWeak' : Color(0.4,0.2,0.2,'RedDarkWeak'),
+		'RedMediumWeak' : Color(0.6,0.4,0.4,'RedMediumWeak'),
+		'RedLightWeak' : Color(0.8,0.6,0.6,'RedLightWeak'),
+		'RedPaleWeak' : Color(1,0.8,0.8,'RedPaleWeak'),
+		'Orange' : Color(1,0.37,0.12,'Orange'),
+		'OrangeRedDark' : Color(0.6,0.2,0,'OrangeRedDark'),
+		'OrangeRedMedium' : Color(0.8,0.4,0.2,'OrangeRedMedium'),
+		'OrangeRedLight' : Color(1,0.6,0.4,'OrangeRedLight'),
+		'OrangeOrangeRed' : Color(1,0.4,0,'OrangeOrangeRed'),
+		'RedOrangeDark' : Color(0.8,0.2,0,'RedOrangeDark'),
+		'RedOrangeLight' : Color(1,0.4,0.2,'RedOrangeLight'),
+		'RedRedOrange' : Color(1,0.2,0,'RedRedOrange'),
+		'OrangeDarkHard' : Color(0.8,0.4,0,'OrangeDarkHard'),
+		'OrangeLightHard' : Color(1,0.6,0.2,'OrangeLightHard'),
+		'OrangeObscureDull' : Color(0.4,0.2,0,'OrangeObscureDull'),
+		'OrangeDarkDull' : Color(0.6,0.4,0.2,'OrangeDarkDull'),
+		'OrangeLightDull' : Color(0.8,0.6,0.4,'OrangeLightDull'),
+		'OrangePaleDull' : Color(1,0.8,0.6,'OrangePaleDull'),
+		'OrangeYellowDark' : Color(0.6,0.4,0,'OrangeYellowDark'),
+		'OrangeYellowMedium' : Color(0.8,0.6,0.2,'OrangeYellowMedium'),
+		'OrangeYellowLight' : Color(1,0.8,0.4,'OrangeYellowLight'),
+		'OrangeOrangeYellow' : Color(1,0.6,0,'OrangeOrangeYellow'),
+		'YellowOrangeDark' : Color(0.8,0.6,0,'YellowOrangeDark'),
+		'YellowOrangeLight' : Color(1,0.8,0.2,'YellowOrangeLight'),
+		'YellowYellowOrange' : Color(1,0.8,0,'YellowYellowOrange'),
+		'Yellow' : Color(1,1,0,'Yellow'),
+		'YellowDarkHard' : Color(0.8,0.8,0,'YellowDarkHard'),
+		'YellowLightHard' : Color(1,1,0.2,'YellowLightHard'),
+		'YellowDarkFaded' : Color(0.6,0.6,0,'YellowDarkFaded'),
+		'YellowMediumFaded' : Color(0.8,0.8,0.2,'YellowMediumFaded'),
+		'YellowLightFaded' : Color(1,1,0.4,'YellowLightFaded'),
+		'YellowObscureDull' : Color(0.4,0.4,0,'YellowObscureDull'),
+		'YellowDarkDull' : Color(0.6,0.6,0.2,'YellowDarkDull'),
+		'YellowLightDull' : Color(0.8,0.8,0.4,'YellowLightDull'),
+		'YellowPaleDull' : Color(1,1,0.6,'YellowPaleDull'),
+		'YellowObscureWeak' : Color(0.2,0.2,0,'YellowObscureWeak'),
+		'YellowDarkWeak' : Color(0.4,0.4,0.2,'YellowDarkWeak'),
+		'YellowMediumWeak' : Color(0.6,0.6,0.4,'YellowMediumWeak'),
+		'YellowLightWeak' : Color(0.8,0.8,0.6,'YellowLightWeak'),
+		'YellowPaleWeak' : Color(1,1,0.8,'YellowPaleWeak'),
+		'SpringYellowDark' : Color(0.4,0.6,0,'SpringYellowDark'),
+		'SpringYellowMedium' : Color(0.6,0.8,0.2,'SpringYellowMedium'),
+		'SpringYellowLight' : Color(0.8,1,0.4,'SpringYellowLight'),
+		'SpringSpringYellow' : Color(0.6,1,0,'SpringSpringYellow'),
+		'YellowSpringDark' : Color(0.6,0.8,0,'YellowSpringDark'),
+		'YellowSpringLight' : Color(0.8,1,0.2,'YellowSpringLight'),
+		'YellowYellowSpring' : Color(0.8,1,0,'YellowYellowSpring'),
+		'SpringDarkHard' : Color(0.4,0.8,0,'SpringDarkHard'),
+		'SpringLightHard' : Color(0.6,1,0.2,'SpringLightHard'),
+		'SpringObscureDull' : Color(0.2,0.4,0,'SpringObscureDull'),
+		'SpringDarkDull' : Color(0.4,0.6,0.2,'SpringDarkDull'),
+		'SpringLightDull' : Color(0.6,0.8,0.4,'SpringLightDull'),
+		'SpringPaleDull' : Color(0.8,1,0.6,'SpringPaleDull'),
+		'SpringGreenDark' : Color(0.2,0.6,0,'SpringGreenDark'),
+		'SpringGreenMedium' : Color(0.4,0.8,0.2,'SpringGreenMedium'),
+		'SpringGreenLight' : Color(0.6,1,0.4,'SpringGreenLight'),
+		'SpringSpringGreen' : Color(0.4,1,0,'SpringSpringGreen'),
+		'GreenSpringDark' : Color(0.2,0.8,0,'GreenSpringDark'),
+		'GreenSpringLight' : Color(0.4,1,0.2,'GreenSpringLight'),
+		'GreenGreenSpring' : Color(0.2,1,0,'GreenGreenSpring'),
+		'Green' : Color(0,1,0,'Green'),
+		'GreenDarkHard' : Color(0,0.8,0,'GreenDarkHard'),
+		'GreenLightHard' : Color(0.2,1,0.2,'GreenLightHard'),
+		'GreenDarkFaded' : Color(0,0.6,0,'GreenDarkFaded'),
+		'GreenMediumFaded' : Color(0.2,0.8,0.2,'GreenMediumFaded'),
+		'GreenLightFaded' : Color(0.4,1,0.4,'GreenLightFaded'),
+		'GreenObscureDull' : Color(0,0.4,0,'GreenObscureDull'),
+		'GreenDarkDull' : Color(0.2,0.6,0.2,'GreenDarkDull'),
+		'GreenLightDull' : Color(0.4,0.8,0.4,'GreenLightDull'),
+		'GreenPaleDull' : Color(0.6,1,0.6,'GreenPaleDull'),
+		'GreenObscureWeak' : Color(0,0.2,0,'GreenObscureWeak'),
+		'GreenDarkWeak' : Color(0.2,0.4,0.2,'GreenDarkWeak'),
+		'GreenMediumWeak' : Color(0.4,0.6,0.4,'GreenMediumWeak'),
+		'GreenLightWeak' : Color(0.6,0.8,0.6,'GreenLightWeak'),
+		'GreenPaleWeak' : Color(0.8,1,0.8,'GreenPaleWeak'),
+		'TealGreenDark' : Color(0,0.6,0.2,'TealGreenDark'),
+		'TealGreenMedium' : Color(0.2,0.8,0.4,'TealGreenMedium'),
+		'TealGreenLight' : Color(0.4,1,0.6,'TealGreenLight'),
+		'TealTealGreen' : Color(0,1,0.4,'TealTealGreen'),
+		'GreenTealDark' : Color(0,0.8,0.2,'GreenTealDark'),
+		'GreenTealLight' : Color(0.2,1,0.4,'GreenTealLight'),
+		'GreenGreenTeal' : Color(0,1,0.2,'GreenGreenTeal'),
+		'TealDarkHard' : Color(0,0.8,0.4,'TealDarkHard'),
+		'TealLightHard' : Color(0.2,1,0.6,'TealLightHard'),
+		'TealObscureDull' : Color(0,0.4,0.2,'TealObscureDull'),
+		'TealDarkDull' : Color(0.2,0.6,0.4,'TealDarkDull'),
+		'TealLightDull' : Color(0.4,0.8,0.6,'TealLightDull'),
+		'TealPaleDull' : Color(0.6,1,0.8,'TealPaleDull'),
+		'TealCyanDark' : Color(0,0.6,0.4,'TealCyanDark'),
+		'TealCyanMedium' : Color(0.2,0.8,0.6,'TealCyanMedium'),
+		'TealCyanLight' : Color(0.4,1,0.8,'TealCyanLight'),
+		'TealTealCyan' : Color(0,1,0.6,'TealTealCyan'),
+		'CyanTealDark' : Color(0,0.8,0.6,'CyanTealDark'),
+		'CyanTealLight' : Color(0.2,1,0.8,'CyanTealLight'),
+		'CyanCyanTeal' : Color(0,1,0.8,'CyanCyanTeal'),
+		'Cyan' : Color(0,1,1,'Cyan'),
+		'CyanDarkHard' : Color(0,0.8,0.8,'CyanDarkHard'),
+		'CyanLightHard' : Color(0.2,1,1,'CyanLightHard'),
+		'CyanDarkFaded' : Color(0,0.6,0.6,'CyanDarkFaded'),
+		'CyanMediumFaded' : Color(0.2,0.8,0.8,'CyanMediumFaded'),
+		'CyanLightFaded' : Color(0.4,1,1,'CyanLightFaded'),
+		'CyanObscureDull' : Color(0,0.4,0.4,'CyanObscureDull'),
+		'CyanDarkDull' : Color(0.2,0.6,0.6,'CyanDarkDull'),
+		'CyanLightDull' : Color(0.4,0.8,0.8,'CyanLightDull'),
+		'CyanPaleDull' : Color(0.6,1,1,'CyanPaleDull'),
+		'CyanObscureWeak' : Color(0,0.2,0.2,'CyanObscureWeak'),
+		'CyanDarkWeak' : Color(0.2,0.4,0.4,'CyanDarkWeak'),
+		'CyanMediumWeak' : Color(0.4,0.6,0.6,'CyanMediumWeak'),
+		'CyanLightWeak' : Color(0.6,0.8,0.8,'CyanLightWeak'),
+		'CyanPaleWeak' : Color(0.8,1,1,'CyanPaleWeak'),
+		'AzureCyanDark' : Color(0,0.4,0.6,'AzureCyanDark'),
+		'AzureCyanMedium' : Color(0.2,0.6,0.8,'AzureCyanMedium'),
+		'AzureCyanLight' : Color(0.4,0.8,1,'AzureCyanLight'),
+		'AzureAzureCyan' : Color(0,0.6,1,'AzureAzureCyan'),
+		'CyanAzureDark' : Color(0,0.6,0.8,'CyanAzureDark'),
+		'CyanAzureLight' : Color(0.2,0.8,1,'CyanAzureLight'),
+		'CyanCyanAzure' : Color(0,0.8,1,'CyanCyanAzure'),
+		'AzureDarkHard' : Color(0,0.4,0.8,'AzureDarkHard'),
+		'AzureLightHard' : Color(0.2,0.6,1,'AzureLightHard'),
+		'AzureObscureDull' : Color(0,0.2,0.4,'AzureObscureDull'),
+		'AzureDarkDull' : Color(0.2,0.4,0.6,'AzureDarkDull'),
+		'AzureLightDull' : Color(0.4,0.6,0.8,'AzureLightDull'),
+		'AzurePaleDull' : Color(0.6,0.8,1,'AzurePaleDull'),
+		'AzureBlueDark' : Color(0,0.2,0.6,'AzureBlueDark'),
+		'AzureBlueMedium' : Color(0.2,0.4,0.8,'AzureBlueMedium'),
+		'AzureBlueLight' : Color(0.4,0.6,1,'AzureBlueLight'),
+		'AzureAzureBlue' : Color(0,0.4,1,'AzureAzureBlue'),
+		'BlueAzureDark' : Color(0,0.2,0.8,'BlueAzureDark'),
+		'BlueAzureLight' : Color(0.2,0.4,1,'BlueAzureLight'),
+		'BlueBlueAzure' : Color(0,0.2,1,'BlueBlueAzure'),
+		'Blue' : Color(0,0,1,'Blue'),
+		'BlueDarkHard' : Color(0,0,0.8,'BlueDarkHard'),
+		'BlueLightHard' : Color(0.2,0.2,1,'BlueLightHard'),
+		'BlueDarkFaded' : Color(0,0,0.6,'BlueDarkFaded'),
+		'BlueMediumFaded' : Color(0.2,0.2,0.8,'BlueMediumFaded'),
+		'BlueLightFaded' : Color(0.4,0.4,1,'BlueLightFaded'),
+		'BlueObscureDull' : Color(0,0,0.4,'BlueObscureDull'),
+		'BlueDarkDull' : Color(0.2,0.2,0.6,'BlueDarkDull'),
+		'BlueLightDull' : Color(0.4,0.4,0.8,'BlueLightDull'),
+		'BluePaleDull' : Color(0.6,0.6,1,'BluePaleDull'),
+		'BlueObscureWeak' : Color(0,0,0.2,'BlueObscureWeak'),
+		'BlueDarkWeak' : Color(0.2,0.2,0.4,'BlueDarkWeak'),
+		'BlueMediumWeak' : Color(0.4,0.4,0.6,'BlueMediumWeak'),
+		'BlueLightWeak' : Color(0.6,0.6,0.8,'BlueLightWeak'),
+		'BluePaleWeak' : Color(0.8,0.8,1,'BluePaleWeak'),
+		'VioletBlueDark' : Color(0.2,0,0.6,'VioletBlueDark'),
+		'VioletBlueMedium' : Color(0.4,0.2,0.8,'VioletBlueMedium'),
+		'VioletBlueLight' : Color(0.6,0.4,1,'VioletBlueLight'),
+		'VioletVioletBlue' : Color(0.4,0,1,'VioletVioletBlue'),
+		'BlueVioletDark' : Color(0.2,0,0.8,'BlueVioletDark'),
+		'BlueVioletLight' : Color(0.4,0.2,1,'BlueVioletLight'),
+		'BlueBlueViolet' : Color(0.2,0,1,'BlueBlueViolet'),
+		'VioletDarkHard' : Color(0.4,0,0.8,'VioletDarkHard'),
+		'VioletLightHard' : Color(0.6,0.2,1,'VioletLightHard'),
+		'VioletObscureDull' : Color(0.2,0,0.4,'VioletObscureDull'),
+		'VioletDarkDull' : Color(0.4,0.2,0.6,'VioletDarkDull'),
+		'VioletLightDull' : Color(0.6,0.4,0.8,'VioletLightDull'),
+		'VioletPaleDull' : Color(0.8,0.6,1,'VioletPaleDull'),
+		'VioletMagentaDark' : Color(0.4,0,0.6,'VioletMagentaDark'),
+		'VioletMagentaMedium' : Color(0.6,0.2,0.8,'VioletMagentaMedium'),
+		'VioletMagentaLight' : Color(0.8,0.4,1,'VioletMagentaLight'),
+		'VioletVioletMagenta' : Color(0.6,0,1,'VioletVioletMagenta'),
+		'MagentaVioletDark' : Color(0.6,0,0.8,'MagentaVioletDark'),
+		'MagentaVioletLight' : Color(0.8,0.2,1,'MagentaVioletLight'),
+		'MagentaMagentaViolet' : Color(0.8,0,1,'MagentaMagentaViolet'),
+		'Magenta' : Color(1,0,1,'Magenta'),
+		'MagentaDarkHard' : Color(0.8,0,0.8,'MagentaDarkHard'),
+		'MagentaLightHard' : Color(1,0.2,1,'MagentaLightHard'),
+		'MagentaDarkFaded' : Color(0.6,0,0.6,'MagentaDarkFaded'),
+		'MagentaMediumFaded' : Color(0.8,0.2,0.8,'MagentaMediumFaded'),
+		'MagentaLightFaded' : Color(1,0.4,1,'MagentaLightFaded'),
+		'MagentaObscureDull' : Color(0.4,0,0.4,'MagentaObscureDull'),
+		'MagentaDarkDull' : Color(0.6,0.2,0.6,'MagentaDarkDull'),
+		'MagentaLightDull' : Color(0.8,0.4,0.8,'MagentaLightDull'),
+		'MagentaPaleDull' : Color(1,0.6,1,'MagentaPaleDull'),
+		'MagentaObscureWeak' : Color(0.2,0,0.2,'MagentaObscureWeak'),
+		'MagentaDarkWeak' : Color(0.4,0.2,0.4,'MagentaDarkWeak'),
+		'MagentaMediumWeak' : Color(0.6,0.4,0.6,'MagentaMediumWeak'),
+		'MagentaLightWeak' : Color(0.8,0.6,0.8,'MagentaLightWeak'),
+		'MagentaPaleWeak' : Color(1,0.8,1,'MagentaPaleWeak'),
+		'PinkMagentaDark' : Color(0.6,0,0.4,'PinkMagentaDark'),
+		'PinkMagentaMedium' : Color(0.8,0.2,0.6,'PinkMagentaMedium'),
+		'PinkMagentaLight' : Color(1,0.4,0.8,'PinkMagentaLight'),
+		'PinkPinkMagenta' : Color(1,0,0.6,'PinkPinkMagenta'),
+		'MagentaPinkDark' : Color(0.8,0,0.6,'MagentaPinkDark'),
+		'MagentaPinkLight' : Color(1,0.2,0.8,'MagentaPinkLight'),
+		'MagentaMagentaPink' : Color(1,0,0.8,'MagentaMagentaPink'),
+		'PinkDarkHard' : Color(0.8,0,0.4,'PinkDarkHard'),
+		'PinkLightHard' : Color(1,0.2,0.6,'PinkLightHard'),
+		'PinkObscureDull' : Color(0.4,0,0.2,'PinkObscureDull'),
+		'PinkDarkDull' : Color(0.6,0.2,0.4,'PinkDarkDull'),
+		'PinkLightDull' : Color(0.8,0.4,0.6,'PinkLightDull'),
+		'PinkPaleDull' : Color(1,0.6,0.8,'PinkPaleDull'),
+		'PinkRedDark' : Color(0.6,0,0.2,'PinkRedDark'),
+		'PinkRedMedium' : Color(0.8,0.2,0.4,'PinkRedMedium'),
+		'PinkRedLight' : Color(1,0.4,0.6,'PinkRedLight'),
+		'PinkPinkRed' : Color(1,0,0.4,'PinkPinkRed'),
+		'RedPinkDark' : Color(0.8,0,0.2,'RedPinkDark'),
+		'RedPinkLight' : Color(1,0.2,0.4,'RedPinkLight'),
+		'RedRedPink' : Color(1,0,0.2,'RedRedPink')
 	}
 	#
 	#
 	#
-	@classmethod
-	def color(self,name):
+	@classmethod
+	def color(self,name):
+		"""
+		Function that returns a color from his name
+		Parameters:
+		   name: name of the color
+		"""
+		try:
+			color = self.colorsbyname[name]
+		except:
+			return self.colorsbyname["Black"]
+		return color
+	#
+	#
+	#
+	@classmethod
+	def colors(self,names):
+		"""
+		Return a list of colors fron their names
+		Parameters:
+		   names: list of names
+		"""
+		return [self.colorsbyname[x] for x in names]
+#
+#
+#
+class Rotation():
+	"""
+    Class used for work with rotations. The stored value in the class is a quaternion
+	"""
+	def __init__(self,angle=None,vector=None,axis=None,quaternion=None,radians=False):
+		"""
+		Initializes the value for a rotation
+		Parameters:
+		   angle: angle of rotation
+
+		   vector: axis of rotation
+
+		   quaternion: The quaternion itself
+
+		   radians: must be True if the angle is entered in radians and False if the
+		            is entered in degrees.
+		"""
+		if vector is not None and axis is not None:
+			return
+		if axis is not None:
+			if axis in ('X','x'):
+				vector = Vector([1,0,0])
+			elif axis in ('Y','y'):
+				vector = Vector([0,1,0])
+			elif axis in ('Z','z'):
+				vector = Vector([0,0,1])
+			else:
+				return
+
+		if angle is not None:
+			if not radians:
+				angle = math.radians(angle)
+			if not isinstance(vector,Vector):
+				vector = Vector(vector)
+			self.quaternion = Quaternion(vector,angle)
+		elif quaternion is not None:
+			self.quaternion = quaternion
+		else:
+			self.quaternion = (1,0,0,0)
+	#
+	#
+	#
+	@classmethod
+	def from_euler_angles(self,psi,theta,phi,axis='ZXZ',radians=False):
+		"""
+		Initializes a rotation from its Euler angles in the order ZXZ
+		Parameters:
+		   phi, theta, psi: Euler angles
+
+		   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+
+		   radians: if radians, psi, theta and must be in radians
+		"""
+		if not radians:
+			phi = math.radians(phi)
+			theta = math.radians(theta)
+			psi = math.radians(psi)
+
+		if axis is None:
+			return None
+		if not isinstance(axis,str):
+			return None
+		axis = axis.upper()
+		if axis not in ('XYZ','XZY','YXZ','YZX','ZXY','ZYX','XYX','XZX','YXY','YZY','ZXZ','ZYZ'):
+			return None
+
+		r1 = Matrix.Rotation(psi,3,axis[0])
+		r2 = Matrix.Rotation(theta,3,axis[1])
+		r3 = Matrix.Rotation(phi,3,axis[2])
+		m = r3 @ r2 @ r1
+		q = m.to_quaternion()
+		return self(quaternion=q)
+	#
+	#
+	#
+	def apply(self,v):
+		"""
+        Applies the rotation to an object v
+		Parameters:
+		   v: any object that can be transformed by a rotation
+		"""
+		return self.quaternion @ v
+	#
+	#
+	#
+	def to_axis_angle(self,radians=False):
+		"""
+		Returns the axis and angle of the rotation
+		Parameters:
+		   radians: if True, the angle returned is in radians, if not, is
+		            returned in degrees
+		"""
+		v, alpha = self.quaternion.to_axis_angle()
+		if radians:
+			return v, alpha
+		return v, 180*alpha/math.pi
+	#
+	#
+	#
+	def to_euler_angles(self,axis='ZXZ',randomize=False,radians=False):
+		"""
+		Returns the Euler angles according to axis 'axis'
+		Parameters:
+		   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+
+		   randomize: if True and the rotation is in gimbal lock, phi is a random angle between 0 and psi
+
+		   radians: if True, the angle returned is in radians, if not, is
+		            returned in degrees
+		"""
+		axis = axis.upper()
+		if axis not in EULER_AXES:
+			return None
+		A = np.array(self.quaternion.to_matrix(),dtype=float)
+		psi, theta, phi = euler_angles(A,axis,randomize=randomize,radians=radians).tolist()
+		return psi, theta, phi
+#
+#
+#
+class RotationArray():
+	"""
+	Class used to work with arrays of rotations. The stored value is an array of shape (n,4) of unit
+	quaternions in the order w, x, y, z
+	"""
+	def __init__(self,quaternions=((1,0,0,0),)):
+		"""
+		Initializes the array of rotations
+		Parameters:
+		   quaternions: array of shape (n,4) of quaternions in the order w, x, y, z. They are normalized
+		"""
+		q = np.array(quaternions,dtype=float).reshape(-1,4)
+		self.quaternions = q / np.linalg.norm(q,axis=1)[:,None]
+	#
+	#
+	#
+	@classmethod
+	def from_rotations(self,rotations):
+		"""
+		Initializes the array from a list of objects of the class Rotation
+		Parameters:
+		   rotations: list of rotations
+		"""
+		return self([tuple(r.quaternion) for r in rotations])
+	#
+	#
+	#
+	@classmethod
+	def from_axis_angle(self,vectors,angles,radians=False):
+		"""
+		Initializes the array from the axes and the angles of the rotations
+		Parameters:
+		   vectors: array of shape (n,3) with the axes of rotation
+
+		   angles: array of n angles of rotation
+
+		   radians: must be True if the angles are in radians and False if they are in degrees
+		"""
+		vectors = np.asarray(vectors,dtype=float).reshape(-1,3)
+		angles = np.asarray(angles,dtype=float).reshape(-1)
+		if not radians:
+			angles = np.radians(angles)
+		vectors, angles = np.broadcast_arrays(vectors / np.linalg.norm(vectors,axis=1)[:,None],angles[:,None])
+		q = np.empty((len(vectors),4))
+		q[:,0] = np.cos(angles[:,0] / 2)
+		q[:,1:] = np.sin(angles / 2) * vectors
+		return self(q)
+	#
+	#
+	#
+	@classmethod
+	def from_euler_angles(self,angles,axis='ZXZ',radians=False):
+		"""
+		Initializes the array from the Euler angles (psi, theta, phi) of the rotations. Every rotation
+		is R3(phi) @ R2(theta) @ R1(psi) as in Rotation.from_euler_angles
+		Parameters:
+		   angles: array of shape (n,3) with the angles psi, theta and phi
+
+		   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+
+		   radians: must be True if the angles are in radians and False if they are in degrees
+		"""
+		axis = axis.upper()
+		if axis not in EULER_AXES:
+			return None
+		angles = np.asarray(angles,dtype=float).reshape(-1,3)
+		if not radians:
+			angles = np.radians(angles)
+		q = None
+		for n, c in enumerate(axis):
+			r = np.zeros((len(angles),4))
+			r[:,0] = np.cos(angles[:,n] / 2)
+			r[:,1 + "XYZ".index(c)] = np.sin(angles[:,n] / 2)
+			q = r if q is None else quaternion_product(r,q)
+		return self(q)
+	#
+	#
+	#
+	@classmethod
+	def random(self,n,seed=None):
+		"""
+		Returns an array of n random rotations uniformly distributed
+		Parameters:
+		   n: number of rotations
+
+		   seed: seed of the random generator
+		"""
+		return self(np.random.default_rng(seed).normal(size=(n,4)))
+	#
+	#
+	#
+	def __len__(self):
+		"""
+		Returns the number of rotations
+		"""
+		return len(self.quaternions)
+	#
+	#
+	#
+	def __getitem__(self,index):
+		"""
+		Returns the rotation in the position index as a Rotation, or a RotationArray if index is a slice or an array
+		"""
+		q = self.quaternions[index]
+		if q.ndim == 1:
+			return Rotation(quaternion=Quaternion(q))
+		return RotationArray(q)
+	#
+	#
+	#
+	def __matmul__(self,other):
+		"""
+		Returns the composition of the rotations, see compose
+		"""
+		return self.compose(other)
+	#
+	#
+	#
+	def compose(self,other):
+		"""
+		Returns the array of rotations that apply first the rotations of other and then the ones of self.
+		If one of the arrays has only one rotation, it is composed with all the rotations of the other
+		Parameters:
+		   other: a RotationArray or a Rotation
+		"""
+		if isinstance(other,Rotation):
+			other = RotationArray([tuple(other.quaternion)])
+		return RotationArray(quaternion_product(self.quaternions,other.quaternions))
+	#
+	#
+	#
+	def inverted(self):
+		"""
+		Returns the array of the inverse rotations
+		"""
+		return RotationArray(self.quaternions * np.array([1.0,-1.0,-1.0,-1.0]))
+	#
+	#
+	#
+	def to_matrices(self):
+		"""
+		Returns the array of shape (n,3,3) with the matrices of the rotations
+		"""
+		return quaternion_matrices(self.quaternions)
+	#
+	#
+	#
+	def apply(self,points):
+		"""
+		Applies the rotations to an array of points of shape (m,3). If there is only one rotation or
+		m is 1, the result has shape (max(n,m),3) and every rotation is applied to the corresponding point.
+		Otherwise n must be equal to m
+		Parameters:
+		   points: array of points
+		"""
+		points = np.asarray(points,dtype=float).reshape(-1,3)
+		return np.einsum('nij,nj->ni',self.to_matrices(),points) if len(self) == len(points) else \
+			np.einsum('...ij,...j->...i',self.to_matrices(),points)
+	#
+	#
+	#
+	def slerp(self,other,t):
+		"""
+		Returns the spherical linear interpolation between the rotations of self and other following
+		the shortest path
+		Parameters:
+		   other: a RotationArray or a Rotation
+
+		   t: parameter of the interpolation or array of n parameters. For t = 0 the result is self and
+		      for t = 1 is other
+		"""
+		if isinstance(other,Rotation):
+			other = RotationArray([tuple(other.quaternion)])
+		p = self.quaternions
+		q = other.quaternions
+		t = np.asarray(t,dtype=float).reshape(-1,1)
+		d = np.sum(p * q,axis=1,keepdims=True)
+		q = np.where(d < 0,-q,q)
+		d = np.abs(d)
+		omega = np.arccos(np.clip(d,-1.0,1.0))
+		s = np.sin(omega)
+		small = s < 1e-9
+		s = np.where(small,1.0,s)
+		a = np.where(small,1.0 - t,np.sin((1.0 - t) * omega) / s)
+		b = np.where(small,t,np.sin(t * omega) / s)
+		return RotationArray(a * p + b * q)
+	#
+	#
+	#
+	def to_axis_angle(self,radians=False):
+		"""
+		Returns the arrays of shapes (n,3) and (n,) with the axes and the angles of the rotations.
+		The axis of the identity is (1,0,0)
+		Parameters:
+		   radians: if True, the angles returned are in radians, if not, are returned in degrees
+		"""
+		q = self.quaternions
+		s = np.linalg.norm(q[:,1:],axis=1)
+		angles = 2 * np.arctan2(s,q[:,0])
+		vectors = np.tile([1.0,0.0,0.0],(len(q),1))
+		nonzero = s > 1e-12
+		vectors[nonzero] = q[nonzero,1:] / s[nonzero,None]
+		if radians:
+			return vectors, angles
+		return vectors, np.degrees(angles)
+	#
+	#
+	#
+	def to_euler_angles(self,axis='ZXZ',randomize=False,radians=False):
+		"""
+		Returns the array of shape (n,3) with the Euler angles (psi, theta, phi) of the rotations, between
+		0 and 360 degrees, as Rotation.to_euler_angles
+		Parameters:
+		   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+
+		   randomize: if True, phi is random in gimbal lock
+
+		   radians: if True, the angles returned are in radians, if not, are returned in degrees
+		"""
+		axis = axis.upper()
+		if axis not in EULER_AXES:
+			return None
+		return euler_angles(self.to_matrices(),axis,randomize=randomize,radians=radians)
+#
+#
+#
+class ScrewMotion():
+	"""
+	Class used to work with screw motions, i.e., rotations around an affine line followed by a translation
+	along the line. The poses of the objects and the trails of the points are computed as arrays
+	"""
+	def __init__(self,axis=Vector([0,0,1]),origin=Vector([0,0,0]),angle=360.0,translation=0.0,radians=False):
+		"""
+		Initializes the screw motion
+		Parameters:
+		   axis: direction of the line
+
+		   origin: a point of the line
+
+		   angle: angle of rotation of the whole motion
+
+		   translation: distance along the line of the whole motion
+
+		   radians: must be True if the angle is entered in radians and False if it is entered in degrees
+		"""
+		axis = np.array(axis,dtype=float)
+		self.axis = axis / np.linalg.norm(axis)
+		self.origin = np.array(origin,dtype=float)
+		self.angle = angle if radians else math.radians(angle)
+		self.translation = translation
+	#
+	#
+	#
+	def rotations(self,s):
+		"""
+		Returns the RotationArray of the rotations of the motion at the fractions s of the whole motion
+		Parameters:
+		   s: array of fractions of the motion. The fraction 0 is the initial position and 1 the final one
+		"""
+		return RotationArray.from_axis_angle(self.axis,self.angle * np.asarray(s,dtype=float),radians=True)
+	#
+	#
+	#
+	def transform(self,points,s):
+		"""
+		Returns the array of shape (n,3) of the positions of a point at the n fractions s of the motion,
+		or of n points at the same fraction
+		Parameters:
+		   points: a point or an array of shape (n,3) of points
+
+		   s: a fraction or an array of n fractions of the motion
+		"""
+		s = np.asarray(s,dtype=float).reshape(-1)
+		w = np.asarray(points,dtype=float).reshape(-1,3) - self.origin
+		return self.origin + self.rotations(s).apply(w) + self.translation * s[:,None] * self.axis
+	#
+	#
+	#
+	def trail(self,point,smin=0.0,smax=1.0,steps=128):
+		"""
+		Returns the array of shape (steps+1,3) with the points of the helix described by a point
+		Parameters:
+		   point: the point
+
+		   smin, smax: fractions of the motion of the first and last points of the helix
+
+		   steps: number of steps
+		"""
+		return self.transform(point,np.linspace(smin,smax,steps + 1))
+	#
+	#
+	#
+	def poses(self,obj,s,local=None):
+		"""
+		Returns the arrays of shapes (n,4) and (n,3) of the quaternions and the locations of an object
+		at the fractions s of the motion
+		Parameters:
+		   obj: the object. It must use the rotation mode 'QUATERNION'
+
+		   s: array of n fractions of the motion
+
+		   local: if not None, RotationArray of n rotations applied to the object instead of the rotations
+		          of the motion
+		"""
+		s = np.asarray(s,dtype=float).reshape(-1)
+		if local is None:
+			local = self.rotations(s)
+		quaternions = (local @ RotationArray([tuple(obj.rotation_quaternion)])).quaternions
+		return quaternions, self.transform(tuple(obj.location),s)
+	#
+	#
+	#
+	def keyframes(self,obj,frame,steps,local=None):
+		"""
+		Inserts the keyframes of rotation_quaternion and location of the motion of an object at the
+		frames frame, frame + 1, ..., frame + steps and leaves the object at its final pose
+		Parameters:
+		   obj: the object
+
+		   frame: first frame
+
+		   steps: number of steps of the motion
+
+		   local: if not None, RotationArray of steps + 1 rotations applied to the object instead of
+		          the rotations of the motion
+		"""
+		s = np.linspace(0.0,1.0,steps + 1)
+		quaternions, locations = self.poses(obj,s,local)
+		frames = frame + np.arange(steps + 1)
+		insert_keyframes(obj,"rotation_quaternion",frames,quaternions)
+		insert_keyframes(obj,"location",frames,locations)
+		obj.rotation_quaternion = tuple(quaternions[-1])
+		obj.location = tuple(locations[-1])
+		return locations
+#
+#
+#
+class EuclideanReference():
+	"""
+	Class used to work with Eucliean References
+	"""
+	def __init__(self,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0])):
+		"""
+		Initializes the elements of the reference from the origin and two independent vectors
+		Parameters:
+		   o: origin of
+		   u1, u2: vectors
+		"""
+		if isinstance(o,Vector):
+			self.origin = o
+		else:
+			self.origin = Vector(o)
+		if isinstance(u1,Vector):
+			v1 = u1
+		else:
+			v1 = Vector(v1)
+		if isinstance(u2,Vector):
+			v2 = u2
+		else:
+			v2 = Vector(u2)
+		v2 = v2 - v2.project(v1)
+		v1.normalize()
+		v2.normalize()
+		v3 = v1.cross(v2)
+		self.matrix = Matrix([v1,v2,v3]).transposed()
+	#
+	#
+	#
+	def coordinates(self,u=Vector([0,0,0])):
+		"""
+		Returns the coordinates of a point (expressed in the canonical reference) in the actual reference
+		Parameters:
+		   u: coordinates of a point in the canonical reference
+		"""
+		if not isinstance(u,Vector):
+			u = Vector(u)
+		return self.matrix.transposed() @ (u - self.origin)
+	#
+	#
+	#
+	def coordinates_array(self,points,out=None):
+		"""
+		Returns an array with the coordinates of an array of points (expressed in the canonical reference)
+		in the actual reference
+		Parameters:
+		   points: array of shape (n,3) with the coordinates of the points in the canonical reference
+
+		   out: if not None, array of shape (n,3) where the result is written
+		"""
+		mat = self.matrix.transposed().to_4x4()
+		mat.translation = -(self.matrix.transposed() @ self.origin)
+		return transform_array(mat,points,out=out)
+	#
+	#
+	#
+	def base(self):
+		"""
+		Returns the columns of the matrix
+		"""
+		mat = self.matrix.transposed()
+		return [mat.row[0],mat.row[1],mat.row[2]]
+#
+#
+#
+class GeometryCache():
+	"""
+	Class used to store in a directory the arrays of generated geometry. Every entry is a .npz file
+	whose name is the hash of the method, the parameters and the function used to generate it.
+	The least recently used entries are removed when the size of the directory exceeds maxsize
+	"""
+	def __init__(self,directory=None,maxsize=256*1024*1024):
+		"""
+		Initializes the cache
+		Parameters:
+		   directory: directory of the cache. If None, a directory in the temporary directory is used
+
+		   maxsize: maximum size in bytes of the cache
+		"""
+		if directory is None:
+			directory = os.path.join(tempfile.gettempdir(),"LinearAlgebra-cache")
+		os.makedirs(directory,exist_ok=True)
+		self.directory = directory
+		self.maxsize = maxsize
+	#
+	#
+	#
+	def key(self,method,fun,parameters):
+		"""
+		Returns the key of an entry of the cache
+		Parameters:
+		   method: name of the method that generates the geometry
+
+		   fun: function evaluated by the method
+
+		   parameters: list of the rest of the parameters of the method
+		"""
+		digest = hashlib.sha1(method.encode())
+		fingerprint(fun,digest)
+		fingerprint(parameters,digest)
+		return digest.hexdigest()
+	#
+	#
+	#
+	def path(self,key):
+		"""
+		Returns the path of the file of the entry with key 'key'
+		Parameters:
+		   key: key of the entry
+		"""
+		return os.path.join(self.directory,key + ".npz")
+	#
+	#
+	#
+	def get(self,key):
+		"""
+		Returns a dictionary with the arrays stored with key 'key' or None if the entry does not exist
+		Parameters:
+		   key: key of the entry
+		"""
+		path = self.path(key)
+		try:
+			with np.load(path) as data:
+				arrays = {k: data[k] for k in data.files}
+			os.utime(path)
+		except (OSError,ValueError,EOFError,zipfile.BadZipFile):
+			return None
+		return arrays
+	#
+	#
+	#
+	def put(self,key,arrays):
+		"""
+		Stores a dictionary of arrays with key 'key' and removes the least recently used entries
+		if needed
+		Parameters:
+		   key: key of the entry
+
+		   arrays: dictionary of numpy arrays
+		"""
+		path = self.path(key)
+		tmp = path + ".%d.tmp" % os.getpid()
+		try:
+			with open(tmp,'wb') as f:
+				np.savez(f,**arrays)
+			os.replace(tmp,path)
+		except OSError:
+			if os.path.exists(tmp):
+				os.remove(tmp)
+			return
+		self.evict()
+	#
+	#
+	#
+	def evict(self):
+		"""
+		Removes the least recently used entries until the size of the cache is smaller than self.maxsize
+		"""
+		entries = []
+		total = 0
+		for entry in os.scandir(self.directory):
+			if not entry.name.endswith(".npz"):
+				continue
+			st = entry.stat()
+			entries.append((st.st_mtime,st.st_size,entry.path))
+			total += st.st_size
+		if total <= self.maxsize:
+			return
+		entries.sort()
+		for mtime, size, path in entries:
+			if total <= self.maxsize:
+				break
+			try:
+				os.remove(path)
+			except OSError:
+				continue
+			total -= size
+	#
+	#
+	#
+	def clear(self):
+		"""
+		Removes all the entries of the cache
+		"""
+		for entry in os.scandir(self.directory):
+			if entry.name.endswith(".npz"):
+				os.remove(entry.path)
+#
+#
+#
+class ObjectRegistry():
+	"""
+	Class used to index the objects drawn by LinearAlgebra by tags: kind (the name of the drawing
+	method without the prefix draw_), color, group and call (the number of the call). The queries
+	return the objects themselves, so they don't depend on the names of the objects
+	"""
+	def __init__(self):
+		"""
+		Initializes an empty registry
+		"""
+		self.index = {}
+		self.tags = {}
+	#
+	#
+	#
+	def add(self,obj,**tags):
+		"""
+		Adds an object to the registry
+		Parameters:
+		   obj: the object
+
+		   tags: values of the tags of the object
+		"""
+		key = obj.as_pointer()
+		if key in self.tags:
+			self.discard(key)
+		self.tags[key] = (obj,tags)
+		for tag in tags.items():
+			self.index.setdefault(tag,{})[key] = obj
+	#
+	#
+	#
+	def discard(self,key):
+		"""
+		Removes an object from the registry
+		Parameters:
+		   key: pointer of the object
+		"""
+		obj, tags = self.tags.pop(key,(None,{}))
+		for tag in tags.items():
+			entries = self.index.get(tag)
+			if entries is not None:
+				entries.pop(key,None)
+				if len(entries) == 0:
+					del self.index[tag]
+	#
+	#
+	#
+	def find(self,**tags):
+		"""
+		Returns the list of objects with the given values of the tags. The objects that don't exist
+		anymore are removed from the registry
+		Parameters:
+		   tags: values of the tags. For instance, find(kind="vector",call=3)
+		"""
+		if len(tags) == 0:
+			candidates = [(key,obj) for key, (obj,t) in self.tags.items()]
+		else:
+			entries = sorted((self.index.get(tag,{}) for tag in tags.items()),key=len)
+			candidates = [(key,obj) for key, obj in entries[0].items() if all(key in e for e in entries[1:])]
+		objects = []
+		for key, obj in candidates:
+			try:
+				obj.name
+			except ReferenceError:
+				self.discard(key)
+				continue
+			objects.append(obj)
+		return objects
+	#
+	#
+	#
+	def hide(self,hide=True,**tags):
+		"""
+		Hides or shows in the viewport and in the render the objects with the given values of the tags
+		Parameters:
+		   hide: if True, the objects are hidden, else they are shown
+
+		   tags: values of the tags
+		"""
+		for obj in self.find(**tags):
+			obj.hide_set(hide)
+			obj.hide_render = hide
+	#
+	#
+	#
+	def delete(self,**tags):
+		"""
+		Removes the objects with the given values of the tags
+		Parameters:
+		   tags: values of the tags
+		"""
+		objects = self.find(**tags)
+		for obj in objects:
+			self.discard(obj.as_pointer())
+		bpy.data.batch_remove(objects)
+	#
+	#
+	#
+	def clear(self):
+		"""
+		Removes all the objects from the registry
+		"""
+		self.index = {}
+		self.tags = {}
+#
+#
+#
+class LinearAlgebra():
+	"""
+	Class used to define all the functions in this module to work with graphics in Blender
+	"""
+	def __init__(self):
+		"""
+        Initializes the values for scene, objects, meshes, collection, etc.
+		"""
+		self.scene = bpy.context.scene
+		self.objects = bpy.data.objects
+		self.meshes = bpy.data.meshes
+		self.collection = bpy.context.collection
+		self.ops = bpy.ops
+		self.colors= Colors.colors(["Red","GreenDarkHard","Blue"])
+		self.rotation = None
+		self.origin = [0,0,0]
+		self.base = [[1,0,0],[0,1,0],[0,0,1]]
+		self.defaultcolor = None
+		self.frame = 0
+		self.cache = None
+		self.incremental = False
+		self.records = {}
+		self.visited = set()
+		self.occurrences = {}
+		self.maps = {}
+		self.depth = 0
+		self.registry = ObjectRegistry()
+		self.constructs = False
+		self.axes = {}
+		self.linked = False
+		self.primitives = {}
+		self.group = None
+		self.calls = 0
+		self.nested = {}
+		self.references = []
+		self.matrices = None
+	#
+	#
+	#
+	def base_cilinder(self):
+		"""
+		Draws a base cilinder with radius 1 and depth 1 and returns it
+		"""
+		bpy.ops.mesh.primitive_cylinder_add(radius=1,depth=1,enter_editmode=False,location=(0, 0, 0))
+		bpy.ops.transform.translate(value=(0, 0, 0.5), orient_type='GLOBAL',orient_matrix_type='GLOBAL',
+			constraint_axis=(False, False, True), mirror=True, use_proportional_edit=False,
+			proportional_edit_falloff='SMOOTH',proportional_size=1, use_proportional_connected=False, use_proportional_projected=False)
+		bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
+		bpy.ops.object.shade_smooth()
+		obj = bpy.context.object
+		obj.name = 'Arrow_stem'
+		return obj
+	#
+	#
+	#
+	def base_cone(self):
+		"""
+		Draws a base cone with radius1=1.5, radius2=0, depth=2 and returns it
+		"""
+		bpy.ops.mesh.primitive_cone_add(radius1=1.5, radius2=0, depth=2, enter_editmode=False, location=(0, 0, 0))
+		bpy.ops.transform.translate(value=(0, 0, 1), orient_type='GLOBAL',orient_matrix_type='GLOBAL',
+			constraint_axis=(False, False, True), mirror=True, use_proportional_edit=False,
+			proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False)
+		bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
+		bpy.ops.object.shade_smooth()
+		obj = bpy.context.object
+		obj.name = 'Arrow_cone'
+		return obj
+	#
+	#
+	#
+	def base_disk(self):
+		"""
+		Draws a base disk with radius 1 and returns it
+		"""
+		bpy.ops.mesh.primitive_circle_add(vertices=32,fill_type='NGON',enter_editmode=False,align='WORLD',location=(0.0, 0.0, 0.0))
+		bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
+		bpy.ops.object.shade_smooth()
+		obj = bpy.context.object
+		obj.name = 'Base_disk'
+		return obj
+	#
+	#
+	#
+	def delete_base_cilinder(self,obj=None):
+		"""
+		Removes the base cilinder
+		Parameters:
+		   obj: the base cilinder. If None, it is searched by name
+		"""
+		if obj is None:
+			obj = bpy.data.objects['Arrow_stem']
+		bpy.ops.object.select_all(action='DESELECT')
+		obj.select_set(True)
+		bpy.ops.object.delete()
+	#
+	#
+	#
+	def delete_base_cone(self,obj=None):
+		"""
+		Removes the base cone
+		Parameters:
+		   obj: the base cone. If None, it is searched by name
+		"""
+		if obj is None:
+			obj = bpy.data.objects['Arrow_cone']
+		bpy.ops.object.select_all(action='DESELECT')
+		obj.select_set(True)
+		bpy.ops.object.delete()
+	#
+	#
+	#
+	def delete_base_disk(self,obj=None):
+		"""
+		Removes the base disk
+		Parameters:
+		   obj: the base disk. If None, it is searched by name
+		"""
+		if obj is None:
+			obj = bpy.data.objects['Base_disk']
+		bpy.ops.object.select_all(action='DESELECT')
+		obj.select_set(True)
+		bpy.ops.object.delete()
+	#
+	#
+	#
+	def set_linked_primitives(self,linked=True):
+		"""
+		In linked mode, the stems and heads of vectors, lines and axis share one mesh for every
+		unit primitive. Every part is an object with its own transformation and material, and the
+		parts of a vector or axis are parented to the first one instead of being joined
+		Parameters:
+		   linked: if True, the linked mode is enabled
+		"""
+		self.linked = linked
+	#
+	#
+	#
+	def unit_primitive(self,kind):
+		"""
+		Returns the shared mesh of an unit primitive, creating it if needed. The stem is a cylinder
+		with radius 1 and depth 1 and the cone has radius 1.5 and depth 2, both with base at z=0
+		Parameters:
+		   kind: 'stem' or 'cone'
+		"""
+		mesh = self.primitives.get(kind)
+		if mesh is not None:
+			try:
+				mesh.name
+				return mesh
+			except ReferenceError:
+				pass
+		bm = bmesh.new()
+		if kind == "stem":
+			bmesh.ops.create_cone(bm,cap_ends=True,segments=32,radius1=1,radius2=1,depth=1)
+			bmesh.ops.translate(bm,vec=(0,0,0.5),verts=bm.verts)
+		else:
+			bmesh.ops.create_cone(bm,cap_ends=True,segments=32,radius1=1.5,radius2=0,depth=2)
+			bmesh.ops.translate(bm,vec=(0,0,1),verts=bm.verts)
+		for f in bm.faces:
+			f.smooth = True
+		mesh = tagged(bpy.data.meshes.new("Unit_" + kind))
+		bm.to_mesh(mesh)
+		bm.free()
+		mesh.materials.append(None)
+		self.primitives[kind] = mesh
+		return mesh
+	#
+	#
+	#
+	def primitive_copy(self,template,kind,copy_data=True):
+		"""
+		Returns a new object not linked to any collection for a part of a vector, line or axis. In linked
+		mode it uses the shared mesh of the unit primitive and its material is linked to the object
+		Parameters:
+		   template: template object drawn by base_cilinder or base_cone. It is None in linked mode
+
+		   kind: 'stem' or 'cone'
+
+		   copy_data: if True, the mesh of the template is copied
+		"""
+		if template is None:
+			obj = bpy.data.objects.new(kind,self.unit_primitive(kind))
+			obj.material_slots[0].link = 'OBJECT'
+			return obj
+		obj = template.copy()
+		if copy_data:
+			obj.data = obj.data.copy()
+		return obj
+	#
+	#
+	#
+	def parent_parts(self,obj,parts):
+		"""
+		Parents a list of objects to obj keeping their positions
+		Parameters:
+		   obj: the parent
+
+		   parts: list of objects. The elements that are None are ignored
+		"""
+		inverse = obj.matrix_basis.inverted()
+		for part in parts:
+			if part is not None:
+				part.parent = obj
+				part.matrix_parent_inverse = inverse
+	#
+	#
+	#
+	def set_colors(self,names=None):
+		"""
+		Set self.colors to the list of colors with names 'names'
+		Parameters:
+		   names: list of name colors
+		"""
+		if names is None:
+			self.colors = Colors.colors(["Red","GreenDarkHard","Blue"])
+		else:
+			self.colors = Colors.colors(names)
+	#
+	#
+	#
+	def reset_colors(self):
+		"""
+		Set self.colors to default colors
+		"""
+		self.colors = Colors.colors(["Red","GreenDarkHard","Blue"])
+	#
+	#
+	#
+	def set_default_color(self,name):
+		"""
+		Set self.defaultcolor to the color with name 'name'
+		Parameters:
+		   name: name of a color
+		"""
+		self.defaultcolor = name
+	#
+	#
+	#
+	def reset_frames(self):
+		"""
+		Set self.frame to 0
+		Parameters:
+		   name: name of a color
+		"""
+		self.frame = 0
+	#
+	#
+	#
+	def reset(self):
+		"""
+		Resets origin, base, rotation, frames and colors
+		"""
+		self.reset_origin()
+		self.reset_base()
+		self.reset_rotation()
+		self.reset_frames()
+		self.reset_colors()
+	#
+	#
+	#
+	def set_rotation(self,angle=None,vector=None,quaternion=None):
+		"""
+		Sets self.rotation to the rotation defined by an angle and an axis or
+		by a quaternion.
+		Parameters:
+		   angle: angle of rotation in degrees
+
+		   vector: axis of rotation
+
+		   quaternion: quaternion that defines a rotation
+
+		The angle and vector takes precedence over the quaternion
+		"""
+		if angle is not None:
+			self.rotation = Rotation(angle,vector)
+		elif quaternion is not None:
+			self.rotation = Rotation(quaternion=quaternion)
+		else:
+			self.rotation = Rotation(0,[1,0,0])
+	#
+	#
+	#
+	def reset_rotation(self):
+		"""
+		Sets the rotation to identity, i.e., rotation of 0 degrees around the
+		vector (1,0,0)
+		"""
+		self.set_rotation()
+	#
+	#
+	#
+	def set_origin(self,vector=[0,0,0]):
+		"""
+		Sets the origin of the reference coordinates used to display objects.
+		Parameters:
+		   vector: origin's position
+		"""
+		if isinstance(vector,Vector):
+			v1 = vector.copy()
+		else:
+			v1 = Vector(vector)
+		self.origin = v1
+	#
+	#
+	#
+	def reset_origin(self):
+		"""
+		Sets the origin to the point (0,0,0)
+		"""
+		self.origin = Vector([0,0,0])
+	#
+	#
+	#
+	def reset_base(self):
+		"""
+		Sets self.base to the canonical basis
+		"""
+		self.base = [[1,0,0],[0,1,0],[0,0,1]]
+	#
+	#
+	#
+	def set_base(self,base=[[1,0,0],[0,1,0],[0,0,1]],orthonormal=False):
+		"""
+		Sets the self.base, i.e., the basis of the reference coordinates used to display
+		objects
+		Parameters:
+		   base: list of three vectors
+
+		   orthonormal: if True, the Gram-Schmidt method is applied and the vectors
+		   are normalized.
+		"""
+		if orthonormal:
+			u1 = base[0]
+			u2 = base[1]
+			if isinstance(u1,Vector):
+				v1 = u1
+			else:
+				v1 = Vector(u1)
+			if isinstance(u2,Vector):
+				v2 = u2
+			else:
+				v2 = Vector(u2)
+			v2 = v2 - v2.project(v1)
+			v1.normalize()
+			v2.normalize()
+			v3 = v1.cross(v2)
+			self.base=[v1,v2,v3]
+		else:
+			self.base = base
+	#
+	#
+	#
+	def base_is_canonica(self):
 		"""
-		Function that returns a color from his name
-		Parameters:
-		   name: name of the color
+		Returns True if self.base is the canonical basis
 		"""
-		try:
-			color = self.colorsbyname[name]
-		except:
-			return self.colorsbyname["Black"]
-		return color
+		return Matrix(self.base).is_identity
 	#
 	#
 	#
-	@classmethod
-	def colors(self,names):
+	def set_cache(self,directory=None,maxsize=256*1024*1024):
 		"""
-		Return a list of colors fron their names
+		Enables the disk cache of generated geometry. draw_surface, draw_function, revolution_surface,
+		the curves and draw_vector_field reuse the arrays computed in previous executions with the same
+		function and parameters
 		Parameters:
-		   names: list of names
+		   directory: directory of the cache. If None, a directory in the temporary directory is used
+
+		   maxsize: maximum size in bytes of the cache
 		"""
-		return [self.colorsbyname[x] for x in names]
-#
-#
-#
-class Rotation():
-	"""
-    Class used for work with rotations. The stored value in the class is a quaternion
-	"""
-	def __init__(self,angle=None,vector=None,axis=None,quaternion=None,radians=False):
+		self.cache = GeometryCache(directory=directory,maxsize=maxsize)
+	#
+	#
+	#
+	def reset_cache(self):
 		"""
-		Initializes the value for a rotation
+		Disables the disk cache of generated geometry
+		"""
+		self.cache = None
+	#
+	#
+	#
+	def cached_geometry(self,method,fun,parameters,compute):
+		"""
+		Returns the dictionary of arrays computed by 'compute' or the one stored in the cache
+		if the method, the function and the parameters are the same
 		Parameters:
-		   angle: angle of rotation
+		   method: name of the method that generates the geometry
 
-		   vector: axis of rotation
+		   fun: function evaluated by the method
 
-		   quaternion: The quaternion itself
+		   parameters: list of the rest of the parameters of the method
 
-		   radians: must be True if the angle is entered in radians and False if the
-		            is entered in degrees.
+		   compute: function without parameters that returns a dictionary of numpy arrays
 		"""
-		if vector is not None and axis is not None:
-			return
-		if axis is not None:
-			if axis in ('X','x'):
-				vector = Vector([1,0,0])
-			elif axis in ('Y','y'):
-				vector = Vector([0,1,0])
-			elif axis in ('Z','z'):
-				vector = Vector([0,0,1])
-			else:
-				return
-
-		if angle is not None:
-			if not radians:
-				angle = math.radians(angle)
-			if not isinstance(vector,Vector):
-				vector = Vector(vector)
-			self.quaternion = Quaternion(vector,angle)
-		elif quaternion is not None:
-			self.quaternion = quaternion
-		else:
-			self.quaternion = (1,0,0,0)
+		if self.cache is None:
+			return compute()
+		try:
+			key = self.cache.key(method,fun,parameters)
+		except TypeError:
+			#
+			# The function depends on a state that can't be hashed
+			#
+			return compute()
+		arrays = self.cache.get(key)
+		if arrays is None:
+			arrays = compute()
+			self.cache.put(key,arrays)
+		return arrays
 	#
 	#
 	#
-	@classmethod
-	def from_euler_angles(self,psi,theta,phi,axis='ZXZ',radians=False):
+	def sampled_curve(self,fun,tmin,tmax,steps,tolerance=None):
 		"""
-		Initializes a rotation from its Euler angles in the order ZXZ
+		Returns the array of points of a parametric curve, stored in the cache of geometry if it is enabled
 		Parameters:
-		   phi, theta, psi: Euler angles
-
-		   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
+		   fun: the parametric function
 
-		   radians: if radians, psi, theta and must be in radians
-		"""
-		if not radians:
-			phi = math.radians(phi)
-			theta = math.radians(theta)
-			psi = math.radians(psi)
+		   tmin, tmax: limits of the parameter
 
-		if axis is None:
-			return None
-		if not isinstance(axis,str):
-			return None
-		axis = axis.upper()
-		if axis not in ('XYZ','XZY','YXZ','YZX','ZXY','ZYX','XYX','XZX','YXY','YZY','ZXZ','ZYZ'):
-			return None
+		   steps: number of steps
 
-		r1 = Matrix.Rotation(psi,3,axis[0])
-		r2 = Matrix.Rotation(theta,3,axis[1])
-		r3 = Matrix.Rotation(phi,3,axis[2])
-		m = r3 @ r2 @ r1
-		q = m.to_quaternion()
-		return self(quaternion=q)
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
+		"""
+		if tolerance is None:
+			return self.cached_geometry("curve",fun,(tmin,tmax,steps),lambda: {"points": curve_points(fun,tmin,tmax,steps)})["points"]
+		return self.cached_geometry("adaptive curve",fun,(tmin,tmax,steps,tolerance),lambda: {"points": adaptive_curve_points(fun,tmin,tmax,steps,tolerance)})["points"]
 	#
 	#
 	#
-	def apply(self,v):
+	def begin_incremental(self):
 		"""
-        Applies the rotation to an object v
-		Parameters:
-		   v: any object that can be transformed by a rotation
+		Starts an incremental execution of a script. Instead of calling clear(), a script can start
+		with begin_incremental() and finish with end_incremental(). Every drawing call is identified by
+		the method, the parameter 'name' and the number of previous calls with the same method and name.
+		The objects drawn by the calls whose parameters didn't change since the previous execution are
+		kept, the ones whose parameters changed are drawn again and the ones of calls that are not made
+		anymore are removed in end_incremental()
 		"""
-		return self.quaternion @ v
+		self.reset()
+		self.incremental = True
+		self.visited = set()
+		self.occurrences = {}
+		self.maps = {}
+		try:
+			self.records = json.loads(bpy.context.scene.get("LinearAlgebra","{}"))
+		except (TypeError,ValueError):
+			self.records = {}
 	#
 	#
 	#
-	def to_axis_angle(self,radians=False):
+	def end_incremental(self):
 		"""
-		Returns the axis and angle of the rotation
-		Parameters:
-		   radians: if True, the angle returned is in radians, if not, is
-		            returned in degrees
+		Finishes an incremental execution. Removes the objects drawn by calls of the previous execution
+		that haven't been made in this one, undoes the affine maps applied by them to the objects that are
+		kept and stores the records of the calls in the scene
 		"""
-		v, alpha = self.quaternion.to_axis_angle()
-		if radians:
-			return v, alpha
-		return v, 180*alpha/math.pi
+		for slot in list(self.records):
+			if slot not in self.visited:
+				self.remove_datablocks(self.records[slot].get("data",[]))
+				del self.records[slot]
+		for data in list(bpy.data.meshes) + list(bpy.data.curves):
+			if "LinearAlgebra original" in data:
+				maps = stored_maps(data)
+				n = self.maps.get(data.name,0)
+				if n < len(maps):
+					apply_maps(data,maps[:n])
+		bpy.context.scene["LinearAlgebra"] = json.dumps(self.records)
+		self.incremental = False
 	#
 	#
 	#
-	def to_euler_angles(self,axis='ZXZ',randomize=False,radians=False):
+	def reference_matrices(self):
 		"""
-		Returns the Euler angles according to axis 'axis'
-		Parameters:
-		   axis: it must be 'XYZ', 'XZY', 'YXZ', 'YZX', 'ZXY', 'ZYX', 'XYX', 'XZX', 'YXY', 'YZY', 'ZXZ' or 'ZYZ'
-
-		   radians: if True, the angle returned is in radians, if not, is
-		            returned in degrees
+		Returns the tuple (M, N, B) where M is the 4x4 affine matrix that transforms the coordinates in the
+		reference determined by self.origin, self.rotation and the basis self.base into the canonical ones,
+		N is its inverse and B is the transposed matrix of self.base. The matrices are frozen and they
+		are computed again only if the origin, the basis or the rotation change
 		"""
-		def ACOS(x):
-			if x > 1.0:
-				x = 1.0
-			if x < -1.0:
-				x = -1.0
-			return math.acos(x)
-
-		def ASIN(x):
-			if x > 1.0:
-				x = 1.0
-			if x < -1.0:
-				x = -1.0
-			return math.asin(x)
-
-		axis = axis.upper()
-		if axis not in ('XYZ','XZY','YXZ','YZX','ZXY','ZYX','XYX','XZX','YXY','YZY','ZXZ','ZYZ'):
-			return None
-		rndm = 0
-		A = self.quaternion.to_matrix()
-		if axis == 'ZXZ':
-			theta = ACOS(A[2][2])
-			if abs(A[2][2]) != 1:
-				psi = math.atan2(A[2][0],A[2][1])
-				phi = math.atan2(A[0][2],-A[1][2])
-			else:
-				rndm = A[2][2]
-				phi = 0
-				psi = math.atan2(A[1][0],A[0][0])
-		if axis == 'XZX':
-			theta = ACOS(A[0][0])
-			if abs(A[0][0]) != 1:
-				psi = math.atan2(A[0][2],-A[0][1])
-				phi = math.atan2(A[2][0],A[1][0])
-			else:
-				rndm = A[0][0]
-				phi = 0
-				psi = math.atan2(-A[1][2],A[2][2])
-		if axis == 'ZYZ':
-			theta = ACOS(A[2][2])
-			if abs(A[2][2]) != 1:
-				psi = math.atan2(A[2][1],-A[2][0])
-				phi = math.atan2(A[1][2],A[0][2])
-			else:
-				rndm = A[2][2]
-				phi = 0
-				psi = math.atan2(-A[0][1],A[1][1])
-		if axis == 'YZY':
-			theta = ACOS(A[1][1])
-			if abs(A[1][1]) != 1:
-				psi = math.atan2(A[1][2],A[1][0])
-				phi = math.atan2(A[2][1],-A[0][1])
-			else:
-				rndm = A[1][1]
-				phi = 0
-				psi = math.atan2(A[0][2],A[2][2])
-		if axis == 'XYX':
-			theta = ACOS(A[0][0])
-			if abs(A[0][0]) != 1:
-				psi = math.atan2(A[0][1],A[0][2])
-				phi = math.atan2(A[1][0],-A[2][0])
-			else:
-				rndm = A[0][0]
-				phi = 0
-				psi = math.atan2(A[2][1],A[1][1])
-		if axis == 'YXY':
-			theta = ACOS(A[1][1])
-			if abs(A[1][1]) != 1:
-				psi = math.atan2(A[1][0],-A[1][2])
-				phi = math.atan2(A[0][1],A[2][1])
-			else:
-				rndm = A[1][1]
-				phi = 0
-				psi = math.atan2(-A[2][0],A[0][0])
-		if axis == 'XYZ':
-			theta = ASIN(-A[2][0])
-			if abs(A[2][0]) != 1:
-				psi = math.atan2(A[2][1],A[2][2])
-				phi = math.atan2(A[1][0],A[0][0])
-			else:
-				rndm = A[2][0]
-				phi = 0
-				psi = math.atan2(-A[0][1],A[1][1])
-		if axis == 'XZY':
-			theta = ASIN(A[1][0])
-			if abs(A[1][0]) != 1:
-				psi = math.atan2(-A[1][2],A[1][1])
-				phi = math.atan2(-A[2][0],A[0][0])
-			else:
-				rndm = A[1][0]
-				phi = 0
-				psi = math.atan2(A[0][2],A[2][2])
-		if axis == 'YXZ':
-			theta = ASIN(A[2][1])
-			if abs(A[2][1]) != 1:
-				psi = math.atan2(-A[2][0],A[2][2])
-				phi = math.atan2(-A[0][1],A[1][1])
-			else:
-				rndm = A[2][1]
-				phi = 0
-				psi = math.atan2(A[1][0],A[0][0])
-		if axis == 'YZX':
-			theta = ASIN(-A[0][1])
-			if abs(A[0][1]) != 1:
-				psi = math.atan2(A[0][2],A[0][0])
-				phi = math.atan2(A[2][1],A[1][1])
-			else:
-				rndm = A[0][1]
-				phi = 0
-				psi = math.atan2(-A[1][2],A[2][2])
-		if axis == 'ZXY':
-			theta = ASIN(-A[1][2])
-			if abs(A[1][2]) != 1:
-				psi = math.atan2(A[1][0],A[1][1])
-				phi = math.atan2(A[0][2],A[2][2])
-			else:
-				rndm = A[1][2]
-				phi = 0
-				psi = math.atan2(-A[0][2],A[0][0])
-		if axis == 'ZYX':
-			theta = ASIN(A[0][2])
-			if abs(A[0][2]) != 1:
-				psi = math.atan2(-A[0][1],A[0][0])
-				phi = math.atan2(-A[1][2],A[2][2])
-			else:
-				rndm = A[0][2]
-				phi = 0
-				psi = math.atan2(A[2][1],A[1][1])
-
-		if psi < 0:
-			psi += 2*math.pi
-		if theta < 0:
-			theta += 2*math.pi
-		if phi < 0:
-			phi += 2*math.pi
-
-		if rndm != 0 and randomize:
-			phi = random.uniform(0.0,psi)
-			psi = rndm * (psi - phi)
-			if psi < 0:
-				psi += 2*math.pi
-
-		if not radians:
-			psi, theta, phi = 180.0/math.pi * psi, 180.0/math.pi * theta, 180.0/math.pi * phi
-			T = 359.9
-		else:
-			T = 359.9 * math.pi / 180.0
-		if psi > T:
-			psi = 0.0
-		if theta > T:
-			theta = 0.0
-		if phi > T:
-			phi = 0.0
-		return psi, theta, phi
-#
-#
-#
-class EuclideanReference():
-	"""
-	Class used to work with Eucliean References
-	"""
-	def __init__(self,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0])):
+		key = (tuple(float(x) for x in self.origin),tuple(tuple(float(x) for x in u) for u in self.base),
+			None if self.rotation is None else tuple(self.rotation.quaternion))
+		if self.matrices is None or self.matrices[0] != key:
+			base = Matrix(self.base).transposed()
+			mat = base.to_4x4()
+			if self.rotation is not None:
+				mat = self.rotation.quaternion.to_matrix().to_4x4() @ mat
+			mat = Matrix.Translation(Vector(key[0])) @ mat
+			inverse = mat.inverted_safe()
+			for m in (base,mat,inverse):
+				m.freeze()
+			self.matrices = (key,mat,inverse,base)
+		return self.matrices[1:]
+	#
+	#
+	#
+	def reference_matrix(self,inverse=False):
 		"""
-		Initializes the elements of the reference from the origin and two independent vectors
+		Returns the 4x4 affine matrix that transforms the coordinates in the reference determined by
+		self.origin, self.rotation and the basis self.base into the canonical ones, or its inverse
 		Parameters:
-		   o: origin of
-		   u1, u2: vectors
+		   inverse: if True, the inverse matrix is returned
 		"""
-		if isinstance(o,Vector):
-			self.origin = o
-		else:
-			self.origin = Vector(o)
-		if isinstance(u1,Vector):
-			v1 = u1
-		else:
-			v1 = Vector(v1)
-		if isinstance(u2,Vector):
-			v2 = u2
-		else:
-			v2 = Vector(u2)
-		v2 = v2 - v2.project(v1)
-		v1.normalize()
-		v2.normalize()
-		v3 = v1.cross(v2)
-		self.matrix = Matrix([v1,v2,v3]).transposed()
+		mat, inv, base = self.reference_matrices()
+		if inverse:
+			return inv
+		return mat
 	#
 	#
 	#
-	def coordinates(self,u=Vector([0,0,0])):
+	def base_matrix(self):
 		"""
-		Returns the coordinates of a point (expressed in the canonical reference) in the actual reference
+		Returns the transposed matrix of self.base, i.e., the matrix whose columns are the vectors of the basis
+		"""
+		return self.reference_matrices()[2]
+	#
+	#
+	#
+	def push_reference(self,origin=None,base=None,rotation=None,orthonormal=False):
+		"""
+		Saves the actual origin, basis and rotation in a stack and sets the new ones that are not None
 		Parameters:
-		   u: coordinates of a point in the canonical reference
+		   origin: the new origin
+
+		   base: the new basis
+
+		   rotation: the new rotation. It can be a Rotation or a Quaternion
+
+		   orthonormal: if True, the Gram-Schmidt method is applied to the new basis
 		"""
-		if not isinstance(u,Vector):
-			u = Vector(u)
-		return self.matrix.transposed() @ (u - self.origin)
+		self.references.append((Vector(self.origin),[Vector(u) for u in self.base],self.rotation))
+		if origin is not None:
+			self.set_origin(origin)
+		if base is not None:
+			self.set_base(base,orthonormal=orthonormal)
+		if isinstance(rotation,Rotation):
+			self.rotation = rotation
+		elif rotation is not None:
+			self.set_rotation(quaternion=rotation)
 	#
 	#
 	#
-	def base(self):
+	def pop_reference(self):
 		"""
-		Returns the columns of the matrix
+		Restores the origin, the basis and the rotation saved by the last call to push_reference
 		"""
-		mat = self.matrix.transposed()
-		return [mat.row[0],mat.row[1],mat.row[2]]
-#
-#
-#
-class LinearAlgebra():
-	"""
-	Class used to define all the functions in this module to work with graphics in Blender
-	"""
-	def __init__(self):
+		if len(self.references) == 0:
+			return
+		self.origin, self.base, self.rotation = self.references.pop()
+	#
+	#
+	#
+	@contextlib.contextmanager
+	def reference(self,origin=None,base=None,rotation=None,orthonormal=False):
 		"""
-        Initializes the values for scene, objects, meshes, collection, etc.
+		Context manager that sets a new origin, basis and rotation and restores the previous ones at
+		the end of the block. It returns the affine matrix of the new reference.
+		Parameters:
+		   origin: the new origin
+
+		   base: the new basis
+
+		   rotation: the new rotation. It can be a Rotation or a Quaternion
+
+		   orthonormal: if True, the Gram-Schmidt method is applied to the new basis
 		"""
-		self.scene = bpy.context.scene
-		self.objects = bpy.data.objects
-		self.meshes = bpy.data.meshes
-		self.collection = bpy.context.collection
-		self.ops = bpy.ops
-		self.colors= Colors.colors(["Red","GreenDarkHard","Blue"])
-		self.rotation = None
-		self.origin = [0,0,0]
-		self.base = [[1,0,0],[0,1,0],[0,0,1]]
-		self.defaultcolor = None
-		self.frame = 0
+		self.push_reference(origin=origin,base=base,rotation=rotation,orthonormal=orthonormal)
+		try:
+			yield self.reference_matrix()
+		finally:
+			self.pop_reference()
 	#
 	#
 	#
-	def base_cilinder(self):
+	def drawing_state(self):
 		"""
-		Draws a base cilinder with radius 1 and depth 1
+		Returns a dictionary with origin, base, rotation, colors, default color and frames
 		"""
-		bpy.ops.mesh.primitive_cylinder_add(radius=1,depth=1,enter_editmode=False,location=(0, 0, 0))
-		bpy.ops.transform.translate(value=(0, 0, 0.5), orient_type='GLOBAL',orient_matrix_type='GLOBAL',
-			constraint_axis=(False, False, True), mirror=True, use_proportional_edit=False,
-			proportional_edit_falloff='SMOOTH',proportional_size=1, use_proportional_connected=False, use_proportional_projected=False)
-		bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
-		bpy.ops.object.shade_smooth()
-		bpy.context.object.name = 'Arrow_stem'
+		return {"origin": [float(x) for x in self.origin],
+				"base": [[float(x) for x in u] for u in self.base],
+				"rotation": None if self.rotation is None else list(self.rotation.quaternion),
+				"colors": [c.name for c in self.colors],
+				"defaultcolor": self.defaultcolor,
+				"frame": self.frame,
+				"frame_end": bpy.context.scene.frame_end}
 	#
 	#
 	#
-	def base_cone(self):
+	def restore_state(self,state):
 		"""
-		Draws a base cone with radius1=1.5, radius2=0, depth=2
+		Sets origin, base, rotation, colors, default color and frames from a dictionary
+		returned by drawing_state
+		Parameters:
+		   state: dictionary
 		"""
-		bpy.ops.mesh.primitive_cone_add(radius1=1.5, radius2=0, depth=2, enter_editmode=False, location=(0, 0, 0))
-		bpy.ops.transform.translate(value=(0, 0, 1), orient_type='GLOBAL',orient_matrix_type='GLOBAL',
-			constraint_axis=(False, False, True), mirror=True, use_proportional_edit=False,
-			proportional_edit_falloff='SMOOTH', proportional_size=1, use_proportional_connected=False, use_proportional_projected=False)
-		bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
-		bpy.ops.object.shade_smooth()
-		bpy.context.object.name = 'Arrow_cone'
+		self.origin = Vector(state["origin"])
+		self.base = state["base"]
+		if state["rotation"] is None:
+			self.rotation = None
+		else:
+			self.rotation = Rotation(quaternion=Quaternion(state["rotation"]))
+		self.colors = Colors.colors(state["colors"])
+		self.defaultcolor = state["defaultcolor"]
+		self.frame = state["frame"]
+		bpy.context.scene.frame_end = state["frame_end"]
 	#
 	#
 	#
-	def base_disk(self):
+	def created_datablocks(self,before):
 		"""
-		Draws a base cone with radius1=1.5, radius2=0, depth=2
+		Returns the list of pairs (kind,datablock) of the datablocks that didn't exist when 'before'
+		was computed
+		Parameters:
+		   before: dictionary returned by existing_datablocks
 		"""
-		bpy.ops.mesh.primitive_circle_add(vertices=32,fill_type='NGON',enter_editmode=False,align='WORLD',location=(0.0, 0.0, 0.0))
-		bpy.ops.object.origin_set(type='ORIGIN_CURSOR', center='MEDIAN')
-		bpy.ops.object.shade_smooth()
-		bpy.context.object.name = 'Base_disk'
+		created = []
+		for kind in DATABLOCKS:
+			collection = getattr(bpy.data,kind)
+			if isinstance(before[kind],set):
+				created.extend((kind,d) for d in collection if d.as_pointer() not in before[kind])
+			else:
+				created.extend((kind,collection[int(i)]) for i in np.nonzero(session_uids(collection) > before[kind])[0])
+		return created
 	#
 	#
 	#
-	def delete_base_cilinder(self):
+	def existing_datablocks(self):
 		"""
-		Removes the base cilinder
+		Returns a dictionary with the largest session_uid of the existing datablocks of every kind in
+		DATABLOCKS. The identifiers are read in one foreach_get, so the cost of a call doesn't grow with
+		the number of datablocks of the file. In versions of Blender without session_uid, the values are
+		the sets of pointers of the datablocks
 		"""
-		bpy.ops.object.select_all(action='DESELECT')
-		bpy.data.objects['Arrow_stem'].select_set(True)
-		bpy.ops.object.delete()
+		try:
+			return {kind: int(session_uids(getattr(bpy.data,kind)).max(initial=0)) for kind in DATABLOCKS}
+		except (AttributeError,TypeError,RuntimeError):
+			return {kind: set(d.as_pointer() for d in getattr(bpy.data,kind)) for kind in DATABLOCKS}
 	#
 	#
 	#
-	def delete_base_cone(self):
+	def translate_created(self,before,vector):
 		"""
-		Removes the base cone
+		Translates the objects without parent created after computing 'before'
+		Parameters:
+		   before: dictionary returned by existing_datablocks
+
+		   vector: vector of the translation
 		"""
-		bpy.ops.object.select_all(action='DESELECT')
-		bpy.data.objects['Arrow_cone'].select_set(True)
-		bpy.ops.object.delete()
+		vector = Vector(vector)
+		for kind, obj in self.created_datablocks(before):
+			if kind == "objects" and obj.parent is None:
+				obj.location += vector
 	#
 	#
 	#
-	def delete_base_disk(self):
+	def remove_datablocks(self,data):
 		"""
-		Removes the base disk
+		Removes the objects and collections in a list and the rest of datablocks of the list that
+		are not used anymore
+		Parameters:
+		   data: list of pairs [kind,name] with kind in DATABLOCKS
 		"""
-		bpy.ops.object.select_all(action='DESELECT')
-		bpy.data.objects['Base_disk'].select_set(True)
-		bpy.ops.object.delete()
+		objects = [getattr(bpy.data,kind).get(name) for kind, name in data if kind in ("objects","collections")]
+		bpy.data.batch_remove([obj for obj in objects if obj is not None])
+		others = [getattr(bpy.data,kind).get(name) for kind, name in data if kind not in ("objects","collections")]
+		bpy.data.batch_remove([d for d in others if d is not None and d.users == 0])
 	#
 	#
 	#
-	def set_colors(self,names=None):
+	def tracked_call(self,method,signature,args,kwargs):
 		"""
-		Set self.colors to the list of colors with names 'names'
+		Calls a drawing method. The datablocks created by the call are tagged and its objects are added
+		to self.registry. If the call has the parameter collection, or self.constructs is set, the objects
+		are moved to a new child collection of the scene collection. In incremental mode, if the same
+		call was made in the previous execution with the same parameters and state and its objects still
+		exist, the method is not called, the state after the call is restored and the value returned by
+		the method is returned again.
+		Calls that receive objects as parameters, as the animations, are always made. The objects created
+		by drawing methods called inside other drawing methods are tagged with the kind and color of the
+		innermost method
 		Parameters:
-		   names: list of name colors
+		   method: method of LinearAlgebra
+
+		   signature: signature of the method
+
+		   args, kwargs: parameters of the call. The parameter collection can be True, to use the
+		   parameter name of the call as name of the collection, a name, False or None, to use
+		   the value given by set_collections
 		"""
-		if names is None:
-			self.colors = Colors.colors(["Red","GreenDarkHard","Blue"])
-		else:
-			self.colors = Colors.colors(names)
+		collection = kwargs.pop("collection",None)
+		if collection is None:
+			collection = self.constructs
+		if self.depth > 0:
+			before = self.existing_datablocks()
+			self.depth += 1
+			try:
+				return method(self,*args,**kwargs)
+			finally:
+				self.depth -= 1
+				bound = signature.bind(self,*args,**kwargs)
+				bound.apply_defaults()
+				color = bound.arguments.get("color")
+				nested = {"kind": method.__name__.replace("draw_","",1),"color": color if isinstance(color,str) else None}
+				for kind, d in self.created_datablocks(before):
+					if kind == "objects":
+						self.nested.setdefault(d.as_pointer(),nested)
+		self.nested = {}
+		bound = signature.bind(self,*args,**kwargs)
+		bound.apply_defaults()
+		parameters = dict(bound.arguments)
+		del parameters["self"]
+		if collection is True:
+			collection = parameters.get("name",method.__name__)
+		elif not collection:
+			collection = None
+		parameters["collection"] = collection
+		self.calls += 1
+		color = parameters.get("color")
+		tags = {"kind": method.__name__.replace("draw_","",1),
+				"color": color if isinstance(color,str) else None,
+				"group": self.group,
+				"call": self.calls,
+				"collection": None}
+		if self.incremental:
+			slot = "%s|%s" % (method.__name__,parameters.get("name",""))
+			n = self.occurrences.get(slot,0)
+			self.occurrences[slot] = n + 1
+			slot = "%s|%d" % (slot,n)
+			self.visited.add(slot)
+			reusable = not contains_objects(list(parameters.values()))
+			digest = hashlib.sha1(method.__name__.encode())
+			try:
+				fingerprint(parameters,digest)
+				fingerprint(self.drawing_state(),digest)
+				key = digest.hexdigest()
+			except TypeError:
+				key = None
+				reusable = False
+			record = self.records.get(slot)
+			if record is not None:
+				if reusable and record.get("key") == key and record.get("reusable") and all(name in bpy.data.objects for name in record["objects"]):
+					try:
+						result = decode_result(record["result"])
+					except KeyError:
+						#
+						# An object of the result was renamed or removed. The call is made again
+						#
+						pass
+					else:
+						tags["collection"] = record.get("collection")
+						kinds = record.get("kinds",{})
+						for name in record["objects"]:
+							self.registry.add(bpy.data.objects[name],**dict(tags,**kinds.get(name,{})))
+						self.restore_state(record["state"])
+						return result
+				self.remove_datablocks(record.get("data",[]))
+				del self.records[slot]
+		before = self.existing_datablocks()
+		self.depth += 1
+		try:
+			result = method(self,*args,**kwargs)
+		finally:
+			self.depth -= 1
+			created = self.created_datablocks(before)
+			objects = [d for kind, d in created if kind == "objects"]
+			if collection is not None and len(objects) > 0:
+				coll = self.construct_collection(collection,objects)
+				created.append(("collections",coll))
+				tags["collection"] = coll.name
+			data = []
+			kinds = {}
+			for kind, d in created:
+				d["LinearAlgebra"] = True
+				data.append([kind,d.name])
+				if kind == "objects":
+					nested = self.nested.get(d.as_pointer())
+					if nested is not None:
+						kinds[d.name] = nested
+					self.registry.add(d,**dict(tags,**(nested or {})))
+			self.nested = {}
+		if self.incremental:
+			try:
+				stored = encode_result(result)
+			except TypeError:
+				stored = None
+				reusable = False
+			self.records[slot] = {"key": key,"objects": [obj.name for obj in objects],"collection": tags["collection"],"data": data,"result": stored,"reusable": reusable,"state": self.drawing_state(),"kinds": kinds}
+		return result
 	#
 	#
 	#
-	def reset_colors(self):
+	def set_collections(self,collections=True):
 		"""
-		Set self.colors to default colors
+		Sets the default value of the parameter collection of the drawing methods. Every drawing method
+		accepts the keyword only parameter collection, that overrides this value for one call, for instance
+		draw_vector(vector=[1,2,3],collection="Vectors")
+		Parameters:
+		   collections: if True, the objects of every call are stored in a collection with the parameter name
+		   of the call as name. If it's a string, it's used as name of the collection of every call. If False,
+		   the objects are linked to the scene collection
 		"""
-		self.colors = Colors.colors(["Red","GreenDarkHard","Blue"])
+		self.constructs = collections
 	#
 	#
 	#
-	def set_default_color(self,name):
+	def construct_collection(self,name,objects):
 		"""
-		Set self.defaultcolor to the color with name 'name'
+		Creates a child collection of the scene collection and moves a list of objects to it.
+		The objects that are not linked to any collection are not moved
 		Parameters:
-		   name: name of a color
+		   name: name of the collection
+
+		   objects: list of objects
 		"""
-		self.defaultcolor = name
+		coll = tagged(bpy.data.collections.new(name))
+		bpy.context.scene.collection.children.link(coll)
+		for obj in objects:
+			if len(obj.users_collection) == 0:
+				continue
+			for c in obj.users_collection:
+				c.objects.unlink(obj)
+			coll.objects.link(obj)
+		return coll
 	#
 	#
 	#
-	def reset_frames(self):
+	def layer_collection(self,collection,layer=None):
 		"""
-		Set self.frame to 0
+		Returns the layer collection of a collection in the view layer
 		Parameters:
-		   name: name of a color
+		   collection: the collection
+
+		   layer: layer collection where to search. If None, the one of the view layer is used
 		"""
-		self.frame = 0
+		if layer is None:
+			layer = bpy.context.view_layer.layer_collection
+		if layer.collection == collection:
+			return layer
+		for child in layer.children:
+			found = self.layer_collection(collection,child)
+			if found is not None:
+				return found
+		return None
 	#
 	#
 	#
-	def reset(self):
+	def hide_collection(self,collection,hide=True):
 		"""
-		Resets origin, base, rotation, frames and colors
+		Hides or shows in the viewport and in the render all the objects of a collection
+		Parameters:
+		   collection: the collection or its name
+
+		   hide: if True, the objects are hidden, else they are shown
 		"""
-		self.reset_origin()
-		self.reset_base()
-		self.reset_rotation()
-		self.reset_frames()
-		self.reset_colors()
+		if isinstance(collection,str):
+			collection = bpy.data.collections.get(collection)
+		if collection is None:
+			return
+		layer = self.layer_collection(collection)
+		if layer is not None:
+			layer.hide_viewport = hide
+		collection.hide_render = hide
 	#
 	#
 	#
-	def set_rotation(self,angle=None,vector=None,quaternion=None):
+	def exclude_collection(self,collection,exclude=True):
 		"""
-		Sets self.rotation to the rotation defined by an angle and an axis or
-		by a quaternion.
+		Excludes a collection from the view layer, so its objects are not evaluated by the depsgraph
 		Parameters:
-		   angle: angle of rotation in degrees
-
-		   vector: axis of rotation
-
-		   quaternion: quaternion that defines a rotation
+		   collection: the collection or its name
 
-		The angle and vector takes precedence over the quaternion
+		   exclude: if True, the collection is excluded, else it is included again
 		"""
-		if angle is not None:
-			self.rotation = Rotation(angle,vector)
-		elif quaternion is not None:
-			self.rotation = Rotation(quaternion=quaternion)
-		else:
-			self.rotation = Rotation(0,[1,0,0])
+		if isinstance(collection,str):
+			collection = bpy.data.collections.get(collection)
+		if collection is None:
+			return
+		layer = self.layer_collection(collection)
+		if layer is not None:
+			layer.exclude = exclude
 	#
 	#
 	#
-	def reset_rotation(self):
+	def remove_collection(self,collection):
 		"""
-		Sets the rotation to identity, i.e., rotation of 0 degrees around the
-		vector (1,0,0)
+		Removes a collection and all its objects
+		Parameters:
+		   collection: the collection or its name
 		"""
-		self.set_rotation()
+		if isinstance(collection,str):
+			collection = bpy.data.collections.get(collection)
+		if collection is None:
+			return
+		bpy.data.batch_remove(list(collection.all_objects) + [collection])
 	#
 	#
 	#
-	def set_origin(self,vector=[0,0,0]):
+	def set_group(self,name=None):
 		"""
-		Sets the origin of the reference coordinates used to display objects.
+		Sets the group tag of the objects drawn from now on
 		Parameters:
-		   vector: origin's position
+		   name: name of the group
 		"""
-		if isinstance(vector,Vector):
-			v1 = vector.copy()
-		else:
-			v1 = Vector(vector)
-		self.origin = v1
+		self.group = name
 	#
 	#
 	#
-	def reset_origin(self):
+	def find(self,**tags):
 		"""
-		Sets the origin to the point (0,0,0)
+		Returns the list of objects drawn with the given values of the tags kind, color, group and call.
+		For instance, find(kind="base_axis") returns all the axes
+		Parameters:
+		   tags: values of the tags
 		"""
-		self.origin = Vector([0,0,0])
+		return self.registry.find(**tags)
 	#
 	#
 	#
-	def reset_base(self):
+	def hide(self,hide=True,**tags):
 		"""
-		Sets self.base to the canonical basis
+		Hides or shows the objects drawn with the given values of the tags
+		Parameters:
+		   hide: if True, the objects are hidden, else they are shown
+
+		   tags: values of the tags
 		"""
-		self.base = [[1,0,0],[0,1,0],[0,0,1]]
+		self.registry.hide(hide,**tags)
 	#
 	#
 	#
-	def set_base(self,base=[[1,0,0],[0,1,0],[0,0,1]],orthonormal=False):
+	def delete(self,**tags):
 		"""
-		Sets the self.base, i.e., the basis of the reference coordinates used to display
-		objects
+		Removes the objects drawn with the given values of the tags
 		Parameters:
-		   base: list of three vectors
-
-		   orthonormal: if True, the Gram-Schmidt method is applied and the vectors
-		   are normalized.
+		   tags: values of the tags
 		"""
-		if orthonormal:
-			u1 = base[0]
-			u2 = base[1]
-			if isinstance(u1,Vector):
-				v1 = u1
-			else:
-				v1 = Vector(u1)
-			if isinstance(u2,Vector):
-				v2 = u2
-			else:
-				v2 = Vector(u2)
-			v2 = v2 - v2.project(v1)
-			v1.normalize()
-			v2.normalize()
-			v3 = v1.cross(v2)
-			self.base=[v1,v2,v3]
-		else:
-			self.base = base
+		self.registry.delete(**tags)
 	#
 	#
 	#
-	def base_is_canonica(self):
+	def recolor(self,color="Black",opacity=1.0,**tags):
 		"""
-		Returns True if self.base is the canonical basis
+		Changes the color of the objects drawn with the given values of the tags
+		Parameters:
+		   color: name of the new color
+
+		   opacity: opacity of the material
+
+		   tags: values of the tags
 		"""
-		return Matrix(self.base).is_identity
+		c = Colors.color(color)
+		for obj in self.registry.find(**tags):
+			self.add_material(obj,c.name,c.r,c.g,c.b,opacity)
 	#
 	#
 	#
 	def add_material(self,obj,material_name,r,g,b,opacity=1.0):
 		"""
-		Adds a material and color to an object
+		Adds a material and color to an object. If the data of the object is shared with other objects,
+		as the axes stored in self.axes, the materials are linked to the object, so that the other
+		objects keep their colors
 		Parameters:
 		   obj: object
 
@@ -1089,9 +3538,15 @@ class LinearAlgebra():
 
 		   opacity: the opacity
 		"""
+		data = obj.data
+		if data is not None and data.users > 1:
+			for slot, mat in zip(obj.material_slots,data.materials):
+				if slot.link != 'OBJECT':
+					slot.link = 'OBJECT'
+					slot.material = mat
 		material = bpy.data.materials.get(material_name)
 		if material is None:
-			material = bpy.data.materials.new(material_name)
+			material = tagged(bpy.data.materials.new(material_name))
 		material.use_nodes = True
 		try:
 			principled_bsdf = material.node_tree.nodes['Principled BSDF']
@@ -1122,6 +3577,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def add_ligth(self,location=[0,0,100],energy=3,direction=[0,0,-1]):
 		"""
 		Adds a ligth to the scene
@@ -1132,15 +3588,14 @@ class LinearAlgebra():
 
 		   direction: direction of the light
 		"""
-		l = bpy.data.lights.new(name="Light", type='SUN')
+		l = tagged(bpy.data.lights.new(name="Light", type='SUN'))
 		l.energy = energy
 		l.specular_factor = 4
 		obj = self.objects.new(name="Light", object_data=l)
 		obj.rotation_mode = 'QUATERNION'
 		obj.location = location
 		n = Vector(direction)
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		n = mat @ n
 		z = Vector([0,0,-1])
 		quaternion = z.rotation_difference(n)
@@ -1149,6 +3604,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def add_ligths(self,energy=1):
 		"""
 		Adds diferent lights to the scene
@@ -1178,17 +3634,12 @@ class LinearAlgebra():
 			u = vector
 		else:
 			u = Vector(vector)
-		if self.rotation is not None:
-			mat = self.rotation.quaternion.to_matrix()
-			mat.invert()
-			u = mat @ u
-		mat = Matrix(self.base)
 		if base is not None:
-			mat = Matrix(base)
-		mat.transpose()
-		mat.invert()
-		u = mat @ u
-		return u
+			mat = Matrix(base).transposed()
+			if self.rotation is not None:
+				mat = self.rotation.quaternion.to_matrix() @ mat
+			return mat.inverted() @ u
+		return self.reference_matrix(inverse=True).to_3x3() @ u
 	#
 	#
 	#
@@ -1205,13 +3656,7 @@ class LinearAlgebra():
 			u = vector
 		else:
 			u = Vector(vector)
-		if self.rotation is not None:
-			mat = self.rotation.quaternion.to_matrix()
-			u = mat @ u
-		mat = Matrix(self.base)
-		mat.transpose()
-		u = mat @ u
-		return u
+		return self.reference_matrix().to_3x3() @ u
 	#
 	#
 	#
@@ -1228,15 +3673,7 @@ class LinearAlgebra():
 			u = point
 		else:
 			u = Vector(point)
-		if self.rotation is not None:
-			mat = self.rotation.quaternion.to_matrix()
-			mat.invert()
-			u = mat @ u
-		mat = Matrix(self.base)
-		mat.transpose()
-		mat.invert()
-		u = mat @ (u - Vector(self.origin))
-		return u
+		return self.reference_matrix(inverse=True) @ u
 	#
 	#
 	#
@@ -1253,13 +3690,66 @@ class LinearAlgebra():
 			u = point
 		else:
 			u = Vector(point)
-		if self.rotation is not None:
-			mat = self.rotation.quaternion.to_matrix()
-			u = mat @ u
-		mat = Matrix(self.base)
-		mat.transpose()
-		u = Vector(self.origin) + mat @ u
-		return u
+		return self.reference_matrix() @ u
+	#
+	#
+	#
+	def components_in_base_array(self,vectors,base=None,out=None):
+		"""
+		Returns an array with the components of an array of vectors in the basis determined by
+		self.rotation and the basis self.base
+		Parameters:
+		   vectors: array of shape (n,3) with the components of the vectors in the canonical basis
+
+		   base: A base of V3. If None, we use self.base
+
+		   out: if not None, array of shape (n,3) where the result is written
+		"""
+		if base is not None:
+			mat = Matrix(base).transposed()
+			if self.rotation is not None:
+				mat = self.rotation.quaternion.to_matrix() @ mat
+			return transform_array(mat.inverted(),vectors,out=out)
+		return transform_array(self.reference_matrix(inverse=True),vectors,out=out,affine=False)
+	#
+	#
+	#
+	def components_en_canonica_array(self,vectors,out=None):
+		"""
+		Returns an array with the components in the canonical basis of an array of vectors
+		whose components are given in the basis determined by self.rotation and the basis self.base
+		Parameters:
+		   vectors: array of shape (n,3) with the components of the vectors in the base self.rotation + self.base
+
+		   out: if not None, array of shape (n,3) where the result is written
+		"""
+		return transform_array(self.reference_matrix(),vectors,out=out,affine=False)
+	#
+	#
+	#
+	def coordinates_en_referencia_array(self,points,out=None):
+		"""
+		Returns an array with the coordinates of an array of points in the reference determined by
+		self.origin, self.rotation and the basis self.base
+		Parameters:
+		   points: array of shape (n,3) with the coordinates of the points in the canonical reference
+
+		   out: if not None, array of shape (n,3) where the result is written
+		"""
+		return transform_array(self.reference_matrix(inverse=True),points,out=out)
+	#
+	#
+	#
+	def coordinates_en_canonica_array(self,points,out=None):
+		"""
+		Returns an array with the coordinates in the canonical reference of an array of points whose
+		coordinates are given in the reference determined by self.origin, self.rotation and the basis self.base
+		Parameters:
+		   points: array of shape (n,3) with the coordinates of the points in the reference {self.origin;self.base}
+
+		   out: if not None, array of shape (n,3) where the result is written
+		"""
+		return transform_array(self.reference_matrix(),points,out=out)
 	#
 	#
 	#
@@ -1311,6 +3801,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_base_axis(self,scale=0.05,head_height=0.15,axis=0,name="Axis",positive=True,zaxis=True):
 		"""
 		Draws a reference axis given by self.origin, self.rotation and the basis self.base
@@ -1326,11 +3817,32 @@ class LinearAlgebra():
 		   positive: if True, draw the positive part of the axis
 
 		   zaxis: if True, draw the z axis
+
+		The mesh of the axis is stored in self.axes. If the same axis is requested again, even with
+		a different origin or rotation, the new object is a linked duplicate of the stored one
 		"""
-		self.base_cilinder()
-		self.base_cone()
-		o = Vector([0,0,0])
 		op = Vector(self.origin)
+		placement = Matrix.Translation(op)
+		if self.rotation is not None:
+			placement = placement @ self.rotation.quaternion.to_matrix().to_4x4()
+		key = (scale,head_height,axis,positive,zaxis,
+			None if self.colors is None else tuple(c.name for c in self.colors),
+			tuple(tuple(float(x) for x in u) for u in self.base))
+		if key in self.axes and not self.linked:
+			mesh, local = self.axes[key]
+			try:
+				mesh.name
+			except ReferenceError:
+				del self.axes[key]
+			else:
+				obj = bpy.data.objects.new(name,mesh)
+				self.scene.collection.objects.link(obj)
+				obj.rotation_mode = 'QUATERNION'
+				obj.matrix_world = placement @ local
+				return obj
+		stem = None if self.linked else self.base_cilinder()
+		cone = None if self.linked else self.base_cone()
+		o = Vector([0,0,0])
 		color = 0
 
 		if axis != 0 and axis < 8:
@@ -1340,15 +3852,14 @@ class LinearAlgebra():
 		if not zaxis:
 			base = self.base[0:2]
 
+		axes = []
 		for vec in base:
 			#
 			# Draw the stem
 			#
 			v = Vector(vec)
-			t = bpy.data.objects.get("Arrow_stem")
-			obj = t.copy()
+			obj = self.primitive_copy(stem,"stem")
 			obj.name = "Axis%d" % (color + 1)
-			obj.data = obj.data.copy()
 			obj.location = o
 			obj.scale = (scale,scale,(v - o).length - 2 * head_height)
 			obj.rotation_mode = 'QUATERNION'
@@ -1363,10 +3874,8 @@ class LinearAlgebra():
 			#
 			# Draw the arrow
 			#
-			t = bpy.data.objects.get("Arrow_cone")
-			obj2 = t.copy()
+			obj2 = self.primitive_copy(cone,"cone")
 			obj2.name = "Arrow"
-			obj2.data = obj2.data.copy()
 			obj2.location =  v - 2 * head_height * v / v.length
 			obj2.scale = (scale + 0.05,scale + 0.05,head_height)
 			obj2.rotation_mode = 'QUATERNION'
@@ -1385,10 +3894,8 @@ class LinearAlgebra():
 			obj3 = None
 			if axis != 0:
 				v = axis * v/v.length
-				t = bpy.data.objects.get("Arrow_stem")
-				obj3 = t.copy()
+				obj3 = self.primitive_copy(stem,"stem")
 				obj3.name = "Line"
-				obj3.data = obj3.data.copy()
 				obj3.location = op - v/v.length
 				obj3.scale = (scale / 2,scale / 2,(2 * v).length)
 				obj3.rotation_mode = 'QUATERNION'
@@ -1408,36 +3915,43 @@ class LinearAlgebra():
 			#
 			# Joint the three objects
 			#
-			bpy.ops.object.select_all(action='DESELECT')
-			bpy.context.view_layer.objects.active = obj
-			obj.select_set(True)
-			obj2.select_set(True)
-			if obj3 is not None:
-				obj3.select_set(True)
-			bpy.ops.object.join()
+			if self.linked:
+				self.parent_parts(obj,[obj2,obj3])
+			else:
+				bpy.ops.object.select_all(action='DESELECT')
+				bpy.context.view_layer.objects.active = obj
+				obj.select_set(True)
+				obj2.select_set(True)
+				if obj3 is not None:
+					obj3.select_set(True)
+				bpy.ops.object.join()
+			axes.append(obj)
 			color += 1
 		#
 		# Join all the axis
 		#
-		t1 = bpy.data.objects.get("Axis1")
+		t1 = axes[0]
 		t1.name = name
+		if self.linked:
+			self.parent_parts(t1,axes[1:])
+			return t1
 		bpy.ops.object.select_all(action='DESELECT')
 		bpy.context.view_layer.objects.active = t1
-		t1.select_set(True)
-		t2 = bpy.data.objects.get("Axis2")
-		t2.select_set(True)
-		if zaxis:
-			t3 = bpy.data.objects.get("Axis3")
-			t3.select_set(True)
+		for t in axes:
+			t.select_set(True)
 		bpy.ops.object.join()
-		self.delete_base_cilinder()
-		self.delete_base_cone()
+		if not self.linked:
+			self.delete_base_cilinder(stem)
+			self.delete_base_cone(cone)
 		bpy.ops.object.shade_smooth()
 		bpy.context.view_layer.objects.active = None
+		bpy.context.view_layer.update()
+		self.axes[key] = (t1.data,placement.inverted() @ t1.matrix_world)
 		return t1
 	#
 	#
 	#
+	@incremental
 	def draw_vector(self,origin=Vector([0,0,0]),vector=None,canonica=False,color="Black",scale=0.05,arrow=True,head_height=None,axis=0,name="Vector",positive=True):
 		"""
 		Draw the vector with components 'vector' trough 'origin'
@@ -1477,16 +3991,15 @@ class LinearAlgebra():
 			orig = Vector(origin)
 		if vec.length == 0:
 			return None
-		self.base_cilinder()
-		self.base_cone()
+		stem = None if self.linked else self.base_cilinder()
+		cone = None if self.linked else self.base_cone()
 		o = Vector([0,0,0])
 		op = Vector(self.origin + orig)
 		if color is not None:
 			color = Colors.color(color)
 		v = vec
 		if not canonica:
-			mat = Matrix(self.base)
-			mat.transpose()
+			mat = self.base_matrix()
 			v = mat @ vec
 
 		lon =  (v - o).length
@@ -1498,10 +4011,8 @@ class LinearAlgebra():
 			head_height = 0.25
 
 		if arrow:
-			t = bpy.data.objects.get("Arrow_stem")
-			obj = t.copy()
+			obj = self.primitive_copy(stem,"stem")
 			obj.name = name
-			obj.data = obj.data.copy()
 			obj.location = o
 			obj.scale = (scale,scale,lon - 2 * head_height)
 			obj.rotation_mode = 'QUATERNION'
@@ -1513,9 +4024,7 @@ class LinearAlgebra():
 			obj.location = op
 			self.scene.collection.objects.link(obj)
 
-			t = bpy.data.objects.get("Arrow_cone")
-			obj2 = t.copy()
-			obj2.data = obj2.data.copy()
+			obj2 = self.primitive_copy(cone,"cone")
 			obj2.name = "Arrow"
 			obj2.location =  v - 2 * head_height * v / v.length
 			obj2.scale = (1.5*scale,1.5*scale,head_height)
@@ -1532,13 +4041,11 @@ class LinearAlgebra():
 		obj3 = None
 		if axis != 0:
 			v = axis * v / v.length
-			t = bpy.data.objects.get("Arrow_stem")
-			obj3 = t.copy()
+			obj3 = self.primitive_copy(stem,"stem")
 			if not arrow:
 				obj3.name = name
 			else:
 				obj3.name = "Generated"
-			obj3.data = obj3.data.copy()
 			obj3.scale = (scale / 2,scale / 2,(2 * v).length)
 			obj3.rotation_mode = 'QUATERNION'
 			obj3.rotation_quaternion = v.to_track_quat('Z','Y')
@@ -1552,22 +4059,27 @@ class LinearAlgebra():
 				obj3.location = op - v
 			self.scene.collection.objects.link(obj3)
 
-		bpy.ops.object.select_all(action='DESELECT')
-		if arrow:
-			bpy.context.view_layer.objects.active = obj
-		elif axis != 0:
-			bpy.context.view_layer.objects.active = obj3
-		if arrow:
-			obj.select_set(True)
-			obj2.select_set(True)
-		if obj3 is not None:
-			obj3.select_set(True)
-		if arrow:
-			bpy.ops.object.join()
-		bpy.ops.object.shade_smooth()
-		bpy.ops.object.select_all(action='DESELECT')
-		self.delete_base_cilinder()
-		self.delete_base_cone()
+		if self.linked:
+			if arrow:
+				self.parent_parts(obj,[obj2,obj3])
+		else:
+			bpy.ops.object.select_all(action='DESELECT')
+			if arrow:
+				bpy.context.view_layer.objects.active = obj
+			elif axis != 0:
+				bpy.context.view_layer.objects.active = obj3
+			if arrow:
+				obj.select_set(True)
+				obj2.select_set(True)
+			if obj3 is not None:
+				obj3.select_set(True)
+			if arrow:
+				bpy.ops.object.join()
+			bpy.ops.object.shade_smooth()
+			bpy.ops.object.select_all(action='DESELECT')
+		if not self.linked:
+			self.delete_base_cilinder(stem)
+			self.delete_base_cone(cone)
 		bpy.context.view_layer.objects.active = None
 		if arrow:
 			return obj
@@ -1592,6 +4104,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_line(self,start=[1,1,1],end=[10,10,10],scale=0.05,name="Line",color="Black",segment=False):
 		"""
 		Draws a line from the point start to the point end. The reference given by self.origin,
@@ -1611,7 +4124,7 @@ class LinearAlgebra():
 		"""
 		if start is None or end is None:
 			return
-		self.base_cilinder()
+		stem = None if self.linked else self.base_cilinder()
 		o = Vector([0,0,0])
 		op = Vector(self.origin)
 		if isinstance(start,Vector):
@@ -1622,13 +4135,11 @@ class LinearAlgebra():
 			v = end
 		else:
 			v = Vector(end)
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		u = mat @ u
 		v = mat @ v
 		l = (v - u).length
-		t = bpy.data.objects.get("Arrow_stem")
-		obj = t.copy()
+		obj = self.primitive_copy(stem,"stem",copy_data=False)
 		obj.name = name
 		obj.location = u
 		obj.scale = (scale / 2,scale / 2,l)
@@ -1642,8 +4153,9 @@ class LinearAlgebra():
 			obj.location.rotate(self.rotation.quaternion)
 		obj.location = obj.location + op
 		self.scene.collection.objects.link(obj)
-		bpy.ops.object.shade_flat()
-		self.delete_base_cilinder()
+		if not self.linked:
+			bpy.ops.object.shade_flat()
+			self.delete_base_cilinder(stem)
 		bpy.ops.object.select_all(action='DESELECT')
 		bpy.context.view_layer.objects.active = None
 		if segment:
@@ -1654,6 +4166,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_components(self,vector=None,color="Cyan",name="Components",scale=0.0075):
 		"""
 		Draws the components of the the vector 'vector' in the reference given by self.origin,
@@ -1673,11 +4186,10 @@ class LinearAlgebra():
 			v = vector
 		else:
 			v = Vector(vector)
-		mat = Matrix(self.base)
-		mat.transpose()
 		list = [[0,0,0],[1,0,0],[1,1,0],[0,1,0],[0,0,1],[1,0,1],[1,1,1],[0,1,1]]
 		lines = [[0,1],[1,2],[2,3],[0,3],[0,4],[1,5],[2,6],[3,7],[4,5],[5,6],[6,7],[4,7]]
 		vecs = [self.product_components(v,Vector(x)) for x in list]
+		list = []
 		count = 0
 		for first, last in lines:
 			if count == 0:
@@ -1685,11 +4197,7 @@ class LinearAlgebra():
 			else:
 				this = f"Line{count}"
 			count += 1
-			self.draw_line(start=vecs[first],end=vecs[last],scale=scale,name=this,color=color)
-		t = bpy.data.objects.get(name)
-		list = [t]
-		for count in range(1,12):
-			obj = bpy.data.objects.get(f"Line{count}")
+			obj = self.draw_line(start=vecs[first],end=vecs[last],scale=scale,name=this,color=color)
 			if obj is not None:
 				list.append(obj)
 		t = self.join(list)
@@ -1698,6 +4206,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_vectors(self,vectors=[],canonica=False,color="Black",scale=0.05,head_height=0.2,name="Vectors",axis=0):
 		"""
 		Draws a list of vectors.
@@ -1716,6 +4225,7 @@ class LinearAlgebra():
 		"""
 		if len(vectors) == 0:
 			return
+		list = []
 		count = 0
 		for v in vectors:
 			if count == 0:
@@ -1724,17 +4234,14 @@ class LinearAlgebra():
 				this = f"Vector{count}"
 			count += 1
 			t = self.draw_vector(vector=v,canonica=canonica,color=color,scale=scale,head_height=head_height,axis=axis,name=this)
-		t = bpy.data.objects.get(name)
-		list = [t]
-		for count in range(1,len(vectors)+1):
-			obj = bpy.data.objects.get(f"Vector{count}")
-			if obj is not None:
-				list.append(obj)
+			if t is not None:
+				list.append(t)
 		t = self.join(list)
 		return t
 	#
 	#
 	#
+	@incremental
 	def draw_plane(self,normal=None,base=None,sizex=10,sizey=10,color="AzureBlueDark",name='Plane',opacity=1.0,thickness=0.01):
 		"""
 		Draws a plane with normal vector or base vectors. It passes through the point self.origin.
@@ -1759,9 +4266,9 @@ class LinearAlgebra():
 		if sizex == 0.0:
 			return
 		bpy.ops.mesh.primitive_plane_add(size=sizex,enter_editmode=True,location=(0, 0, 0))
-		bpy.context.object.name = name
+		obj = bpy.context.object
+		obj.name = name
 		bpy.ops.object.mode_set(mode='OBJECT')
-		obj = bpy.data.objects.get(name)
 		if sizey is not None and sizey != 0.0:
 			t = sizey / sizex
 			obj.scale = [1,t,1]
@@ -1813,7 +4320,7 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def simple_curve(self,f=None,tmin=0.0,tmax=1.0,steps=25,name="Simple curve",symmetry=None,draw=False):
+	def simple_curve(self,f=None,tmin=0.0,tmax=1.0,steps=25,name="Simple curve",symmetry=None,draw=False,tolerance=None):
 		"""
 		Return a curve defined by the parametrization f
 		Parameters:
@@ -1827,62 +4334,169 @@ class LinearAlgebra():
 
 		   name: name of the curve
 
-		   symmetry: None or a value in the list ('XY','XZ','YZ','X','Y','Z','O'). Symmetry of the curve
+		   symmetry: None, a value or a list of values in ('XY','XZ','YZ','X','Y','Z','O'). A reflected
+		             copy of the curve is added for every symmetry
 
 		   draw: if True, the curve is drawn
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if f is None:
 			return None
 
-		delta = (tmax - tmin)/steps
-		t = tmin
-		bm = bmesh.new()
-		verts = []
-		verts2 = []
+		points = self.sampled_curve(f,tmin,tmax,steps,tolerance)
+		verts = [points]
+		if isinstance(symmetry,str):
+			symmetry = [symmetry]
+		if isinstance(symmetry,list) or isinstance(symmetry,tuple):
+			for s in symmetry:
+				if s in SYMMETRIES:
+					verts.append(points * np.array(SYMMETRIES[s]))
+		n = len(points)
+		edges = np.stack([np.arange(n - 1),np.arange(1,n)],axis=-1)
+		edges = np.concatenate([edges + k * n for k in range(len(verts))])
+
+		me = tagged(bpy.data.meshes.new('placeholder_mesh'))
+		me.vertices.add(n * len(verts))
+		me.vertices.foreach_set("co",np.concatenate(verts).astype(np.float32).ravel())
+		me.edges.add(len(edges))
+		me.edges.foreach_set("vertices",edges.astype(np.int32).ravel())
+		me.update()
+		obj = bpy.data.objects.new(name,me)
 
-		for k in range(steps + 1):
-			p = f(t)
-			q = None
-			verts.append(bm.verts.new(p))
-			if symmetry == 'XY':
-				q = (p[0],p[1],-p[2])
-			elif symmetry == 'XZ':
-				q = (p[0],-p[1],p[2])
-			elif symmetry == 'YZ':
-				q = (-p[0],p[1],p[2])
-			elif symmetry == 'X':
-				q = (p[0],-p[1],-p[2])
-			elif symmetry == 'Y':
-				q = (-p[0],p[1],-p[2])
-			elif symmetry == 'Z':
-				q = (-p[0],-p[1],p[2])
-			elif symmetry == 'O':
-				q = (-p[0],-p[1],-p[2])
-
-			if q is not None:
-				verts2.append(bm.verts.new(q))
-			t += delta
-			if t > tmax:
-				t = tmax
+		if draw:
+			self.scene.collection.objects.link(obj)
+		bpy.context.view_layer.objects.active = None
+		return obj
+	#
+	#
+	#
+	def mirror_copies(self,obj,symmetry,name):
+		"""
+		Returns a list of copies of an object that share its data and are reflected by the symmetries
+		in a list. The copies are children of the object, so they follow its transformations
+		Parameters:
+		   obj: the object
+
+		   symmetry: list of values in ('XY','XZ','YZ','X','Y','Z','O')
+
+		   name: the name of every copy is name followed by its symmetry
+		"""
+		copies = []
+		for s in symmetry:
+			if s not in SYMMETRIES:
+				continue
+			copy = obj.copy()
+			copy.name = name + s
+			copy.animation_data_clear()
+			for collection in obj.users_collection:
+				collection.objects.link(copy)
+			copy.parent = obj
+			copy.matrix_parent_inverse = Matrix.Identity(4)
+			copy.matrix_basis = Matrix.Diagonal((*SYMMETRIES[s],1.0))
+			copy.select_set(False)
+			copies.append(copy)
+		return copies
+	#
+	#
+	#
+	def revolution_object(self,profiles,name,segments=128,axis='Z',caps=False):
+		"""
+		Returns a new object, not linked to any collection, with the mesh of the revolution surface
+		generated by a list of polylines
+		Parameters:
+		   profiles: list of arrays of shape (n,3) with the points of the polylines
+
+		   name: name of the object
+
+		   segments: number of angular steps of the revolution
+
+		   axis: axis of revolution. It must be 'X', 'Y' or 'Z'
+
+		   caps: if True, the ends of the polylines that are not on the axis are closed with a disk
+		"""
+		verts, loops, sizes = revolution_mesh_data(profiles,segments=segments,axis=axis,caps=caps)
+		return bpy.data.objects.new(name,mesh_from_arrays(name,verts,loops,sizes))
+	#
+	#
+	#
+	def sweep_object(self,profiles,name,segments=128,axis='Z'):
+		"""
+		Returns a new object, not linked to any collection, with the mesh of the revolution surface
+		generated by a list of polylines and a Geometry Nodes modifier 'Sweep' that removes the
+		vertices rotated more than its input 'Sweep'. Animating this input from 0 to 2*pi shows
+		the generation of the surface
+		Parameters:
+		   profiles: list of arrays of shape (n,3) with the points of the polylines
+
+		   name: name of the object
+
+		   segments: number of angular steps of the revolution
+
+		   axis: axis of revolution. It must be 'X', 'Y' or 'Z'
+		"""
+		verts, loops, sizes, thetas = revolution_mesh_data(profiles,segments=segments,axis=axis,angles=True)
+		mesh = mesh_from_arrays(name,verts,loops,sizes)
+		attribute = mesh.attributes.new("theta",'FLOAT','POINT')
+		attribute.data.foreach_set("value",thetas.astype(np.float32))
+		obj = bpy.data.objects.new(name,mesh)
+		tree = tagged(bpy.data.node_groups.new(name,'GeometryNodeTree'))
+		node_group_socket(tree,"Geometry",'INPUT','NodeSocketGeometry')
+		socket = node_group_socket(tree,"Sweep",'INPUT','NodeSocketFloat')
+		socket.default_value = 2 * math.pi
+		node_group_socket(tree,"Geometry",'OUTPUT','NodeSocketGeometry')
+		group_in = tree.nodes.new('NodeGroupInput')
+		group_out = tree.nodes.new('NodeGroupOutput')
+		attribute = tree.nodes.new('GeometryNodeInputNamedAttribute')
+		attribute.data_type = 'FLOAT'
+		attribute.inputs['Name'].default_value = "theta"
+		compare = tree.nodes.new('FunctionNodeCompare')
+		compare.data_type = 'FLOAT'
+		compare.operation = 'GREATER_THAN'
+		delete = tree.nodes.new('GeometryNodeDeleteGeometry')
+		delete.domain = 'POINT'
+		tree.links.new([o for o in attribute.outputs if o.enabled][0],compare.inputs[0])
+		tree.links.new(group_in.outputs['Sweep'],compare.inputs[1])
+		tree.links.new(group_in.outputs['Geometry'],delete.inputs['Geometry'])
+		tree.links.new(compare.outputs[0],delete.inputs['Selection'])
+		tree.links.new(delete.outputs['Geometry'],group_out.inputs[0])
+		modifier = obj.modifiers.new(name="Sweep",type='NODES')
+		modifier.node_group = tree
+		return obj
+	#
+	#
+	#
+	def spin_keyframes(self,obj,axis,start,end,angle=2*math.pi):
+		"""
+		Animates a rotation of an object around a coordinate axis with constant angular velocity
+		using two linear keyframes of its Euler rotation
+		Parameters:
+		   obj: the object
 
-		for i in range(len(verts) - 1):
-			bm.edges.new([verts[i], verts[i+1]])
-			if len(verts2) > 0:
-				bm.edges.new([verts2[i], verts2[i+1]])
+		   axis: axis of rotation. It must be 'X', 'Y' or 'Z'
 
-		me = bpy.data.meshes.new('placeholder_mesh')
-		obj = bpy.data.objects.new(name,me)
-		bm.to_mesh(me)
-		bm.free()
+		   start, end: first and last frame of the rotation
 
-		if draw:
-			self.scene.collection.objects.link(obj)
-		bpy.context.view_layer.objects.active = None
-		return obj
+		   angle: angle of rotation in radians
+		"""
+		k = "XYZ".index(axis)
+		order = ('YZX','ZXY','XYZ')[k]
+		if obj.rotation_mode == 'QUATERNION':
+			euler = obj.rotation_quaternion.to_euler(order)
+		else:
+			euler = obj.matrix_basis.to_euler(order)
+		obj.rotation_mode = order
+		obj.rotation_euler = euler
+		first = list(euler)
+		last = list(euler)
+		last[k] += angle
+		insert_keyframes(obj,"rotation_euler",[start,end],[first,last])
 	#
 	#
 	#
-	def draw_elliptic_paraboloid(self,a=0.5,xmin=0.0,xmax=3.0,steps=50,scale=[1,1,1],color="AzureBlueDark",name="EllipticParaboloid",opacity=1.0,thickness=0.05):
+	@incremental
+	def draw_elliptic_paraboloid(self,a=0.5,xmin=0.0,xmax=3.0,steps=50,scale=[1,1,1],color="AzureBlueDark",name="EllipticParaboloid",opacity=1.0,thickness=0.05,segments=128):
 		"""
 		Draws an elliptic paraboloid from the parabola z=a*t^2
 		Parameters:
@@ -1903,14 +4517,12 @@ class LinearAlgebra():
 		   opacity: opacity of the surface
 
 		   thickness: thickness of the surface
+
+		   segments: number of angular steps of the revolution
 		"""
-		obj = self.simple_curve(f=lambda t:(t,0,a*t**2),tmin=xmin,tmax=xmax,steps=steps,name=name)
-		modifier = obj.modifiers.new(name="Screw", type='SCREW')
-		modifier.angle = 2 * math.pi
-		modifier.steps = 128
-		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
-		modifier.levels = 4
-		modifier.subdivision_type = 'SIMPLE'
+		t = np.linspace(xmin,xmax,steps + 1)
+		profile = np.stack([t,np.zeros_like(t),a * t**2],axis=-1)
+		obj = self.revolution_object([profile],name,segments=segments)
 		if thickness > 0.0:
 			modifier = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
 			modifier.thickness = thickness
@@ -1936,7 +4548,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def draw_one_sheet_hyperboloid(self,a=2.0,b=2.0,xmin=math.sqrt(2),xmax=5.0,steps=256,scale=[1,1,1],color="AzureBlueDark",name="HyperboloidOneSheet",opacity=1.0,thickness=0.05):
+	@incremental
+	def draw_one_sheet_hyperboloid(self,a=2.0,b=2.0,xmin=math.sqrt(2),xmax=5.0,steps=256,scale=[1,1,1],color="AzureBlueDark",name="HyperboloidOneSheet",opacity=1.0,thickness=0.05,segments=128):
 		r"""
 		Draws a one sheet hyperboloid from the hyperbole z = \pm a*sqrt(x^2-b) in the XZ plane
 		Parameters:
@@ -1957,43 +4570,20 @@ class LinearAlgebra():
 		   opacity: opacity of the surface
 
 		   thickness: thickness of the surface
+
+		   segments: number of angular steps of the revolution
 		"""
 		if xmin < math.sqrt(b):
 			xmin = math.sqrt(b)
-		delta = (xmax - xmin) / steps
-		x = xmax
-		bm = bmesh.new()
-		verts = []
-
-		for k in range(steps + 1):
-			if x < math.sqrt(b):
-				z = 0.0
-			else:
-				z = - a * math.sqrt(x**2 - b)
-			verts.append(bm.verts.new((x,0,z)))
-			x -= delta
-		x = math.sqrt(b)
-		for k in range(steps):
-			x += delta
-			if x**2 < b:
-				z = 0.0
-			else:
-				z = a * math.sqrt(x**2 - b)
-			verts.append(bm.verts.new((x,0,z)))
-
-		for i in range(len(verts) - 1):
-			bm.edges.new([verts[i], verts[i+1]])
-
-		me = self.meshes.new('placeholder_mesh')
-		obj = self.objects.new(name,me)
-		bm.to_mesh(me)
-		bm.free()
-		modifier = obj.modifiers.new(name="Screw", type='SCREW')
-		modifier.angle = 2 * math.pi
-		modifier.steps = 128
-		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
-		modifier.levels = 4
-		modifier.subdivision_type = 'SIMPLE'
+		x = np.linspace(xmin,xmax,steps + 1)
+		z = a * np.sqrt(np.maximum(x**2 - b,0.0))
+		lower = np.stack([x[::-1],np.zeros_like(x),-z[::-1]],axis=-1)
+		upper = np.stack([x,np.zeros_like(x),z],axis=-1)
+		if z[0] == 0.0:
+			profiles = [np.concatenate([lower,upper[1:]])]
+		else:
+			profiles = [lower,upper]
+		obj = self.revolution_object(profiles,name,segments=segments)
 		if thickness > 0.0:
 			modifier = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
 			modifier.thickness = thickness
@@ -2018,7 +4608,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def draw_two_sheets_hyperboloid(self,a=2.0,b=1.0,xmin=0.0,xmax=5.0,steps=50,scale=[1,1,1],color="AzureBlueDark",name="TwoSheetHyperboloid",opacity=1.0,thickness=0.05):
+	@incremental
+	def draw_two_sheets_hyperboloid(self,a=2.0,b=1.0,xmin=0.0,xmax=5.0,steps=50,scale=[1,1,1],color="AzureBlueDark",name="TwoSheetHyperboloid",opacity=1.0,thickness=0.05,segments=128):
 		r"""
 		Draws a two sheet hyperboloid from the hyperbole z = \pm a * math.sqrt(x**2+b) in the XZ plane
 		Parameters:
@@ -2039,37 +4630,14 @@ class LinearAlgebra():
 		   opacity: opacity of the surface
 
 		   thickness: thickness of the surface
-		"""
-		delta = (xmax - xmin) / steps
-		x = xmax
-		bm = bmesh.new()
-		verts = []
-		count = 2 * steps + 2
-		sign = 1
-		for k in range(count):
-			if k == steps + 1:
-				sign = -1
-			z = sign * a * math.sqrt(x**2+b)
-			verts.append(bm.verts.new((x,0,z)))
-			if k == steps and xmin > 0:
-				x = xmin
-			else:
-				x = x - sign * delta
-			if k == 0 or k == steps + 1:
-				continue
-			bm.edges.new([verts[k-1], verts[k]])
-
-		me = self.meshes.new('placeholder_mesh')
-		obj = self.objects.new(name,me)
-		bm.to_mesh(me)
-		bm.free()
 
-		modifier = obj.modifiers.new(name="Screw", type='SCREW')
-		modifier.angle = 2 * math.pi
-		modifier.steps = 128
-		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
-		modifier.levels = 4
-		modifier.subdivision_type = 'SIMPLE'
+		   segments: number of angular steps of the revolution
+		"""
+		x = np.linspace(xmin,xmax,steps + 1)
+		z = a * np.sqrt(x**2 + b)
+		upper = np.stack([x[::-1],np.zeros_like(x),z[::-1]],axis=-1)
+		lower = np.stack([x,np.zeros_like(x),-z],axis=-1)
+		obj = self.revolution_object([upper,lower],name,segments=segments)
 		if thickness > 0.0:
 			modifier = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
 			modifier.thickness = thickness
@@ -2094,7 +4662,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def draw_cone(self,a=1.0,xmin=0.0,xmax=5.0,steps=50,scale=[1,1,1],half=False,color="AzureBlueDark",name="Cone",opacity=1.0,thickness=0.05):
+	@incremental
+	def draw_cone(self,a=1.0,xmin=0.0,xmax=5.0,steps=50,scale=[1,1,1],half=False,color="AzureBlueDark",name="Cone",opacity=1.0,thickness=0.05,segments=128):
 		"""
 		Draws a cone from the line z = a*x in the XZ plane
 		Parameters:
@@ -2117,38 +4686,19 @@ class LinearAlgebra():
 		   opacity: opacity of the surface
 
 		   thickness: thickness of the surface
+
+		   segments: number of angular steps of the revolution
 		"""
-		delta = (xmax - xmin) / steps
-		x = xmax
-		bm = bmesh.new()
-		verts = []
-		count = 2 * steps + 2
-		if xmin == 0.0:
-			count = 2 * steps + 1
+		x = np.linspace(xmax,xmin,steps + 1)
+		upper = np.stack([x,np.zeros_like(x),a * x],axis=-1)
+		lower = -upper[::-1]
 		if half:
-			count = steps + 1
-		for k in range(count):
-			z = a * x
-			verts.append(bm.verts.new((x,0,z)))
-			if k == steps and xmin > 0:
-				x = - xmin
-			else:
-				x -= delta
-			if k == 0 or (k == steps + 1 and xmin > 0.0):
-				continue
-			bm.edges.new([verts[k-1], verts[k]])
-
-		me = self.meshes.new('placeholder_mesh')
-		obj = self.objects.new(name,me)
-		bm.to_mesh(me)
-		bm.free()
-
-		modifier = obj.modifiers.new(name="Screw", type='SCREW')
-		modifier.angle = 2 * math.pi
-		modifier.steps = 128
-		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
-		modifier.levels = 4
-		modifier.subdivision_type = 'SIMPLE'
+			profiles = [upper]
+		elif xmin == 0.0:
+			profiles = [np.concatenate([upper,lower[1:]])]
+		else:
+			profiles = [upper,lower]
+		obj = self.revolution_object(profiles,name,segments=segments)
 		if thickness > 0.0:
 			modifier = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
 			modifier.thickness = thickness
@@ -2173,6 +4723,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_parabolic_cylinder(self,p=0.25,xmin=0.0,xmax=6.0,length=20,steps=50,scale=[1,1,1],color="AzureBlueDark",name="ParabolicCylinder",opacity=1.0,thickness=0.05):
 		"""
 		Draws a parabolic cylinder from the parabola z=p*x^2 in the XZ plane
@@ -2259,6 +4810,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_hyperbolic_cylinder(self,a=1.0,b=4.0,xmin=2.0,xmax=6.0,length=20,steps=50,scale=[1,1,1],color="AzureBlueDark",name="HyperbolicCylinder",opacity=1.0,thickness=0.05):
 		"""
 		Draws an hyperbolic cylinder from the hyperbole y = a * sqrt(x**2 - b) in the XY plane
@@ -2353,6 +4905,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_elliptic_cylinder(self,a=8.0,b=5.0,amin=0.0,amax=2*math.pi,length=20,steps=200,scale=[1,1,1],color="AzureBlueDark",name="EllipticCylinder",opacity=1.0,thickness=0.05):
 		"""
 		Draws an eliptic cylinder from the ellipse
@@ -2441,6 +4994,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_hyperbolic_paraboloid(self,a=0.2,b=0.4,xmax=10.0,ymax=10.0,steps=64,scale=[1,1,1],color="AzureBlueDark",name="HyperbolicParaboloid",opacity=1.0,thickness=0.05):
 		"""
 		Draws an hyperbolic paraboloid with equation z = a*x^2 - b*y^2
@@ -2470,6 +5024,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_ellipsoid(self,radius=5.0,scale=[1.2,1.8,0.8],color="AzureBlueDark",name="Ellipsoid",opacity=1.0,thickness=0.05):
 		"""
 		Draws en ellipsoid
@@ -2487,8 +5042,8 @@ class LinearAlgebra():
 		   thickness: thickness of the surface
 		"""
 		bpy.ops.mesh.primitive_uv_sphere_add(segments=128, ring_count=128, radius=radius, enter_editmode=False, location=(0, 0, 0))
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 
 		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
 		modifier.levels = 4
@@ -2518,6 +5073,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_plane_surface(self,origin=None,normal=None,base=None,sizex=10,sizey=10,vectors=False,scalelines=0.05,scalevector=0.03,
 						color="AzureBlueDark",linecolor="BlueDarkDull",vectorcolor="Black",name="Plane",opacity=1.0,thickness=0.01):
 		"""
@@ -2556,8 +5112,7 @@ class LinearAlgebra():
 			return
 		if normal is None and base is None:
 			return
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		if normal is not None:
 			if not isinstance(normal,Vector):
 			 	normal= Vector(normal)
@@ -2679,6 +5234,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_point(self,radius=0.1,location=(0,0,0),name="Point",color="Black",opacity=1.0):
 		"""
 		Draws a point (in the reference self.origin, self.base)
@@ -2694,13 +5250,12 @@ class LinearAlgebra():
 		   opacity: opacity of the point
 		"""
 		bpy.ops.mesh.primitive_uv_sphere_add(segments=8, ring_count=8, radius=radius, enter_editmode=False, location=location)
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 
 		if not isinstance(location,Vector):
 			location = Vector(location)
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		location = mat @ location
 
 		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
@@ -2720,6 +5275,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_cube(self,origin=None,scale=[1,1,1],scalelines=0.05,vectors=False,color="Blue",linecolor="Red",vectorcolor="Black",name='Parallelepiped',opacity=1.0,thickness=0.0):
 		"""
 		Draws a rectangular parallelepiped
@@ -2745,8 +5301,8 @@ class LinearAlgebra():
 		   thickness: thickness of the parallelepiped
 		"""
 		bpy.ops.mesh.primitive_cube_add(size=2,enter_editmode=False,align='WORLD',location=(0, 0, 0))
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 		o = Vector([0,0,0])
 		op = Vector(self.origin)
 		if origin is not None:
@@ -2797,6 +5353,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def ortoedre(self,centre=Vector([0,0,0]),costats=[6,10,8],scalelines=0.05,vectors=False,color="Blue",linecolor="Red",vectorcolor="Black",name='Ortoedre',opacity=1.0,thickness=0.0):
 		if not isinstance(centre,Vector):
 			centre = Vector(centre)
@@ -2804,6 +5361,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_parallelepiped(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],u3=[0,0,1],scalelines=0.025,color="AzureBlueDark",linecolor="OrangeObscureDull",name='Parallelepiped',opacity=1.0,thickness=0.0):
 		"""
 		Draws a parallelepiped
@@ -2836,15 +5394,14 @@ class LinearAlgebra():
 		if not isinstance(u3,Vector):
 			u3 = Vector(u3)
 
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		u1 = mat @ u1
 		u2 = mat @ u2
 		u3 = mat @ u3
 
 		bpy.ops.mesh.primitive_cube_add(size=2,enter_editmode=False,align='WORLD',location=(0, 0, 0))
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 
 		verts = obj.data.vertices
 		verts[0].co = op
@@ -2888,6 +5445,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_tetrahedron(self,origin=[0,0,0],u1=[2,0,0],u2=[2*math.cos(math.pi/3),2*math.sin(math.pi/3),0],u3=[(2+2*math.cos(math.pi/3))/3,2*math.sin(math.pi/3)/3,2],scalelines=0.025,color="AzureBlueDark",linecolor="OrangeObscureDull",name='Tetrahedron',opacity=1.0,thickness=0.0):
 		"""
 		Draws a tetrahedron
@@ -2920,15 +5478,14 @@ class LinearAlgebra():
 		if not isinstance(u3,Vector):
 			u3 = Vector(u3)
 
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		u1 = mat @ u1
 		u2 = mat @ u2
 		u3 = mat @ u3
 
 		bpy.ops.mesh.primitive_solid_add()
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 
 		verts = obj.data.vertices
 		verts[0].co = op + u3
@@ -2968,6 +5525,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_pyramid(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],u3=[0.5,0.5,1],scalelines=0.025,color="AzureBlueDark",linecolor="OrangeObscureDull",name='Pyramid',opacity=1.0,thickness=0.0):
 		"""
 		Draws a pyramid
@@ -3000,15 +5558,14 @@ class LinearAlgebra():
 		if not isinstance(u3,Vector):
 			u3 = Vector(u3)
 
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		u1 = mat @ u1
 		u2 = mat @ u2
 		u3 = mat @ u3
 
 		bpy.ops.mesh.primitive_cone_add(radius1=1, radius2=0, depth=2, enter_editmode=False, align='WORLD',vertices=4)
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 
 		verts = obj.data.vertices
 		verts[0].co = op
@@ -3049,6 +5606,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_parallelogram(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],scalelines=0.025,color="AzureBlueDark",linecolor="OrangeObscureDull",name='Parallelogram',opacity=1.0,thickness=0.0):
 		"""
 		Draws a parallelogram
@@ -3079,14 +5637,13 @@ class LinearAlgebra():
 		if not isinstance(u2,Vector):
 			u2 = Vector(u2)
 
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		u1 = mat @ u1
 		u2 = mat @ u2
 
 		bpy.ops.mesh.primitive_plane_add(size=2,enter_editmode=False,align='WORLD',location=(0, 0, 0))
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 
 		verts = obj.data.vertices
 		verts[0].co = op
@@ -3126,6 +5683,7 @@ class LinearAlgebra():
 	#
 	# Draw a polygon
 	#
+	@incremental
 	def draw_polygon(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],points=[[0,0],[1,0],[0,1]],scalelines=0.075,color="AzureBlueMedium",linecolor="AzureBlueDark",name='Polygon',opacity=1.0,thickness=0.0,vectors=None,scalevectors=0.01):
 		"""
 		Draws a polygon
@@ -3163,14 +5721,13 @@ class LinearAlgebra():
 			if not isinstance(points[i],Vector):
 				points[i] = Vector(points[i])
 
-		mat = Matrix(self.base)
-		mat.transpose()
+		mat = self.base_matrix()
 		u1 = mat @ u1
 		u2 = mat @ u2
 
 		bpy.ops.curve.simple(Simple_Type='Polygon',Simple_sides=len(points),align='WORLD',location=(0, 0, 0))
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
+		obj = bpy.context.object
+		obj.name = name
 		bpy.ops.object.mode_set(mode='OBJECT')
 
 		baricentre = Vector([0,0,0])
@@ -3229,6 +5786,7 @@ class LinearAlgebra():
 	#
 	# Draw a regular polygon
 	#
+	@incremental
 	def draw_regular_polygon(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],vertexs=5,radius=1,scalelines=0.075,color="AzureBlueDark",linecolor="OrangeObscureDull",name='RegularPolygon',opacity=1.0,thickness=0.0,vectors=None):
 		"""
 		Draws a regular polygon
@@ -3259,6 +5817,7 @@ class LinearAlgebra():
 	#
 	# Draw a triangle
 	#
+	@incremental
 	def draw_triangle(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],points=[[0,0],[1,0],[0,1]],scalelines=0.075,color="AzureBlueMedium",linecolor="OrangeObscureDull",name="Triangle",opacity=1.0,thickness=0.01):
 		"""
 		Draws a triangle. It's a polygon with three vertices
@@ -3287,6 +5846,7 @@ class LinearAlgebra():
 	#
 	# Draw a triangle from vertices
 	#
+	@incremental
 	def triangle(self,vertices=[[0,0,0],[1,0,0],[0,1,0]],scalelines=0.075,color="AzureBlueMedium",linecolor="Blue",name="Triangle",baricentre=False,factors=(2,2,-2),ortocentre=False,circumcentre=False,opacity=1.0,radius=0.03):
 		"""
 		Draws a triangle from the vertices
@@ -3352,6 +5912,7 @@ class LinearAlgebra():
 	#
 	# Draw a rectangle
 	#
+	@incremental
 	def rectangle(self,origin=[0,0,0],u1=[1,0,0],u2=[0,1,0],scalelines=0.1,color="AzureBlueMedium",linecolor="AzureBlueDark",name="Rectangle",sizex=10,sizey=10,opacity=1.0,thickness=0.0):
 		"""
 		Draws a rectangle
@@ -3387,6 +5948,7 @@ class LinearAlgebra():
 	#
 	# Draw a list of points
 	#
+	@incremental
 	def draw_points(self,points=[],name='Points',color="Blue",opacity=1):
 		"""
 		Draws a list of points
@@ -3413,6 +5975,7 @@ class LinearAlgebra():
 	#
 	# Draw a mesh
 	#
+	@incremental
 	def draw_mesh(self,mesh=None,name='Mesh',color="Blue",opacity=1):
 		"""
 		Draws a mesh. This function is used by other functions
@@ -3462,7 +6025,8 @@ class LinearAlgebra():
 	#
 	def join(self,llista):
 		"""
-		Joins a list of objects
+		Joins a list of objects. In linked mode the objects share meshes, so they are parented
+		to the first one instead
 		Parameters:
 		   llista: list of objects
 		"""
@@ -3470,6 +6034,9 @@ class LinearAlgebra():
 			return
 		if len(llista) == 1:
 			return llista[0]
+		if self.linked:
+			self.parent_parts(llista[0],llista[1:])
+			return llista[0]
 		bpy.ops.object.select_all(action='DESELECT')
 		bpy.context.view_layer.objects.active = llista[0]
 		for obj in llista:
@@ -3508,6 +6075,7 @@ class LinearAlgebra():
 	#
 	# Draw an ellpsoid
 	#
+	@incremental
 	def ellipsoid(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,c2=1,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="Ellipsoid",cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an ellipsoid
@@ -3541,8 +6109,10 @@ class LinearAlgebra():
 
 		   opacity: opaccity of the ellipsoid
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		q = self.vectors_to_quaternion(u1,u2)
@@ -3567,13 +6137,12 @@ class LinearAlgebra():
 		c = math.sqrt(c2)
 		el = self.draw_ellipsoid(radius=1,scale=[a,b,c],color=color,name=name,thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, el
 	#
 	#
 	#
+	@incremental
 	def sphere(self,o=[0,0,0],r2=1,principal=True,canonica=True,scaleaxis=0.1,color="AzureBlueDark",name="Sphere",cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws a sphere of center 'o' and radius squared equal to 'r2'
@@ -3600,7 +6169,7 @@ class LinearAlgebra():
 
 		   opacity: opacity of the sphere
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
 		u1 = Vector([1,0,0])
 		u2 = Vector([0,1,0])
@@ -3608,6 +6177,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def one_sheet_hyperboloid(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,c2=1,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="OneSheetHyperboloid",xmax=None,cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an one sheet hyperboloid
@@ -3638,8 +6208,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the hyperboloid
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		q = self.vectors_to_quaternion(u1,u2)
@@ -3667,13 +6239,12 @@ class LinearAlgebra():
 		xmax /= a
 		hy = self.draw_one_sheet_hyperboloid(a=1.0,b=1.0,xmin=1.0,xmax=xmax,scale=[a,b,c],color=color,name=name,thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, hy
 	#
 	#
 	#
+	@incremental
 	def two_sheets_hyperboloid(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,c2=1,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="TwoSheetHyperboloid",xmax=None,cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws a two sheets hyperboloid
@@ -3704,8 +6275,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the hyperboloid
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		q = self.vectors_to_quaternion(u1,u2)
@@ -3733,13 +6306,12 @@ class LinearAlgebra():
 		xmax /= a
 		hy = self.draw_two_sheets_hyperboloid(a=1.0,b=1.0,xmin=0.0,xmax=xmax,color=color,scale=[a,b,c],name=name,thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, hy
 	#
 	#
 	#
+	@incremental
 	def cone(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,c2=1,half=False,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="Cone",xmax=None,cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws a cone
@@ -3772,8 +6344,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the cone
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		q = self.vectors_to_quaternion(u1,u2)
@@ -3801,13 +6375,12 @@ class LinearAlgebra():
 		xmax /= a
 		co = self.draw_cone(a=1.0,xmin=0.0,xmax=xmax,steps=50,half=half,color=color,scale=[a,b,c],name=name,thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, co
 	#
 	#
 	#
+	@incremental
 	def hyperbolic_cylinder(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="Hyperbolic Cylinder",xmax=None,zmax=15,cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an hyperbolic cylinder
@@ -3840,8 +6413,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the hyperbolic cylinder
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		if cmax < zmax + 2:
 			cmax = zmax + 2
 		axis1 = None
@@ -3870,13 +6445,12 @@ class LinearAlgebra():
 		xmax /= a
 		hy = self.draw_hyperbolic_cylinder(a=1.0,b=1.0,xmin=1.0,xmax=xmax,length=2*zmax,steps=128,color=color,name=name,scale=[a,b,1],thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, hy
 	#
 	#
 	#
+	@incremental
 	def elliptic_cylinder(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,principal=True,canonica=True,scaleaxis=0.1,color="AzureBlueDark",name="EllipticCylinder",zmax=20,cmax=20,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an elliptic cylinder
@@ -3907,8 +6481,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the elliptic cylinder
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		if cmax < zmax + 2:
@@ -3934,13 +6510,12 @@ class LinearAlgebra():
 		b = math.sqrt(b2)
 		el = self.draw_elliptic_cylinder(a=1.0,b=1.0,length=2*zmax,color=color,name=name,scale=[a,b,1],thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, el
 	#
 	#
 	#
+	@incremental
 	def elliptic_paraboloid(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,principal=True,canonica=True,scaleaxis=0.1,color="AzureBlueDark",name="EllipticParaboloid",xmax=None,cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an elliptic paraboloid
@@ -3971,8 +6546,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the elliptic paraboloid
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		q = self.vectors_to_quaternion(u1,u2)
@@ -3999,13 +6576,12 @@ class LinearAlgebra():
 		xmax /= a
 		el = self.draw_elliptic_paraboloid(a=1.0,xmin=0.0,xmax=xmax,steps=50,scale=[a,b,1],color=color,name=name,opacity=opacity,thickness=thickness)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, el
 	#
 	#
 	#
+	@incremental
 	def hyperbolic_paraboloid(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],a2=1,b2=1,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="HyperbolicParaboloid",xmax=None,ymax=None,cmax=15,pmax=15,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an hyperbolic paraboloid
@@ -4038,8 +6614,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the hyperbolic paraboloid
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		a = math.sqrt(a2)
@@ -4075,13 +6653,12 @@ class LinearAlgebra():
 			hy.location.rotate(self.rotation.quaternion)
 		hy.location = o
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, hy
 	#
 	#
 	#
+	@incremental
 	def parabolic_cylinder(self,o=[0,0,0],u1=[1,0,0],u2=[0,1,0],p=1,scaleaxis=0.1,principal=True,canonica=True,color="AzureBlueDark",name="ParabolicCylinder",xmax=12,ymax=30,cmax=20,pmax=20,thickness=0.02,opacity=1.0,preserve=True):
 		"""
 		Draws an hyperbolic paraboloid
@@ -4114,8 +6691,10 @@ class LinearAlgebra():
 
 		   opacity: opacity of the hyperbolic paraboloid
 
-		   preserve: Keep self.origin and self.base as the principal reference
+		   preserve: Keep self.origin and self.base as the principal reference. If False, the previous reference is restored
 		"""
+		if not preserve:
+			self.push_reference()
 		axis1 = None
 		axis2 = None
 		coef = 1.0
@@ -4142,14 +6721,95 @@ class LinearAlgebra():
 		xmax /= math.sqrt(2*coef*p)
 		pa = self.draw_parabolic_cylinder(p=coef,xmin=0.0,xmax=xmax,length=ymax,color=color,name=name,scale=[math.sqrt(2*coef*p),1,1],thickness=thickness,opacity=opacity)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 		return axis1, axis2, pa
 	#
+	# Quadric with animatable coefficients
+	#
+	@incremental
+	def quadric(self,kind='central',a2=1.0,b2=1.0,c2=1.0,s=1.0,d=1.0,zmax=5.0,rmax=3.0,steps=128,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),color="AzureBlueDark",name="Quadric",thickness=0.02,opacity=1.0):
+		"""
+		Draws a quadric whose coefficients are custom properties of the object. The surface is computed
+		by a Geometry Nodes modifier whose inputs are driven by the custom properties, so the coefficients
+		can be animated with animate_quadric without rebuilding the mesh
+		Parameters:
+		   kind: 'central' for the quadric x'^2/a2 + y'^2/b2 + s*z'^2/c2 = d or 'paraboloid' for the
+		      quadric z' = x'^2/a2 + s*y'^2/b2
+
+		   a2, b2, c2, s, d: coefficients of the equation
+
+		   zmax: the central quadrics are drawn between z'=-zmax and z'=zmax
+
+		   rmax: maximum value of the polar radius of the paraboloids
+
+		   steps: number of steps in every direction
+
+		   o: center or vertex of the quadric
+
+		   u1, u2: the principal basis {v1, v2, v3} is constructed from this vectors
+
+		   color: color of the surface
+
+		   name: name of the quadric
+
+		   thickness: thickness of the surface
+
+		   opacity: opacity of the surface
+		"""
+		if kind == 'central':
+			eq = central_quadric
+			params = {"a2": a2,"b2": b2,"c2": c2,"s": s,"d": d,"zmax": zmax}
+			vmin = -1.0
+		elif kind == 'paraboloid':
+			eq = paraboloid_quadric
+			params = {"a2": a2,"b2": b2,"s": s,"rmax": rmax}
+			vmin = 0.0
+		else:
+			return None
+		obj = self.draw_surface(eq=eq,umin=0.0,umax=2*math.pi,usteps=steps,vmin=vmin,vmax=1.0,vsteps=steps,thickness=thickness,opacity=opacity,pmax=0,name=name,color=color,o=o,u1=u1,u2=u2,wrap_u=True,backend='nodes',params=params)
+		modifier = obj.modifiers.get("Surface")
+		if modifier is None:
+			print("The quadric %s can't be compiled into Geometry Nodes. Its coefficients can't be animated" % obj.name)
+			return obj
+		for k, value in params.items():
+			obj[k] = float(value)
+			fcurve = modifier.driver_add('["%s"]' % node_group_input(modifier.node_group,k))
+			driver = fcurve.driver
+			driver.type = 'AVERAGE'
+			var = driver.variables.new()
+			var.type = 'SINGLE_PROP'
+			var.targets[0].id = obj
+			var.targets[0].data_path = '["%s"]' % k
+		return obj
+	#
+	#
+	#
+	def animate_quadric(self,obj,frame=None,**coefficients):
+		"""
+		Sets coefficients of a quadric drawn with the method quadric and inserts a keyframe for all
+		its coefficients
+		Parameters:
+		   obj: the quadric
+
+		   frame: frame of the keyframe. If None, self.frame is used
+
+		   coefficients: new values of the coefficients, for instance s=-1
+		"""
+		if frame is None:
+			frame = self.frame
+		for k, value in coefficients.items():
+			obj[k] = float(value)
+		for k in ("a2","b2","c2","s","d","zmax","rmax"):
+			if k in obj:
+				obj.keyframe_insert(data_path='["%s"]' % k,frame=frame)
+		if frame > bpy.context.scene.frame_end:
+			bpy.context.scene.frame_end = frame
+		obj.update_tag()
+	#
 	#
 	#
-	def draw_simple_curve(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.02,color="White",name="Curve"):
+	@incremental
+	def draw_simple_curve(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.02,color="White",name="Curve",tolerance=None):
 		"""
 		Draws a parametric curve
 		Parameters:
@@ -4166,24 +6826,19 @@ class LinearAlgebra():
 		   color: color of the curve
 
 		   name: name of the curve
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if fun is None:
 			return None
-		delta = (tmax - tmin) / steps
-		t = tmin
+		points = self.sampled_curve(fun,tmin,tmax,steps,tolerance)
 
-		curve = bpy.data.curves.new('myCurve', type='CURVE')
+		curve = tagged(bpy.data.curves.new('myCurve', type='CURVE'))
 		curve.dimensions = '3D'
 		curve.resolution_u = 2
 
-		line = curve.splines.new('POLY')
-		line.points.add(steps)
-
-		for i in range(steps+1):
-			p = fun(t)
-			p.append(1)
-			line.points[i].co = p
-			t += delta
+		poly_spline(curve,points)
 
 		obj = bpy.data.objects.new(name, curve)
 		curve.bevel_depth = thickness
@@ -4198,7 +6853,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def draw_curve_tube(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,resolution=16,name="Curve",color="White",modifiers=True,axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0])):
+	@incremental
+	def draw_curve_tube(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,resolution=16,name="Curve",color="White",modifiers=True,axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),tolerance=None):
 		"""
 		Draws a curve in a reference R' determined by the origin o and basis {v1, v2, v3} constructed from u1 and u2
 		Parameters:
@@ -4225,25 +6881,20 @@ class LinearAlgebra():
 		   o: origin of the reference R'
 
 		   u1, u2: vectors to construct the basis {v1, v2, v3}
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if fun is None:
 			return None
 		qt = self.vectors_to_quaternion(u1,u2)
-		delta = (tmax - tmin) / steps
-		t = tmin
+		points = self.sampled_curve(fun,tmin,tmax,steps,tolerance)
 
-		curve = bpy.data.curves.new('myCurve', type='CURVE')
+		curve = tagged(bpy.data.curves.new('myCurve', type='CURVE'))
 		curve.dimensions = '3D'
 		curve.resolution_u = 2
 
-		line = curve.splines.new('POLY')
-		line.points.add(steps)
-
-		for i in range(steps+1):
-			p = list(fun(t))
-			p.append(1)
-			line.points[i].co = p
-			t += delta
+		poly_spline(curve,points)
 
 		obj = bpy.data.objects.new(name, curve)
 		self.scene.collection.objects.link(obj)
@@ -4274,7 +6925,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def draw_curve(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,name="Curve",color="White",modifiers=True,axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0])):
+	@incremental
+	def draw_curve(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,name="Curve",color="White",modifiers=True,axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),tolerance=None):
 		"""
 		Draws a curve in a reference R' determined by the origin o and basis {v1, v2, v3} constructed from u1 and u2
 		Parameters:
@@ -4301,25 +6953,20 @@ class LinearAlgebra():
 		   o: origin of the reference R'
 
 		   u1, u2: vectors to construct the basis {v1, v2, v3}
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if fun is None:
 			return None
 		qt = self.vectors_to_quaternion(u1,u2)
-		delta = (tmax - tmin) / steps
-		t = tmin
+		points = self.sampled_curve(fun,tmin,tmax,steps,tolerance)
 
-		curve = bpy.data.curves.new('myCurve', type='CURVE')
+		curve = tagged(bpy.data.curves.new('myCurve', type='CURVE'))
 		curve.dimensions = '3D'
 		curve.resolution_u = 2
 
-		line = curve.splines.new('POLY')
-		line.points.add(steps)
-
-		for i in range(steps+1):
-			p = list(fun(t))
-			p.append(1)
-			line.points[i].co = p
-			t += delta
+		poly_spline(curve,points)
 
 		obj = bpy.data.objects.new(name, curve)
 		self.scene.collection.objects.link(obj)
@@ -4350,6 +6997,82 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
+	def draw_curves(self,polylines=None,thickness=0.01,name="Curves",color="White",cyclic=False):
+		"""
+		Draws a family of polylines as a single curve object with one spline for every polyline.
+		All the splines share the bevel, the modifiers and the material
+		Parameters:
+		   polylines: list of arrays of shape (n,3) with the points of the polylines. The lengths of
+		              the polylines can be different
+
+		   thickness: thickness of the curves
+
+		   name: name of the object
+
+		   color: color of the curves
+
+		   cyclic: if True, every polyline is closed
+		"""
+		if polylines is None:
+			return None
+		curve = tagged(bpy.data.curves.new(name, type='CURVE'))
+		curve.dimensions = '3D'
+		curve.resolution_u = 2
+		for points in polylines:
+			points = np.asarray(points,dtype=float).reshape(-1,3)
+			if len(points) < 2:
+				continue
+			line = poly_spline(curve,points)
+			line.use_cyclic_u = cyclic
+		curve.bevel_depth = thickness
+		obj = bpy.data.objects.new(name, curve)
+		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
+		modifier.levels = 4
+		modifier.subdivision_type = 'SIMPLE'
+		c = Colors.color(color)
+		self.add_material(obj,c.name,c.r,c.g,c.b,1.0)
+		self.scene.collection.objects.link(obj)
+		return obj
+	#
+	#
+	#
+	@incremental
+	def draw_arrows(self,origins=Vector([0,0,0]),vectors=None,thickness=0.05,segments=8,name="Vectors",color="Black",opacity=1.0):
+		"""
+		Draws a family of vectors as a single mesh object. The coordinates are canonical
+		Parameters:
+		   origins: a point or an array of shape (n,3) with the origins of the vectors
+
+		   vectors: array of shape (n,3) with the components of the vectors
+
+		   thickness: radius of the cylinders of the vectors
+
+		   segments: number of sides of the cylinders and the cones
+
+		   name: name of the object
+
+		   color: color of the vectors
+
+		   opacity: opacity of the vectors
+
+		Returns None if there are no vectors or all of them are null
+		"""
+		if vectors is None:
+			return None
+		verts, loops, sizes = arrows_mesh_data(origins,vectors,thickness,segments)
+		if len(verts) == 0:
+			return None
+		mesh = mesh_from_arrays(name,verts,loops,sizes,smooth=False)
+		obj = bpy.data.objects.new(name,mesh)
+		c = Colors.color(color)
+		self.add_material(obj,c.name,c.r,c.g,c.b,opacity)
+		self.scene.collection.objects.link(obj)
+		return obj
+	#
+	#
+	#
+	@incremental
 	def draw_disk(self,center=Vector([0,0,0]),radius=5,u1=Vector([1,0,0]),u2=Vector([0,1,0]),thickness=0.01,name="Disc",color="AzureBlueDark"):
 		"""
 		Draws a disc in a reference R' determined by self.origin and self.base
@@ -4362,11 +7085,11 @@ class LinearAlgebra():
 
 		   color: color of the curve
 		"""
-		self.base_disk()
-		t = bpy.data.objects.get("Base_disk")
+		disk = self.base_disk()
+		t = disk
 		obj = t.copy()
 		obj.name = name
-		self.delete_base_disk()
+		self.delete_base_disk(disk)
 		if radius != 1.0:
 			obj.scale = (radius,radius,1)
 		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
@@ -4393,7 +7116,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def curve(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,name="Curve",color="White",axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),symmetry=None,change=False):
+	@incremental
+	def curve(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,name="Curve",color="White",axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),symmetry=None,change=False,tolerance=None):
 		"""
 		Draws a curve in a reference R' determined by the origin o and basis {v1, v2, v3} constructed from u1 and u2 and
 		the symmetric curve or curves from the parameter 'symmetry'
@@ -4423,79 +7147,34 @@ class LinearAlgebra():
 		   symmetry: list of values in ('XY','XZ','YZ','X','Y','Z','O'). For every value S, draw the symmetric curve respect to S
 
 		   change: if True, set the reference self.origin, self.base to {o; v1, v2, v3}
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if fun is None:
 			return None
 		
 		if symmetry is None:
-			obj = self.draw_curve(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
+			obj = self.draw_curve(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2,tolerance=tolerance)
 			if change:
 				self.set_origin(o)
 				self.set_base([u1,u2],orthonormal=True)
 			return obj
 
-		obj = self.draw_curve(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-		objs = [obj]
+		obj = self.draw_curve(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2,tolerance=tolerance)
 		if isinstance(symmetry,str):
 			symmetry = [symmetry]
-		elif not isinstance(symmetry,list) and not isinstance(symmetry,tuple):
-			if change:
-				self.set_origin(o)
-				self.set_base([u1,u2],orthonormal=True)
-			return obj
-		for s in symmetry:
-			namem = name + s
-			if s == 'XY':
-				def f(t):
-					p = fun(t)
-					return (p[0],p[1],-p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'XZ':
-				def f(t):
-					p = fun(t)
-					return (p[0],-p[1],p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'YZ':
-				def f(t):
-					p = fun(t)
-					return (-p[0],p[1],p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'X':
-				def f(t):
-					p = fun(t)
-					return (p[0],-p[1],-p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'Y':
-				def f(t):
-					p = fun(t)
-					return (-p[0],p[1],-p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'Z':
-				def f(t):
-					p = fun(t)
-					return (-p[0],-p[1],p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'O':
-				def f(t):
-					p = fun(t)
-					return (-p[0],-p[1],-p[2])
-				obj2 = self.draw_curve(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-		self.join(objs)
+		if isinstance(symmetry,list) or isinstance(symmetry,tuple):
+			self.mirror_copies(obj,symmetry,name)
 		if change:
 			self.set_origin(o)
 			self.set_base([u1,u2],orthonormal=True)
-		return objs[0]
+		return obj
 	#
 	#
 	#
-	def curve_tube(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,name="Curve",color="White",axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),symmetry=None,change=False):
+	@incremental
+	def curve_tube(self,fun=None,tmin=0.0,tmax=1.0,steps=25,thickness=0.01,name="Curve",color="White",axis=False,zaxis=True,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),symmetry=None,change=False,tolerance=None):
 		"""
 		Draws a curve in a reference R' determined by the origin o and basis {v1, v2, v3} constructed from u1 and u2 and
 		the symmetric curve or curves from the parameter 'symmetry'
@@ -4525,78 +7204,33 @@ class LinearAlgebra():
 		   symmetry: list of values in ('XY','XZ','YZ','X','Y','Z','O'). For every value S, draw the symmetric curve respect to S
 
 		   change: if True, set the reference self.origin, self.base to {o; v1, v2, v3}
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if fun is None:
 			return None
 		
 		if symmetry is None:
-			obj = self.draw_curve_tube(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
+			obj = self.draw_curve_tube(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2,tolerance=tolerance)
 			if change:
 				self.set_origin(o)
 				self.set_base([u1,u2],orthonormal=True)
 			return obj
 
-		obj = self.draw_curve_tube(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-		objs = [obj]
+		obj = self.draw_curve_tube(fun,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=name,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2,tolerance=tolerance)
 		if isinstance(symmetry,str):
 			symmetry = [symmetry]
-		elif not isinstance(symmetry,list) and not isinstance(symmetry,tuple):
-			if change:
-				self.set_origin(o)
-				self.set_base([u1,u2],orthonormal=True)
-			return obj
-		for s in symmetry:
-			namem = name + s
-			if s == 'XY':
-				def f(t):
-					p = fun(t)
-					return (p[0],p[1],-p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'XZ':
-				def f(t):
-					p = fun(t)
-					return (p[0],-p[1],p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'YZ':
-				def f(t):
-					p = fun(t)
-					return (-p[0],p[1],p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'X':
-				def f(t):
-					p = fun(t)
-					return (p[0],-p[1],-p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'Y':
-				def f(t):
-					p = fun(t)
-					return (-p[0],p[1],-p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'Z':
-				def f(t):
-					p = fun(t)
-					return (-p[0],-p[1],p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-			if s == 'O':
-				def f(t):
-					p = fun(t)
-					return (-p[0],-p[1],-p[2])
-				obj2 = self.draw_curve_tube(f,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,name=namem,color=color,axis=axis,zaxis=zaxis,o=o,u1=u1,u2=u2)
-				objs.append(obj2)
-		self.join(objs)
+		if isinstance(symmetry,list) or isinstance(symmetry,tuple):
+			self.mirror_copies(obj,symmetry,name)
 		if change:
 			self.set_origin(o)
 			self.set_base([u1,u2],orthonormal=True)
-		return objs[0]
+		return obj
 	#
 	#
 	#
+	@incremental
 	def draw_circle(self,center=[0,0,0],u1=Vector([1,0,0]),u2=Vector([0,1,0]),axis=False,zaxis=False,radius=1,steps=128,thickness=0.01,name="Circle",color="White",fillcolor=None,change=False):
 		"""
 		Draws a circle of center 'center' and radius 'radius' in the plane determined by vectors u1 and u2
@@ -4632,6 +7266,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_ellipse(self,center=[0,0,0],u1=Vector([1,0,0]),u2=Vector([0,1,0]),a=1,b=1,axis=False,zaxis=False,steps=25,thickness=0.01,name="Ellipse",color="White",change=False):
 		"""
 		Draws an ellipse of center 'center' and semi-axes a and b in the plane determined by vectors u1 and u2
@@ -4663,6 +7298,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_parabola(self,vertex=[0,0,0],u1=Vector([1,0,0]),u2=Vector([0,1,0]),a=1,xmax=3.0,axis=False,zaxis=False,steps=25,thickness=0.01,name="Parabola",color="White",change=False):
 		"""
 		Draws a parabola of vertex 'vertex' of equation y'=ax'^2 in the reference {vertex; v1, v2, v3} determined by vectors u1 and u2
@@ -4696,6 +7332,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def draw_hyperbole(self,center=[0,0,0],u1=Vector([1,0,0]),u2=Vector([0,1,0]),a=1,b=1,ymax=3.0,axis=False,zaxis=False,steps=25,thickness=0.01,name="Hyperbole",color="White",change=False):
 		"""
 		Draws an hyperbole of center 'center' and semi-axes a and b in the plane determined by vectors u1 and u2
@@ -4716,23 +7353,141 @@ class LinearAlgebra():
 
 		   thickness: thickness of the curve
 
-		   name: name of the curve
+		   name: name of the curve
+
+		   color: color of the curve
+
+		   change: if True, set the reference self.origin, self.base to {o; v1, v2, v3}
+		"""
+		c1 = self.draw_curve(lambda t: (a*math.sqrt(1+t**2/b**2),t,0),tmin=-ymax,tmax=ymax,axis=axis,zaxis=zaxis,steps=steps,thickness=thickness,name=name,color=color,o=center,u1=u1,u2=u2)
+		c2 = self.draw_curve(lambda t: (-a*math.sqrt(1+t**2/b**2),t,0),tmin=-ymax,tmax=ymax,axis=False,zaxis=False,steps=steps,thickness=thickness,name=name,color=color,o=center,u1=u1,u2=u2)
+		self.join([c1,c2])
+		if change:
+			self.set_origin(center)
+			self.set_base([u1,u2],orthonormal=True)
+		return c1
+	#
+	#
+	#
+	def surface_nodes(self,eq,umin,umax,usteps,vmin,vmax,vsteps,params,name,merge=False):
+		"""
+		Returns an object whose Geometry Nodes modifier 'Surface' computes the parametric surface eq(u,v)
+		on a grid. The limits of u and v and the parameters are inputs of the modifier, so they can be
+		animated. Returns None if the function can't be compiled into math nodes
+		Parameters:
+		   eq: parametric equacion f(u,v,**params)
+
+		   umin, umax: limits of u. They can be functions of v
+
+		   usteps: steps in the u direction
+
+		   vmin, vmax: limits of v
+
+		   vsteps: steps in the v direction
+
+		   params: dictionary with the names and values of the parameters of eq
+
+		   name: name of the object
+
+		   merge: if True, the vertices with the same position are merged and the edges left without
+		      faces by the merge, as the segment between the sheets of a hyperboloid, are removed
+		"""
+		tree = tagged(bpy.data.node_groups.new(name,'GeometryNodeTree'))
+		try:
+			node_group_socket(tree,"Geometry",'INPUT','NodeSocketGeometry')
+			node_group_socket(tree,"Geometry",'OUTPUT','NodeSocketGeometry')
+			values = {"umin": umin,"umax": umax,"vmin": vmin,"vmax": vmax}
+			values.update(params)
+			for k, value in values.items():
+				if not callable(value):
+					socket = node_group_socket(tree,k,'INPUT','NodeSocketFloat')
+					socket.default_value = float(value)
+			group_in = tree.nodes.new('NodeGroupInput')
+			group_out = tree.nodes.new('NodeGroupOutput')
+			grid = tree.nodes.new('GeometryNodeMeshGrid')
+			grid.inputs['Size X'].default_value = 1.0
+			grid.inputs['Size Y'].default_value = 1.0
+			grid.inputs['Vertices X'].default_value = usteps + 1
+			grid.inputs['Vertices Y'].default_value = vsteps + 1
+			position = tree.nodes.new('GeometryNodeInputPosition')
+			separate = tree.nodes.new('ShaderNodeSeparateXYZ')
+			tree.links.new(position.outputs[0],separate.inputs[0])
+			x = NodeExpr(tree,separate.outputs['X']) + 0.5
+			y = NodeExpr(tree,separate.outputs['Y']) + 0.5
+			inputs = {k: NodeExpr(tree,group_in.outputs[k]) for k, value in values.items() if not callable(value)}
+			v = inputs["vmin"] + y * (inputs["vmax"] - inputs["vmin"])
+			u0 = node_traceable(umin)(v) if callable(umin) else inputs["umin"]
+			u1 = node_traceable(umax)(v) if callable(umax) else inputs["umax"]
+			u = u0 + x * (u1 - u0)
+			point = node_traceable(eq)(u,v,**{k: inputs[k] for k in params})
+			combine = tree.nodes.new('ShaderNodeCombineXYZ')
+			for i in range(3):
+				if isinstance(point[i],NodeExpr):
+					tree.links.new(point[i].socket,combine.inputs[i])
+				else:
+					combine.inputs[i].default_value = float(point[i])
+		except TypeError:
+			#
+			# The function uses operations that can't be applied to a NodeExpr
+			#
+			bpy.data.node_groups.remove(tree)
+			return None
+		set_position = tree.nodes.new('GeometryNodeSetPosition')
+		tree.links.new(grid.outputs['Mesh'],set_position.inputs['Geometry'])
+		tree.links.new(combine.outputs[0],set_position.inputs['Position'])
+		geometry = set_position.outputs['Geometry']
+		if merge:
+			node = tree.nodes.new('GeometryNodeMergeByDistance')
+			node.inputs['Distance'].default_value = 1e-5
+			tree.links.new(geometry,node.inputs['Geometry'])
+			geometry = node.outputs['Geometry']
+			neighbors = tree.nodes.new('GeometryNodeInputMeshEdgeNeighbors')
+			loose = tree.nodes.new('FunctionNodeBooleanMath')
+			loose.operation = 'NOT'
+			tree.links.new(neighbors.outputs['Face Count'],loose.inputs[0])
+			node = tree.nodes.new('GeometryNodeDeleteGeometry')
+			node.domain = 'EDGE'
+			tree.links.new(geometry,node.inputs['Geometry'])
+			tree.links.new(loose.outputs[0],node.inputs['Selection'])
+			geometry = node.outputs['Geometry']
+		smooth = tree.nodes.new('GeometryNodeSetShadeSmooth')
+		tree.links.new(geometry,smooth.inputs['Geometry'])
+		tree.links.new(smooth.outputs['Geometry'],group_out.inputs[0])
+		obj = bpy.data.objects.new(name,tagged(bpy.data.meshes.new(name)))
+		self.scene.collection.objects.link(obj)
+		modifier = obj.modifiers.new(name="Surface",type='NODES')
+		modifier.node_group = tree
+		bpy.ops.object.select_all(action='DESELECT')
+		obj.select_set(True)
+		bpy.context.view_layer.objects.active = obj
+		return obj
+	#
+	#
+	#
+	def set_surface_parameter(self,obj,name,value,frame=None):
+		"""
+		Sets the value of a parameter of a surface drawn with backend='nodes'. If frame is not None,
+		a keyframe is inserted
+		Parameters:
+		   obj: the surface
+
+		   name: name of the parameter. The limits are 'umin', 'umax', 'vmin' and 'vmax'
 
-		   color: color of the curve
+		   value: new value of the parameter
 
-		   change: if True, set the reference self.origin, self.base to {o; v1, v2, v3}
+		   frame: frame of the keyframe
 		"""
-		c1 = self.draw_curve(lambda t: (a*math.sqrt(1+t**2/b**2),t,0),tmin=-ymax,tmax=ymax,axis=axis,zaxis=zaxis,steps=steps,thickness=thickness,name=name,color=color,o=center,u1=u1,u2=u2)
-		c2 = self.draw_curve(lambda t: (-a*math.sqrt(1+t**2/b**2),t,0),tmin=-ymax,tmax=ymax,axis=False,zaxis=False,steps=steps,thickness=thickness,name=name,color=color,o=center,u1=u1,u2=u2)
-		self.join([c1,c2])
-		if change:
-			self.set_origin(center)
-			self.set_base([u1,u2],orthonormal=True)
-		return c1
+		modifier = obj.modifiers["Surface"]
+		identifier = node_group_input(modifier.node_group,name)
+		modifier[identifier] = float(value)
+		if frame is not None:
+			modifier.keyframe_insert(data_path='["%s"]' % identifier,frame=frame)
+		obj.update_tag()
 	#
 	#
 	#
-	def draw_surface(self,eq=None,umin=-1,umax=1,usteps=64,vmin=-1,vmax=1,vsteps=64,thickness=0.02,opacity=1.0,pmax=10,name="Surface",color="AzureBlueDark",axis=False,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),wrap_u=False,wrap_v=False,close_v=False):
+	@incremental
+	def draw_surface(self,eq=None,umin=-1,umax=1,usteps=64,vmin=-1,vmax=1,vsteps=64,thickness=0.02,opacity=1.0,pmax=10,name="Surface",color="AzureBlueDark",axis=False,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),wrap_u=False,wrap_v=False,close_v=False,backend='python',params=None):
 		"""
 		Draws a parametric surface in the reference R'
 		Parameters:
@@ -4775,20 +7530,45 @@ class LinearAlgebra():
 		   wrap_v: wrap the u coordinate
 
 		   close_v: close the v coordinate
+
+		   backend: 'python' or 'nodes'. With 'nodes', the equation is compiled into a Geometry Nodes
+		      tree and the limits and parameters are inputs of the modifier that can be animated with
+		      set_surface_parameter. If the equation can't be compiled, or the ends of the surface are
+		      closed with close_v, it is evaluated in Python
+
+		   params: dictionary of parameters passed to eq as keyword arguments
 		"""
 		if eq is None:
 			return
 
 		q = self.vectors_to_quaternion(u1,u2)
-		draw_parametric_surface(eq=eq,range_u_min=umin,range_u_max=umax,range_u_step=usteps,range_v_min=vmin,range_v_max=vmax,range_v_step=vsteps,name=name,wrap_u=wrap_u,wrap_v=wrap_v,close_v=close_v)
-
-		bpy.context.object.name = name
-		obj = bpy.data.objects.get(name)
-		obj.show_wire = False
+		if params is None:
+			params = {}
+		obj = None
+		if backend == 'nodes' and close_v and wrap_u and not wrap_v:
+			print("draw_surface: close_v is not available with backend='nodes'. The surface is computed in Python")
+		elif backend == 'nodes':
+			obj = self.surface_nodes(eq,umin,umax,usteps,vmin,vmax,vsteps,params,name,merge=wrap_u or wrap_v)
+		if obj is None:
+			fun = eq
+			if len(params) > 0:
+				fun = lambda u,v: eq(u,v,**params)
+			def compute():
+				verts, faces = parametric_surface_data(fun,umin,umax,usteps,vmin,vmax,vsteps,wrap_u=wrap_u,wrap_v=wrap_v,close_v=close_v)
+				return {"verts": np.array(verts,dtype=float),
+						"loops": np.array([i for f in faces for i in f],dtype=np.int64),
+						"sizes": np.array([len(f) for f in faces],dtype=np.int64)}
+			arrays = self.cached_geometry("draw_surface",fun,(umin,umax,usteps,vmin,vmax,vsteps,wrap_u,wrap_v,close_v),compute)
+			faces = np.split(arrays["loops"],np.cumsum(arrays["sizes"])[:-1])
+			create_mesh_object(bpy.context,arrays["verts"].tolist(),[],[f.tolist() for f in faces],name)
+
+			obj = bpy.context.object
+			obj.name = name
+			obj.show_wire = False
 
-		modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
-		modifier.levels = 4
-		modifier.subdivision_type = 'SIMPLE'
+			modifier = obj.modifiers.new(name="SubSurf", type='SUBSURF')
+			modifier.levels = 4
+			modifier.subdivision_type = 'SIMPLE'
 		if thickness > 0.0:
 			modifier = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
 			modifier.thickness = thickness
@@ -4812,7 +7592,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def draw_function(self,f=None,xmin=-3,xmax=3,xsteps=64,ymin=-3,ymax=3,ysteps=64,thickness=0.02,opacity=1.0,pmax=10,name="Function",color="AzureBlueDark",axis=False,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0])):
+	@incremental
+	def draw_function(self,f=None,xmin=-3,xmax=3,xsteps=64,ymin=-3,ymax=3,ysteps=64,thickness=0.02,opacity=1.0,pmax=10,name="Function",color="AzureBlueDark",axis=False,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),backend='python',params=None):
 		"""
 		Draws a function of two variables f(x,y) i the reference R' = {o, v1, v2, v3}
 		Parameters:
@@ -4845,13 +7626,18 @@ class LinearAlgebra():
 		   o: origin of the reference R'
 
 		   u1, u2: vectors to construct the basis {v1, v2, v3}
+
+		   backend: 'python' or 'nodes'. See draw_surface
+
+		   params: dictionary of parameters passed to f as keyword arguments
 		"""
 		if f is None:
 			return None
-		return self.draw_surface(eq=lambda x,y:(x,y,f(x,y)),umin=xmin,umax=xmax,usteps=xsteps,vmin=ymin,vmax=ymax,vsteps=ysteps,thickness=thickness,opacity=opacity,pmax=pmax,name=name,color=color,axis=axis,o=o,u1=u1,u2=u2,wrap_u=False,wrap_v=False,close_v=False)
+		return self.draw_surface(eq=lambda x,y,**p:(x,y,f(x,y,**p)),umin=xmin,umax=xmax,usteps=xsteps,vmin=ymin,vmax=ymax,vsteps=ysteps,thickness=thickness,opacity=opacity,pmax=pmax,name=name,color=color,axis=axis,o=o,u1=u1,u2=u2,wrap_u=False,wrap_v=False,close_v=False,backend=backend,params=params)
 	#
 	#
 	#
+	@incremental
 	def draw_vector_field(self,f=None,xmin=-3,xmax=3,xsteps=8,ymin=-3,ymax=3,ysteps=8,zmin=-3,zmax=3,zsteps=8,name="Vector Field",color="Red",scale=0.02,head_height=0.05):
 		"""
 		Draws a vector field
@@ -4891,33 +7677,39 @@ class LinearAlgebra():
 		zstep = (zmax - zmin)/zsteps
 		if xstep == 0 or ystep == 0 or zstep == 0:
 			return None
+		def compute():
+			origins = []
+			values = []
+			x = xmin
+			while x <= xmax:
+				y = ymin
+				while y <= ymax:
+					z = zmin
+					while z <= zmax:
+						origins.append((x,y,z))
+						values.append([float(c) for c in f(x,y,z)])
+						z += zstep
+					y += ystep
+				x += xstep
+			return {"origins": np.array(origins,dtype=float).reshape(-1,3),"vectors": np.array(values,dtype=float).reshape(-1,3)}
+		arrays = self.cached_geometry("draw_vector_field",f,(xmin,xmax,xsteps,ymin,ymax,ysteps,zmin,zmax,zsteps),compute)
 		vectors = []
 		count = 1
-		x = xmin
-		while x <= xmax:
-			y = ymin
-			while y <= ymax:
-				z = zmin
-				while z <= zmax:
-					o = Vector([x,y,z])
-					v = f(x,y,z)
-					if not isinstance(v,Vector):
-						v = Vector(v)
-					self.set_origin(o)
-					vec = self.draw_vector(vector=v,color=color,name=f"Vector{count}",scale=scale,head_height=head_height)
-					if vec is not None:
-						vectors.append(vec)
-					z += zstep
-					count += 1
-				y += ystep
-			x += xstep
+		for o, v in zip(arrays["origins"].tolist(),arrays["vectors"].tolist()):
+			self.set_origin(o)
+			vec = self.draw_vector(vector=Vector(v),color=color,name=f"Vector{count}",scale=scale,head_height=head_height)
+			if vec is not None:
+				vectors.append(vec)
+			count += 1
 		v = self.join(vectors)
-		bpy.context.object.name = name
+		if v is not None:
+			v.name = name
 		return v
 	#
 	#
 	#
-	def revolution_surface(self,fun=None,tmin=0.0,tmax=1.0,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),pmax=0,steps=256,thickness=0.025,axis='Z',name="Revolution surface",color="AzureBlueDark"):
+	@incremental
+	def revolution_surface(self,fun=None,tmin=0.0,tmax=1.0,o=Vector([0,0,0]),u1=Vector([1,0,0]),u2=Vector([0,1,0]),pmax=0,steps=256,thickness=0.025,axis='Z',name="Revolution surface",color="AzureBlueDark",segments=128,caps=False):
 		"""
 		Draws a revolution surface from a curve in the reference R'
 		Parameters:
@@ -4934,21 +7726,20 @@ class LinearAlgebra():
 		   pmax: the principal axis are drawn between -pmax and pmax
 
 		   color: color of the surface
+
+		   segments: number of angular steps of the revolution
+
+		   caps: if True, the ends of the curve that are not on the axis are closed with a disk
 		"""
 		if fun is None:
 			return None
 		q = self.vectors_to_quaternion(u1,u2)
-		obj = self.simple_curve(fun,tmin=tmin,tmax=tmax,steps=steps,name=name)
-		m = obj.modifiers.new(name="SubSurf", type='SUBSURF')
-		m.levels = 4
-		m.subdivision_type = 'SIMPLE'
-		m = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
-		m.thickness = thickness
-		m.offset = 1.0
-		m = obj.modifiers.new(name="Screw", type='SCREW')
-		m.angle = 2*math.pi
-		m.steps = steps
-		m.axis =  axis
+		points = self.sampled_curve(fun,tmin,tmax,steps)
+		obj = self.revolution_object([points],name,segments=segments,axis=axis,caps=caps)
+		if thickness > 0.0:
+			m = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
+			m.thickness = thickness
+			m.offset = 1.0
 		c = Colors.color(color)
 		self.add_material(obj,c.name,c.r,c.g,c.b,1.0)
 		bpy.context.scene.collection.objects.link(obj)
@@ -4967,9 +7758,11 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def animate_revolution_surface(self,fun=None,tmin=0.0,tmax=1.0,steps=256,curvethicknes=0.025,thickness=0.025,frames=3,angle=3,radians=False,axis='Z',origin=Vector([0,0,0]),line=0,canonica=0,symmetry=None,name="Revolution surface",color="AzureBlueDark",point=None,stop=0):
+	@incremental
+	def animate_revolution_surface(self,fun=None,tmin=0.0,tmax=1.0,steps=256,curvethicknes=0.025,thickness=0.025,frames=3,angle=3,radians=False,axis='Z',origin=Vector([0,0,0]),line=0,canonica=0,symmetry=None,name="Revolution surface",color="AzureBlueDark",point=None,stop=0,screw=False,segments=128):
 		"""
-		Draws and animates a revolution surface from a curve
+		Draws and animates a revolution surface from a curve. The surface is computed once and its
+		generation is animated with two keyframes of the input 'Sweep' of a Geometry Nodes modifier
 		Parameters:
 		   fun: parametric equacion of the curve
 
@@ -4994,7 +7787,14 @@ class LinearAlgebra():
 		   color: color of the surface
 
 		   point: if not None draw three points and a cercle. Must be a float between tmax and tmin
+
+		   stop: number of frames to wait at the end of the animation
+
+		   screw: if True, the surface is generated with a Screw modifier keyframed at every step
+
+		   segments: number of angular steps of the precomputed surface
 		"""
+		before = self.existing_datablocks()
 		if radians:
 			angle *= 180/math.pi
 		stepsr = int(360/angle) + 1
@@ -5050,7 +7850,18 @@ class LinearAlgebra():
 
 		p2 = self.curve(myfun,tmin=tmin,tmax=tmax,steps=steps,thickness=curvethicknes,color="Red",symmetry=symmetry,name="Rotating curve")
 		p1 = self.curve(myfun,tmin=tmin,tmax=tmax,steps=steps,thickness=1.05*curvethicknes,color="Blue",symmetry=symmetry,name="Curve")
-		obj = self.simple_curve(myfun,tmin=tmin,tmax=tmax,steps=steps,name=name,symmetry=symmetry)
+		if not screw:
+			points = self.sampled_curve(myfun,tmin,tmax,steps)
+			profiles = [points]
+			if isinstance(symmetry,str):
+				symmetry = [symmetry]
+			if isinstance(symmetry,list) or isinstance(symmetry,tuple):
+				for s in symmetry:
+					if s in SYMMETRIES:
+						profiles.append(points * np.array(SYMMETRIES[s]))
+			obj = self.sweep_object(profiles,name,segments=segments,axis=axis)
+		else:
+			obj = self.simple_curve(myfun,tmin=tmin,tmax=tmax,steps=steps,name=name,symmetry=symmetry)
 
 		if point is not None:
 			m1 = self.draw_point(radius=0.1,location=zp,name="Punt p0",color="Red")
@@ -5061,6 +7872,25 @@ class LinearAlgebra():
 			l1 = self.join([l1,m2])
 			self.draw_circle(center=z0,u1=d1,u2=d2,radius=(zp-z0).length,steps=128,thickness=0.005,name="Circle",color="Cyan")
 
+		if not screw:
+			m = obj.modifiers.new(name="Solidify", type='SOLIDIFY')
+			m.thickness = thickness
+			m.offset = 1.0
+			c = Colors.color(color)
+			self.add_material(obj,c.name,c.r,c.g,c.b,1.0)
+			bpy.context.scene.collection.objects.link(obj)
+			end = self.frame + stepsr * frames
+			sweep = node_group_input(obj.modifiers["Sweep"].node_group,"Sweep")
+			insert_keyframes(obj,'modifiers["Sweep"]["%s"]' % sweep,[self.frame,end],[0.0,2 * math.pi])
+			self.spin_keyframes(p2,axis,self.frame,end)
+			if point is not None:
+				self.spin_keyframes(l1,axis,self.frame,end)
+			self.frame = end + stop
+			bpy.context.scene.frame_end = self.frame
+			self.reset()
+			self.translate_created(before,origin)
+			return None
+
 		m = obj.modifiers.new(name="SubSurf", type='SUBSURF')
 		m.levels = 4
 		m.subdivision_type = 'SIMPLE'
@@ -5104,15 +7934,14 @@ class LinearAlgebra():
 		bpy.context.view_layer.update()
 		self.reset()
 		bpy.context.scene.frame_set(0)
-		bpy.ops.object.select_all(action='SELECT')
-		bpy.ops.transform.translate(value=origin)
-		bpy.ops.object.select_all(action='DESELECT')
+		self.translate_created(before,origin)
 	#
 	# Helical motion or rotation of objects
 	#
+	@incremental
 	def rotate_objects(self,objs=[],axis='Z',angle=None,frames=1,origin=Vector([0,0,0]),translation=0,rounds=1,length=25,stop=0,draw=False):
 		"""
-		Rotates an object around the axis
+		Rotates a list of objects around the axis and returns the ScrewMotion of the animation
 		Parameters:
 		   objs: the list of objects
 
@@ -5145,48 +7974,26 @@ class LinearAlgebra():
 
 		if angle is None:
 			angle = 360
-		else:
+		if angle != 360:
 			rounds = 1
 
 		if draw:
 			self.draw_vector(origin=origin,vector=u,axis=length,positive=False,color="White")
-		r = Rotation(1/int(frames),u)
-		axis, alfa = r.to_axis_angle()
-		axis.normalize()
-		t =  translation / (alfa * int(frames) * angle) * u
-		bpy.context.scene.frame_set(self.frame)
-		for obj in objs:
-			obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-			obj.keyframe_insert(data_path="location",index=-1)
-		fn = self.frame + 1
-		for i in range(int(frames) * int(rounds) * int(angle)):
-			for obj in objs:
-				bpy.context.scene.frame_set(fn)
-				obj.rotation_quaternion.rotate(r.quaternion)
-				obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-				w = obj.location - origin
-				w.rotate(r.quaternion)
-				obj.location = origin + w + t
-				obj.keyframe_insert(data_path="location",index=-1)
-			fn += 1
-		#
-		# Residual angle
-		#
-		final = angle - int(frames) * int(rounds) * int(angle)
-		r = Rotation(final,u)
+		steps = int(frames) * int(rounds) * int(angle)
+		motion = ScrewMotion(u,origin,int(rounds) * int(angle),int(rounds) * translation * u.length)
 		for obj in objs:
-				bpy.context.scene.frame_set(fn)
-				obj.rotation_quaternion.rotate(r.quaternion)
-				obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-		fn += 1
+			motion.keyframes(obj,self.frame,steps)
+		fn = self.frame + steps + 1
 		self.frame = fn - frames
 		self.frame += stop
 		bpy.context.scene.frame_end = self.frame
 		bpy.context.scene.frame_set(0)
 		bpy.context.view_layer.update()
+		return motion
 	#
 	# Rotation of a vector
 	#
+	@incremental
 	def rotate_vector(self,vector=None,axis='Z',length=25,angle=360,stop=0):
 		"""
 		Rotates a vector around the axis
@@ -5224,6 +8031,7 @@ class LinearAlgebra():
 	#
 	# Rotation of a point
 	#
+	@incremental
 	def rotate_point(self,punt=None,origen=Vector([0,0,0]),axis='Z',angle=360,length=20,stop=0,vectors=True):
 		"""
 		Rotates a point around an affine line
@@ -5279,7 +8087,8 @@ class LinearAlgebra():
 	#
 	#
 	#
-	def rotate_object_by_axis_angle(self,obj=None,axis=Vector([1,0,0]),angle=90,amax=15,frames=1,scaleaxis=0.075,local=False,stop=0):
+	@incremental
+	def rotate_object_by_axis_angle(self,obj=None,axis=Vector([1,0,0]),angle=90,amax=15,frames=1,scaleaxis=0.075,local=False,stop=0,density=1.0):
 		"""
 		Rotates an object around an angle 'angle' around the axis
 		Parameters:
@@ -5295,7 +8104,9 @@ class LinearAlgebra():
 
 		   local: if True the center of rotation is the location of the object
 
-		   stop:
+		   stop: number of frames to wait at the end of the animation
+
+		   density: number of keyframes by degree
 		"""
 		if obj is None:
 			return None
@@ -5309,34 +8120,56 @@ class LinearAlgebra():
 		self.draw_base_axis(axis = amax,scale=scaleaxis,positive=False,name="Base canònica")
 		self.draw_vector(vector=u,scale=0.1,axis=amax,positive=False,color="White",name="Eix rotació")
 
-		num = int(angle)
-		alfa = angle / num
-		r = Rotation(alfa,u)
-		bpy.context.scene.frame_set(self.frame)
-		obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-		if not local:
-			obj.keyframe_insert(data_path="location",index=-1)
-		fn = frames + self.frame
-
-		for i in range(num):
-			bpy.context.scene.frame_set(fn)
-			obj.rotation_quaternion.rotate(r.quaternion)
-			obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-			if not local:
-				w = obj.location
-				w.rotate(r.quaternion)
-				obj.location = w
-				obj.keyframe_insert(data_path="location",index=-1)
-			fn += frames
-		self.frame = fn - frames
+		self.frame = self.rotation_keyframes(obj,[(u,angle)],frames=frames,local=local,density=density)
 		self.frame += stop
 		bpy.context.scene.frame_end = self.frame
 		bpy.context.scene.frame_set(0)
 		bpy.context.view_layer.update()
 	#
+	#
+	#
+	def rotation_keyframes(self,obj,rotations,frames=1,local=False,density=1.0):
+		"""
+		Animates an object with a sequence of rotations around axes through the origin, starting at
+		self.frame. Every rotation of alpha degrees is divided in int(|alpha| * density) steps of
+		'frames' frames. The quaternions and locations of all the steps are computed at once with a
+		RotationArray and inserted with insert_keyframes. Returns the frame of the last keyframe
+		Parameters:
+		   obj: the object
+
+		   rotations: list of pairs (axis,alpha) with the axis and the angle in degrees of every rotation
+
+		   frames: number of frames of every step
+
+		   local: if True the center of rotation is the location of the object
+
+		   density: number of steps by degree
+		"""
+		quaternions = [tuple(obj.rotation_quaternion)]
+		locations = [tuple(obj.location)]
+		for u, alpha in rotations:
+			num = int(abs(alpha) * density)
+			if num == 0:
+				continue
+			steps = RotationArray.from_axis_angle(u,alpha * np.arange(1,num + 1) / num)
+			start = RotationArray(quaternions[-1])
+			quaternions.extend((steps @ start).quaternions)
+			if local:
+				locations.extend([locations[-1]] * num)
+			else:
+				locations.extend(steps.apply(locations[-1]))
+		frame = self.frame + frames * np.arange(len(quaternions))
+		insert_keyframes(obj,"rotation_quaternion",frame,quaternions)
+		if not local:
+			insert_keyframes(obj,"location",frame,locations)
+		obj.rotation_quaternion = tuple(quaternions[-1])
+		obj.location = tuple(locations[-1])
+		return int(frame[-1])
+	#
 	# Rotation by Euler's angles
 	#
-	def rotate_euler(self,obj=None,psi=0.0,theta=0.0,phi=0.0,frames=3,axis='ZXZ',amax=15,scaleaxis=0.075,reverse=False,local=False,stop=0,radians=False,canonica=True,positive=False):
+	@incremental
+	def rotate_euler(self,obj=None,psi=0.0,theta=0.0,phi=0.0,frames=3,axis='ZXZ',amax=15,scaleaxis=0.075,reverse=False,local=False,stop=0,radians=False,canonica=True,positive=False,density=1.0):
 		"""
 		Rotates an object by the Euler angles psi, theta and phi
 		Parameters:
@@ -5356,6 +8189,8 @@ class LinearAlgebra():
 
 		   positive: if False and psi, theta or phi are greather than 180 degrees, they are converted
 		             to negative angles
+
+		   density: number of keyframes by degree
 		"""
 		def vector_from_axis(axis):
 			if axis == 'X':
@@ -5402,7 +8237,11 @@ class LinearAlgebra():
 		if reverse:
 			self.set_colors(["OrangeRedDark","Yellow","Magenta"])
 			axis = self.draw_base_axis(axis=amax,scale=scaleaxis,positive=False,name="Eixos transformats")
-			obj = self.join([obj,axis])
+			#
+			# The axes are parented and not joined to obj, so they stay a datablock of this call that
+			# is removed when the call is made again in incremental mode
+			#
+			self.parent_parts(obj,[axis])
 			u1, u2, u3 = u3, u2, u1
 			psi, theta, phi = phi, theta, psi
 			s = Rotation(psi,u1)
@@ -5413,63 +8252,7 @@ class LinearAlgebra():
 		elif canonica:
 			self.draw_base_axis(axis=amax,scale=scaleaxis,positive=False,name="Base canònica")
 
-		bpy.context.scene.frame_set(self.frame)
-		obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-		if not local:
-			obj.keyframe_insert(data_path="location",index=-1)
-		fn = frames + self.frame
-		if psi > 0:
-			num = int(psi)
-		elif psi < 0:
-			num = int(-psi)
-		alfa = psi / num
-		r = Rotation(alfa,u1)
-		for i in range(num):
-			bpy.context.scene.frame_set(fn)
-			obj.rotation_quaternion.rotate(r.quaternion)
-			obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-			if not local:
-				w = obj.location
-				w.rotate(r.quaternion)
-				obj.location = w
-				obj.keyframe_insert(data_path="location",index=-1)
-			fn += frames
-
-		if theta > 0:
-			num = int(theta)
-		elif theta < 0:
-			num = int(-theta)
-		alfa = theta / num
-		r = Rotation(alfa,u2)
-		for i in range(num):
-			bpy.context.scene.frame_set(fn)
-			obj.rotation_quaternion.rotate(r.quaternion)
-			obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-			if not local:
-				w = obj.location
-				w.rotate(r.quaternion)
-				obj.location = w
-				obj.keyframe_insert(data_path="location",index=-1)
-			fn += frames
-
-		if phi > 0:
-			num = int(phi)
-		elif phi < 0:
-			num = int(-phi)
-		alfa = phi / num
-		r = Rotation(alfa,u3)
-		for i in range(num):
-			bpy.context.scene.frame_set(fn)
-			obj.rotation_quaternion.rotate(r.quaternion)
-			obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-			if not local:
-				w = obj.location
-				w.rotate(r.quaternion)
-				obj.location = w
-				obj.keyframe_insert(data_path="location",index=-1)
-			fn += frames
-
-		self.frame = fn - frames
+		self.frame = self.rotation_keyframes(obj,[(u1,psi),(u2,theta),(u3,phi)],frames=frames,local=local,density=density)
 		self.frame += stop
 		bpy.context.scene.frame_end = self.frame
 		bpy.context.scene.frame_set(0)
@@ -5477,6 +8260,7 @@ class LinearAlgebra():
 	#
 	# Translate object
 	#
+	@incremental
 	def translate_object(self,obj=None,vector=Vector([10,10,10]),steps=100,stop=0):
 		"""
 		Translates an object by vector "vector"
@@ -5512,6 +8296,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def translacio_ortoedre(self,centre=Vector([0,0,0]),costats=Vector([4,2,3]),vector=Vector([10,10,10]),steps=100,length=12,stop=0,opacity=1,original=False):
 		"""
 		Translates an orthohedron by vector "vector"
@@ -5542,9 +8327,10 @@ class LinearAlgebra():
 	#
 	# Rotate objects or helical motion
 	#
+	@incremental
 	def rotate_object(self,obj=None,axis='Z',frames=1,origin=Vector([0,0,0]),angle=360,localaxis=None,localangle=None,translation=0.0,rounds=1,stop=0,length=25,draw=True,hides=[]):
 		"""
-		Rotates an object around the axis
+		Rotates an object around the axis and returns the ScrewMotion of the animation
 		Parameters:
 		   obj: the object
 
@@ -5588,35 +8374,22 @@ class LinearAlgebra():
 			bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_MASS', center='MEDIAN')
 			line.select_set(False)
 			self.set_origin(old)
-			lr = Rotation(localangle,localaxis)
 		if draw:
 			self.set_origin(origin)
 			self.draw_vector(vector=u,axis=length,positive=False,color="White")
 			self.set_origin()
-		r = Rotation(1/int(frames),u)
-		axis, alpha = r.to_axis_angle()
-		axis.normalize()
-		t =  translation / (alpha * int(frames) * int(angle)) * axis
+		steps = int(frames) * int(rounds) * int(angle)
+		motion = ScrewMotion(u,origin,int(rounds) * int(angle),int(rounds) * translation)
+		local = None
+		if line is not None:
+			local = RotationArray.from_axis_angle(localaxis,localangle * np.arange(steps + 1))
 		bpy.context.scene.frame_set(self.frame)
-		obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-		obj.keyframe_insert(data_path="location",index=-1)
 		obj.keyframe_insert(data_path="hide_viewport", index=-1)
-		fn = self.frame + 1
-		for i in range(int(frames) * int(rounds) * int(angle)):
-			bpy.context.scene.frame_set(fn)
-			if line is None:
-				obj.rotation_quaternion.rotate(r.quaternion)
-			else:
-				obj.rotation_quaternion.rotate(lr.quaternion)
-			obj.keyframe_insert(data_path="rotation_quaternion",index=-1)
-			w = obj.location - origin
-			w.rotate(r.quaternion)
-			obj.location = origin + w + t
-			if line is not None:
-				line.location = origin + w + t
-				line.keyframe_insert(data_path="location",index=-1)
-			obj.keyframe_insert(data_path="location",index=-1)
-			fn += 1
+		locations = motion.keyframes(obj,self.frame,steps,local)
+		if line is not None:
+			insert_keyframes(line,"location",self.frame + np.arange(steps + 1),locations)
+			line.location = tuple(locations[-1])
+		fn = self.frame + steps + 1
 		for h in hides:
 			h, f = h
 			obj.hide_viewport = h
@@ -5627,9 +8400,11 @@ class LinearAlgebra():
 		bpy.context.scene.frame_end = self.frame
 		bpy.context.scene.frame_set(0)
 		bpy.context.view_layer.update()
+		return motion
 	#
 	#
 	#
+	@incremental
 	def scale_object(self,obj=None,sx=1.0,sy=1.0,sz=1.0,steps=100,stop=0,hides=[]):
 		"""
 		Scales an object in the x, y and z directions
@@ -5675,7 +8450,7 @@ class LinearAlgebra():
 			sz = s * sz
 			h = (sz - s) / steps
 			fn = self.frame
-			for i in range(0,step+1):
+			for i in range(0,steps+1):
 				bpy.context.scene.frame_set(fn)
 				if i != 0:
 					obj.scale.z += h
@@ -5694,6 +8469,255 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
+	def apply_affine_map(self,obj=None,matrix=Matrix.Identity(3),vector=Vector([0,0,0]),origin=Vector([0,0,0])):
+		"""
+		Applies the affine map x -> origin + matrix (x - origin) + vector to the vertices of a mesh or to the
+		control points of a curve. The coordinates are transformed at once with numpy
+		Parameters:
+		   obj: the object. Its data is copied if it's shared with other objects
+
+		   matrix: a 3x3 matrix or the 4x4 matrix of an affine map
+
+		   vector: vector of translation
+
+		   origin: fixed point of the linear part of the map
+
+		In incremental mode the original coordinates and the maps applied are stored in the data, so
+		that executing the script again doesn't apply the same maps again
+		"""
+		if obj is None or obj.type not in ('MESH','CURVE'):
+			return None
+		if node_surface(obj):
+			print("The geometry of %s is generated by Geometry Nodes and can't be transformed" % obj.name)
+			return None
+		if obj.data.users > 1:
+			obj.data = obj.data.copy()
+		bpy.context.view_layer.update()
+		mat = affine_map_matrix(matrix,origin,obj.matrix_world,vector)
+		if not self.incremental:
+			transform_data(obj.data,mat)
+		else:
+			n = self.maps.get(obj.data.name,0)
+			self.maps[obj.data.name] = n + 1
+			maps = stored_maps(obj.data)
+			if n >= len(maps) or not np.allclose(maps[n],mat):
+				apply_maps(obj.data,maps[:n] + [mat])
+		bpy.context.view_layer.update()
+		return obj
+	#
+	#
+	#
+	@incremental
+	def apply_linear_map(self,obj=None,matrix=Matrix.Identity(3),origin=Vector([0,0,0])):
+		"""
+		Applies the linear map x -> origin + matrix (x - origin) to the vertices of a mesh or to the
+		control points of a curve
+		Parameters:
+		   obj: the object
+
+		   matrix: a 3x3 matrix
+
+		   origin: fixed point of the map
+		"""
+		return self.apply_affine_map(obj,matrix,origin=origin)
+	#
+	#
+	#
+	@incremental
+	def animate_linear_map(self,obj=None,matrix=Matrix.Identity(3),origin=Vector([0,0,0]),steps=100,stop=0,name="Aplicació lineal"):
+		"""
+		Animates the affine map x -> origin + matrix (x - origin) acting on a mesh. The images of the
+		vertices are computed at once with numpy and stored in a shape key, so the animation is the
+		value of the shape key going from 0 to 1. Returns the shape key
+		Parameters:
+		   obj: the object. Its mesh is copied if it's shared with other objects
+
+		   matrix: a 3x3 matrix
+
+		   origin: fixed point of the map
+
+		   steps: number of frames of the animation
+
+		   stop: frames to stop at the end of animation
+
+		   name: name of the shape key. If the mesh already has a shape key with this name, it is replaced
+		"""
+		if obj is None or obj.type != 'MESH':
+			return None
+		if node_surface(obj):
+			print("The geometry of %s is generated by Geometry Nodes and can't be transformed" % obj.name)
+			return None
+		if obj.data.users > 1:
+			obj.data = obj.data.copy()
+		if obj.data.shape_keys is None:
+			obj.shape_key_add(name="Basis",from_mix=False)
+		bpy.context.view_layer.update()
+		mat = affine_map_matrix(matrix,origin,obj.matrix_world)
+		keys = obj.data.shape_keys
+		co = np.empty(3 * len(obj.data.vertices))
+		keys.reference_key.data.foreach_get("co",co)
+		co = co.reshape(-1,3)
+		key = keys.key_blocks.get(name)
+		if key is None:
+			key = obj.shape_key_add(name=name,from_mix=False)
+		key.data.foreach_set("co",transform_array(mat,co,out=co).ravel())
+		data_path = 'key_blocks["%s"].value' % key.name
+		fcurves = action_fcurves(keys)
+		fcurve = fcurves.find(data_path)
+		if fcurve is not None:
+			fcurves.remove(fcurve)
+		insert_keyframes(keys,data_path,[self.frame,self.frame + steps],[0.0,1.0],interpolation='BEZIER')
+		self.frame += steps + stop
+		bpy.context.scene.frame_end = self.frame
+		bpy.context.scene.frame_set(0)
+		bpy.context.view_layer.update()
+		return key
+	#
+	#
+	#
+	@incremental
+	def aplicacio_lineal_esfera(self,radi=5,matriu=Matrix.Identity(3),cmax=10,steps=100,stop=0):
+		"""
+		Draws the image of a sphere by a linear map
+		Parameters:
+		   radi: radius of the sphere
+
+		   matriu: matrix of the linear map
+
+		   cmax: maximum values of the x, y and z coordinates
+
+		   steps: number of steps
+		"""
+		self.base_canonica(scale=0.09)
+		e = self.esfera(radi=radi,cmax=cmax)
+		self.animate_linear_map(obj=e[2],matrix=matriu,steps=steps,stop=stop)
+	#
+	# Singular value decomposition
+	#
+	@incremental
+	def singular_value_decomposition(self,matrix=Matrix(((2,1,0),(0,1,1),(1,0,1))),origin=Vector([0,0,0]),radius=5,steps=100,stop=0,cmax=15,color="AzureBlueDark",opacity=1.0,thickness=0.02,name="SVD"):
+		"""
+		Draws an animation of the image of a sphere by a matrix A = U S V^t. The sphere is rotated by V^t,
+		scaled by S and rotated by U. Every factor is an empty and the sphere is the child of the three.
+		The axes v1, v2, v3 move with the sphere to s1 u1, s2 u2, s3 u3, that are also drawn
+		Parameters:
+		   matrix: a 3x3 matrix
+
+		   origin: center of the sphere
+
+		   radius: radius of the sphere
+
+		   steps: number of frames of every factor
+
+		   stop: frames to stop at the end of animation
+
+		   cmax: length of the axis of the canonical reference
+
+		   color: color of the sphere
+
+		   opacity: opacity of the sphere
+
+		   thickness: thickness of the sphere
+
+		   name: name of the sphere
+		"""
+		if not isinstance(origin,Vector):
+			origin = Vector(origin)
+		U, S, Vt = np.linalg.svd(np.array(matrix,dtype=float))
+		#
+		# U and V^t must be rotations. The sign goes to the last singular value
+		#
+		if np.linalg.det(U) < 0:
+			U[:,2] *= -1
+			S[2] *= -1
+		if np.linalg.det(Vt) < 0:
+			Vt[2,:] *= -1
+			S[2] *= -1
+		self.base_canonica(length=cmax,scale=0.03)
+		self.set_origin()
+		factors = []
+		parent = None
+		for factor in ("U","S","Vt"):
+			empty = bpy.data.objects.new("%s %s" % (name,factor),None)
+			empty.empty_display_size = radius
+			empty.rotation_mode = 'QUATERNION'
+			empty.parent = parent
+			self.scene.collection.objects.link(empty)
+			factors.append(empty)
+			parent = empty
+		u, s, vt = factors
+		u.location = origin
+		sphere = self.draw_ellipsoid(radius=radius,scale=[1,1,1],color=color,name=name,opacity=opacity,thickness=thickness)
+		sphere.location = (0,0,0)
+		sphere.rotation_quaternion = (1,0,0,0)
+		sphere.parent = vt
+		axes = self.draw_arrows(vectors=radius * Vt,name="%s v1 v2 v3" % name,color="Red")
+		if axes is not None:
+			axes.parent = vt
+		self.draw_arrows(origins=origin,vectors=radius * (U * S).T,name="%s s1u1 s2u2 s3u3" % name,color="Orange",opacity=0.5)
+		#
+		# Keyframes
+		#
+		t = np.linspace(0.0,1.0,steps + 1)
+		identity = RotationArray()
+		qv = RotationArray([tuple(Matrix(Vt.tolist()).to_quaternion())])
+		qu = RotationArray([tuple(Matrix(U.tolist()).to_quaternion())])
+		frame = self.frame + np.arange(steps + 1)
+		insert_keyframes(vt,"rotation_quaternion",frame,identity.slerp(qv,t).quaternions)
+		insert_keyframes(s,"scale",[self.frame + steps,self.frame + 2 * steps],[[1,1,1],S])
+		insert_keyframes(u,"rotation_quaternion",frame + 2 * steps,identity.slerp(qu,t).quaternions)
+		self.frame += 3 * steps + stop
+		bpy.context.scene.frame_end = self.frame
+		bpy.context.scene.frame_set(0)
+		bpy.context.view_layer.update()
+		return sphere
+	#
+	# Vectors propis i subespais invariants
+	#
+	@incremental
+	def vectors_propis(self,matriu=Matrix(((2,1,0),(1,2,0),(0,0,3))),samples=1000,radius=5,size=15,cmax=15,scale=0.03,thickness=0.01,opacity=0.8):
+		"""
+		Draws sample vectors v on a sphere, their images Av, the eigenvectors and the real invariant
+		lines and planes of a matrix. All the images are computed at once with numpy and every family
+		of vectors is a single object
+		Parameters:
+		   matriu: a 3x3 matrix
+
+		   samples: number of vectors v
+
+		   radius: length of the vectors v and the eigenvectors
+
+		   size: length of the invariant lines
+
+		   cmax: length of the axis of the canonical reference
+
+		   scale: scale of the invariant lines
+
+		   thickness: radius of the sample vectors
+
+		   opacity: opacity of the invariant planes
+		"""
+		A = np.array(matriu,dtype=float)
+		self.base_canonica(length=cmax)
+		v = radius * fibonacci_sphere(samples)
+		self.draw_arrows(vectors=v,thickness=thickness,name="Vectors v",color="GrayLight",opacity=0.5)
+		self.draw_arrows(vectors=v @ A.T,thickness=thickness,name="Imatges Av",color="Blue")
+		lines, planes = invariant_subspaces(A)
+		for i, (value, w) in enumerate(lines):
+			self.recta_vectorial(v=Vector(radius * w),color="Red",size=size,name="Recta invariant %d" % (i + 1),canonica=False,scale=scale)
+		if len(lines) > 0:
+			images = np.array([value * radius * w for value, w in lines])
+			self.draw_arrows(vectors=images,thickness=1.2*scale,name="Imatges dels vectors propis",color="Orange")
+		for value, v1, v2 in planes:
+			v1 = radius * v1 / np.linalg.norm(v1)
+			v2 = radius * v2 / np.linalg.norm(v2)
+			self.pla_vectorial(v1=Vector(v1),v2=Vector(v2),canonica=False,color="Cyan",opacity=opacity)
+		self.set_origin()
+	#
+	#
+	#
+	@incremental
 	def escalat_esfera(self,radi=5,sx=1.0,sy=1.0,sz=1.0,cmax=10,steps=100,stop=0):
 		"""
 		Scales an sphere in the x, y and z directions
@@ -5710,6 +8734,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def gir_rectangle(self,sizex=10,sizey=4,angle=90,cmax=10,steps=100,original=True,opacity=1,stop=0):
 		"""
 		Rotates a rectangle in the plain XY an angle "angle"
@@ -5736,6 +8761,7 @@ class LinearAlgebra():
 	#
 	#
 	#
+	@incremental
 	def escalat_rectangle(self,sizex=10,sizey=4,sx=1.0,sy=1.0,cmax=10,steps=100,original=True,opacity=1,stop=0):
 		"""
 		Scales a rectangle in the plain XY in the x and y directions
@@ -5766,7 +8792,8 @@ class LinearAlgebra():
 	#
 	# 
 	#
-	def draw_frenet_curve(self,fun=None,var=None,tmin=0.0,tmax=1.0,radius=0.1,steps=25,thickness=0.01,name="Curve",color="White",point=True,tangent=False,acceleration=False,normal=False,osculator=False,frenet=False,units=False,sizex=8,sizey=8,axis=10):
+	@incremental
+	def draw_frenet_curve(self,fun=None,var=None,tmin=0.0,tmax=1.0,radius=0.1,steps=25,thickness=0.01,name="Curve",color="White",point=True,tangent=False,acceleration=False,normal=False,osculator=False,frenet=False,units=False,sizex=8,sizey=8,axis=10,tolerance=None):
 		"""
 		Draws a curve and diferents elements related to the curve
 		Parameters:
@@ -5807,6 +8834,9 @@ class LinearAlgebra():
 		   sizex, sizey: sizes of the osculating plane
 
 		   axis: length of the coordinate axis
+
+		   tolerance: if not None, the curve is sampled adaptively starting from steps, with this
+		              approximate maximum distance between the curve and the polyline
 		"""
 		if fun is None:
 			return None
@@ -5823,7 +8853,7 @@ class LinearAlgebra():
 			return Matrix([v1,v2,v3]).transposed().to_quaternion()
 
 		frames = 1
-		curve = self.draw_curve(_fun_,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,color=color,axis=False)
+		curve = self.draw_curve(_fun_,tmin=tmin,tmax=tmax,steps=steps,thickness=thickness,color=color,axis=False,tolerance=tolerance)
 		if not point and not tangent and not osculator and not frenet:
 			return curve
 
@@ -5959,16 +8989,33 @@ class LinearAlgebra():
 	#
 	# Examples of use
 	#
-	def clear(self):
+	def clear(self,purge=False):
 		"""
-		Clears and removes all the elements
+		Clears and removes all the objects and the meshes, curves, materials, lights and node groups
+		created by this module, in one call to bpy.data.batch_remove
+		Parameters:
+		   purge: if True, all the orphan datablocks of the file are also removed
 		"""
 		self.reset()
-		for obj in bpy.data.objects:
-			bpy.data.objects.remove(obj)
+		self.records = {}
+		self.axes = {}
+		self.primitives = {}
+		self.registry.clear()
+		if "LinearAlgebra" in bpy.context.scene:
+			del bpy.context.scene["LinearAlgebra"]
+		data = list(bpy.data.objects)
+		for kind in DATABLOCKS[1:]:
+			data.extend(d for d in getattr(bpy.data,kind) if "LinearAlgebra" in d)
+		bpy.data.batch_remove(data)
+		if purge:
+			try:
+				bpy.data.orphans_purge(do_local_ids=True,do_linked_ids=True,do_recursive=True)
+			except AttributeError:
+				bpy.ops.outliner.orphans_purge(do_local_ids=True,do_linked_ids=True,do_recursive=True)
 	#
 	# Base canònica
 	#
+	@incremental
 	def base_canonica(self,origin=Vector([0,0,0]),length=15,scale=0.04,zaxis=True,name="Base canònica"):
 		"""
 		Draws the canonical base
@@ -5989,6 +9036,7 @@ class LinearAlgebra():
 		self.draw_base_axis(axis=length,positive=False,scale=scale,zaxis=zaxis,name=name)
 	#
 	#
+	@incremental
 	def base_canonica_white(self,origin=Vector([0,0,0]),length=20,scale=0.04,zaxis=True,name="Base canònica"):
 		"""
 		Draws the canonical base in white
@@ -6011,6 +9059,7 @@ class LinearAlgebra():
 	#
 	# Vector i base canònica
 	#
+	@incremental
 	def vector_base_canonica(self,vector=Vector([-4,7,6]),length=12,name="Vector",components=True):
 		"""
 		Draws a vector expressed in the canonical base
@@ -6032,6 +9081,7 @@ class LinearAlgebra():
 	#
 	# Base no canònica
 	#
+	@incremental
 	def base_no_canonica(self,origin=Vector([0,0,0]),u1=Vector([1,-1,0]),u2=1/2*Vector([1,-1,-1]),u3=Vector([-1,0,1]),length=12,scale=0.04,preserve=False,name="Base B'"):
 		"""
 		Draws the base {u1,u2,u3} with origin in the point origin and sets the default
@@ -6049,6 +9099,8 @@ class LinearAlgebra():
 
 			preserve:
 		"""
+		if not preserve:
+			self.push_reference()
 		if not isinstance(origin,Vector):
 			origin = Vector(origin)
 		if not isinstance(u1,Vector):
@@ -6061,12 +9113,11 @@ class LinearAlgebra():
 		self.set_base([u1,u2,u3])
 		self.draw_base_axis(axis=length,positive=False,scale=scale,name=name)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 	#
 	# Base a partir d'un eix
 	#
+	@incremental
 	def base_adaptada(self,origin=Vector([0,0,0]),axis=Vector([1,1,1]),length=15,scale=0.04,name="Base adaptada"):
 		"""
 		Draws an ortonormal base from vector axis with origin in the point origin and sets the default
@@ -6098,6 +9149,7 @@ class LinearAlgebra():
 	#
 	# Vector en base no canònica
 	#
+	@incremental
 	def vector_base_no_canonica(self,vector=Vector([5,6,-5]),origin=Vector([0,0,0]),u1=1/3*Vector([-1,-2,2]),u2=1/3*Vector([2,1,2]),u3=1/3*Vector([-2,2,1]),length=12,scale=0.04,name="Base B'",canonica=True,preserve=False):
 		"""
 		Draws a vector expressed in the base {u1,u2,u3} with origin in the point origin and sets the default
@@ -6115,6 +9167,8 @@ class LinearAlgebra():
 
 			name: name of the base
 		"""
+		if not preserve:
+			self.push_reference()
 		self.base_no_canonica(origin=origin,u1=u1,u2=u2,u3=u3,length=length,scale=scale,preserve=preserve,name=name)
 		if not isinstance(vector,Vector):
 			vector = Vector(vector)
@@ -6123,12 +9177,11 @@ class LinearAlgebra():
 		self.draw_vector(vector=vector,scale=0.06,head_height=0.25)
 		self.draw_components(vector,scale=0.015,name="Components en base B'")
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 	#
 	# Canvi de base
 	#
+	@incremental
 	def canvi_base(self,vector=Vector([8,-6,7]),u1=1/3*Vector([-1,-2,2]),u2=1/3*Vector([2,1,2]),u3=1/3*Vector([-2,2,1]),length=12):
 		"""
 		Draw the components of a vectors in the canonical base and in the base {u1,u2,u3}. Sets the default
@@ -6148,6 +9201,7 @@ class LinearAlgebra():
 	#
 	# Pla vectorial
 	#
+	@incremental
 	def pla_vectorial(self,v1=Vector([3,2,1]),v2=Vector([1,-2,0.5]),canonica=False,length=15,color="Cyan",sizex=25,sizey=20,opacity=0.8,thickness=0.01):
 		"""
 		Draws the plane generated by two vectors
@@ -6176,6 +9230,7 @@ class LinearAlgebra():
 	#
 	# Pla afí
 	#
+	@incremental
 	def pla_afi(self,punt=Vector([0,0,0]),normal=None,v1=Vector([3,2,1]),v2=Vector([1,-2,0.5]),canonica=False,name="Pla afí",length=15,color="Cyan",sizex=25,sizey=20,radius=0.1,opacity=0.9,elements=True):
 		"""
 		Draws the affine plane generated by two vectors passing through a point
@@ -6229,6 +9284,7 @@ class LinearAlgebra():
 	#
 	# Posició relativa de tres plans
 	#
+	@incremental
 	def posicio_relativa_tres_plans(self,punts=None,normals=None,colors=None,canonica=True,length=25,sizex=45,sizey=40,opacity=1.0,elements=False):
 		"""
 		Draws threee planes
@@ -6261,6 +9317,7 @@ class LinearAlgebra():
 	#
 	# Recta afí
 	#
+	@incremental
 	def recta_afi(self,punt=Vector([3,4,-2]),v=Vector([1,2,1]),color="Black",size=15,name="Recta afí",canonica=True,length=12,scale=0.03,elements=True):
 		"""
 		Draws the affine line generated by a vector passing through a point
@@ -6303,6 +9360,7 @@ class LinearAlgebra():
 	#
 	# Recta vectorial
 	#
+	@incremental
 	def recta_vectorial(self,v=Vector([1,2,1]),color="Black",size=15,name="Recta vectorial",canonica=True,length=12,scale=0.03):
 		"""
 		Draws the affine line generated by a vector passing through a point
@@ -6336,6 +9394,7 @@ class LinearAlgebra():
 	#
 	# Distància entre dues rectes que s'encreuen
 	#
+	@incremental
 	def distancia_rectes_encreuen(self,p0=Vector([3,4,-2]),v0=Vector([1,2,3]),c0="Black",n0="Primera recta",p1=Vector([-3,4,1]),v1=Vector([1,-2,-1]),c1="Blue",n1="Segona recta",canonica=True,length=12,size=15,scale=0.03):
 		"""
 		Draws the distance between two affine lines
@@ -6372,6 +9431,7 @@ class LinearAlgebra():
 	#
 	# Projecció ortogonal i simètric sobre un pla vectorial
 	#
+	@incremental
 	def projeccio_ortogonal_simetric_pla_vectorial(self,vector=Vector([7,-1,12]),v1=Vector([3,-1,1]),v2=Vector([1,0.5,0.5]),sizex=None,sizey=None,color="AzureBlueDark",canonica=True,orthogonal=False,orthonormal=False,thickness=0.01):
 		"""
 		Draws the otoghonal projection and the symmetric of a vector with respecte a plane
@@ -6444,6 +9504,7 @@ class LinearAlgebra():
 	#
 	# Projecció ortogonal i simètric d'un punt sobre un pla afí
 	#
+	@incremental
 	def projeccio_ortogonal_simetric_pla_afi(self,punt=Vector([6,-5,8]),p0=Vector([3,-2,-3]),v1=Vector([3,-1,1]),v2=Vector([1,0.5,0.5]),radi=0.15,sizex=35,sizey=30,line=1.8,canonica=True,elements=True):
 		"""
 		Draws the orthogonal projection and the symmetric of a point with respect an affine plane
@@ -6485,6 +9546,7 @@ class LinearAlgebra():
 	#
 	# Projecció ortogonal i simètric d'un punt sobre una recta afí
 	#
+	@incremental
 	def projeccio_ortogonal_simetric_recta_afi(self,punt=Vector([6,-5,8]),p0=Vector([3,-2,-3]),v1=Vector([3,-1,1]),scale=0.1,radi=0.15,sizex=10,sizey=10,canonica=True,opacity=1.0):
 		"""
 		Draws the orthogonal projection and the symmetric of a point with respect an affine line
@@ -6523,6 +9585,7 @@ class LinearAlgebra():
 	#
 	# Projecció ortogonal i simètric sobre una recta vectorial
 	#
+	@incremental
 	def projeccio_ortogonal_simetric_recta_vectorial(self,vector=Vector([7,-1,12]),v1=Vector([3,-1,1]),canonica=True,length=15):
 		"""
 		Draws the otoghonal projection and the symmetric of a vector with respecte a line
@@ -6551,6 +9614,7 @@ class LinearAlgebra():
 	#
 	# Perpendicular comuna a dues rectes
 	#
+	@incremental
 	def perpendicular_comuna_a_dues_rectes(self,p0=Vector([1,1,1]),u=Vector([1,0,0]),q0=Vector([-1,2,-2]),v=Vector([0,0,1]),sizex=60,sizey=80,length=5,t1=0,t2=0,head_height=0.1):
 		"""
 		Draws the straigth line perpendicular to a given two non parallel lines
@@ -6606,6 +9670,7 @@ class LinearAlgebra():
 	#
 	# Referència canònica
 	#
+	@incremental
 	def referencia_canonica(self,origin=Vector([0,0,0]),length=15,scale=0.04,zaxis=True,name="Referència canònica"):
 		"""
 		Draws the canonical reference
@@ -6627,6 +9692,7 @@ class LinearAlgebra():
 	#
 	# Punt en referència canònica
 	#
+	@incremental
 	def punt_referencia_canonica(self,punt=Vector([-4,7,6]),radius=0.1,length=12,scale=0.06,name="Punt p",color="Black",coordenades=True,vector=True):
 		"""
 		Draws a point expressed in the canonical reference
@@ -6652,6 +9718,7 @@ class LinearAlgebra():
 	#
 	# Referència no canònica
 	#
+	@incremental
 	def referencia_no_canonica(self,origin=Vector([0,0,0]),u1=Vector([1,-1,0]),u2=1/2*Vector([-1,2,1]),u3=Vector([-1,0,1]),length=12,scale=0.04,preserve=True,name="Referència R'"):
 		"""
 		Draws the reference {o;u1,u2,u3} with origin in the point origin and sets the default
@@ -6667,6 +9734,8 @@ class LinearAlgebra():
 
 			name: name of the reference
 		"""
+		if not preserve:
+			self.push_reference()
 		if not isinstance(origin,Vector):
 			origin = Vector(origin)
 		if not isinstance(u1,Vector):
@@ -6679,12 +9748,11 @@ class LinearAlgebra():
 		self.set_base([u1,u2,u3])
 		self.draw_base_axis(axis=length,positive=False,scale=scale,name=name)
 		if not preserve:
-			self.set_origin()
-			self.set_base()
-			self.set_rotation()
+			self.pop_reference()
 	#
 	# Punt en referencia no canònica
 	#
+	@incremental
 	def punt_referencia_no_canonica(self,punt=Vector([5,6,-5]),origin=Vector([-2,3,3]),u1=1/3*Vector([-1,-2,2]),u2=1/3*Vector([2,1,2]),u3=1/3*Vector([-2,2,1]),color="Black",length=12,scale=0.04,radius=0.1,name="Punt p",vector=True):
 		"""
 		Draws a point expressed in the reference {o,u1,u2,u3} with origin in the point origin and sets the default
@@ -6714,6 +9782,7 @@ class LinearAlgebra():
 	#
 	# Canvi de coordenades
 	#
+	@incremental
 	def canvi_coordenades(self,punt=Vector([8,-6,7]),origin=Vector([-2,3,3]),u1=1/3*Vector([-1,-2,2]),u2=1/3*Vector([2,1,2]),u3=1/3*Vector([-2,2,1]),canonica=False,scale=0.06,length=12,radius=0.1,vectors=True):
 		"""
 		Draw the coordinates of a point in the canonical reference and in the reference {o;u1,u2,u3}. Sets the default
@@ -6752,6 +9821,7 @@ class LinearAlgebra():
 	#
 	# El·lipse
 	#
+	@incremental
 	def ellipse(self,center=Vector([0,0,0]),a=8,b=5,canonica=True):
 		"""
  		Draws the ellipse of equation (x-x0)^2/a^2 + (y-y0)^2/b^2 == 1
@@ -6784,6 +9854,7 @@ class LinearAlgebra():
 	#
 	# Hipèrbola
 	#
+	@incremental
 	def hiperbola(self,center=Vector([0,0,0]),a=8,b=5,negatiu=False,canonica=True):
 		"""
  		Draws the hyperbole of equation (x-x0)^2/a^2 - (y-y0)^2/b^2 == 1 (or -1)
@@ -6827,6 +9898,7 @@ class LinearAlgebra():
 	#
 	# Paràbola
 	#
+	@incremental
 	def parabola(self,vertex=Vector([0,0,0]),p=5,xmax=15,eixos='XY',canonica=True):
 		"""
 		Draws the parabola of equation y - y0 = (x-x0)^2/(2*p) or x - x0 = (y-y0)^2/(2*p)
@@ -6866,6 +9938,7 @@ class LinearAlgebra():
 	#
 	# El·lipsoide de revolucio
 	#
+	@incremental
 	def ellipsoide_revolucio(self,a=12,b=8,direccio='Z',punt=None):
 		"""
 		Draws an animation showing an ellipsoid of revolution
@@ -6888,6 +9961,7 @@ class LinearAlgebra():
 	#
 	# Hiperboloide d'una fulla de revolució
 	#
+	@incremental
 	def hiperboloide_una_fulla_revolucio(self,a=3,b=2,pmax=8,direccio='Z',plane='XZ',punt=None):
 		"""
 		Draws an animation showing an one sheet hyperboloid of revolution
@@ -6920,6 +9994,7 @@ class LinearAlgebra():
 	#
 	# Hiperboloide de dues fulles de revolució
 	#
+	@incremental
 	def hiperboloide_dues_fulles_revolucio(self,a=3,b=2,pmax=8,direccio='Z',plane='XZ',punt=None):
 		"""
 		Draws an animation showing a two sheet hyperboloid of revolution
@@ -6966,6 +10041,7 @@ class LinearAlgebra():
 	#
 	# Con de revolució
 	#
+	@incremental
 	def con_revolucio(self,a=1.5,pmax=8,direccio='Z',plane='XZ',punt=None):
 		"""
 		Draws an animation showing a cone of revolution
@@ -7008,6 +10084,7 @@ class LinearAlgebra():
 	#
 	# Paraboloide el·líptic de revolució
 	#
+	@incremental
 	def paraboloide_elliptic_revolucio(self,a=0.5,pmax=5,direccio='Z',plane='XZ',punt=None):
 		"""
 		Draws an animation showing an elliptic paraboloid of revolution
@@ -7050,6 +10127,7 @@ class LinearAlgebra():
 	#
 	# Paraboloide hiperbòlic
 	#
+	@incremental
 	def paraboloide_hiperbolic_simple(self,a=3,b=4,xmax=12,ymax=12):
 		"""
 		Draws the hyperbolic paraboloid of equation z = x^2/a^2 - y^2/b^2
@@ -7062,6 +10140,7 @@ class LinearAlgebra():
 	#
 	# Paraboloide elliptic
 	#
+	@incremental
 	def paraboloide_elliptic_simple(self,a=3,b=4,direccio='Z',xmax=12):
 		"""
 		Draws the hyperbolic paraboloid of equation z = x^2/a^2 - y^2/b^2
@@ -7085,6 +10164,7 @@ class LinearAlgebra():
 	#
 	# Cilindre el·líptic
 	#
+	@incremental
 	def cilindre_elliptic_simple(self,a=10,b=6,direccio='Z',pmax=20):
 		"""
 		Draws an elliptic cylinder with direction X, Y or Z
@@ -7111,6 +10191,7 @@ class LinearAlgebra():
 	#
 	# Cilindre hiperbòlic
 	#
+	@incremental
 	def cilindre_hiperbolic_simple(self,a=4,b=3,direccio='Z',pmax=15,hmax=20):
 		"""
 		Draws an hyperbolic cylinder with direction X, Y or Z
@@ -7139,6 +10220,7 @@ class LinearAlgebra():
 	#
 	# Cilindre parabòlic
 	#
+	@incremental
 	def cilindre_parabolic_simple(self,a=3,direccio='Z',pmax=12,hmax=45):
 		r"""
 		Draws a parabolic cylinder with direction X, Y or Z
@@ -7178,6 +10260,7 @@ class LinearAlgebra():
 	#
 	# Con
 	#
+	@incremental
 	def con_simple(self,a=4,b=3,c=2,direccio='Z',pmax=12):
 		"""
 		Draws a con with direction X, Y or Z
@@ -7211,6 +10294,7 @@ class LinearAlgebra():
 	#
 	# Cilindre fitat
 	#
+	@incremental
 	def cilindre(self,centre=Vector([0,0,0]),radi=1,height=5,eix='Z',color="AzureBlueDark",circlecolor="Blue"):
 		"""
 		Draws a bounded cylinder with direction eix
@@ -7258,6 +10342,7 @@ class LinearAlgebra():
 	#
 	# Esfera
 	#
+	@incremental
 	def esfera(self,centre=Vector([0,0,0]),radi=10,cmax=20,name="Esfera"):
 		"""
 		Draws a sphere
@@ -7272,6 +10357,7 @@ class LinearAlgebra():
 	#
 	# Tor
 	#
+	@incremental
 	def tor(self,centre=Vector([8,0,3]),radi=3,cmax=15,punt=None):
 		"""
 		Draws a torus of revolution from a circumference
@@ -7295,6 +10381,7 @@ class LinearAlgebra():
 	#
 	# Revolució d'una paràbola que no és un paraboloide
 	#
+	@incremental
 	def superficie_revolucio_parabola(self,a=0.2,vertex=Vector([0,0,0]),pmax=8,pla='XZ',punt=None):
 		"""
 		Draws an animation of a revolution surface from a paràbola
@@ -7336,6 +10423,7 @@ class LinearAlgebra():
 	#
 	# Rotació d'un ortoedre
 	#
+	@incremental
 	def rotacio_ortoedre(self,centre=Vector([0,0,0]),costats=Vector([8,5,4]),eix='Z',angle=360,stop=0,opacity=1):
 		"""
 		Draws an animation of an orthohedron rotating around a vectorial line
@@ -7358,6 +10446,7 @@ class LinearAlgebra():
 	#
 	# Rotació d'un vector
 	#
+	@incremental
 	def rotacio_vector(self,vector=Vector([6,8,5]),eix=Vector([1,1,1]),angle=360,stop=0,adaptada=False):
 		"""
 		Draws an animation of a vector rotating around a vectorial line
@@ -7391,6 +10480,7 @@ class LinearAlgebra():
     #
 	# Rotació d'un punt al voltant d'un eix
 	#
+	@incremental
 	def rotacio_punt(self,punt=Vector([6,8,5]),origen=Vector([4,3,0]),angle=360,eix=Vector([1,1,1]),length=None,stop=0,vectors=True):
 		"""
 		Draws an animation of a point rotating around an afine line
@@ -7425,6 +10515,7 @@ class LinearAlgebra():
 	#
 	# Rotació d'un ortoedre a partir dels angles d'Euler
 	#
+	@incremental
 	def rotacio_ortoedre_angles_euler(self,centre=Vector([0,0,0]),costats=Vector([8,5,4]),psi=90,theta=60,phi=45,frames=2,radians=False,opacity=1,eixos='zxz',stop=0):
 		"""
 		Draws an animation of an orthohedron rotating given the Euler's angles
@@ -7452,6 +10543,7 @@ class LinearAlgebra():
 	#
 	# Rotació d'un ortoedre al voltant d'un eix i angles d'Euler
 	#
+	@incremental
 	def rotacio_ortoedre_voltant_vector(self,centre=Vector([0,0,0]),costats=Vector([8,5,4]),angle=80,frames=3,stop=0,radians=False,vector=Vector([1,-2,1]),opacity=0.7,euler=None,reverse=False):
 		"""
 		Draws an animation of a vector rotating around a vectorial line
@@ -7493,6 +10585,7 @@ class LinearAlgebra():
 	#
 	# Rotation or helical motion
 	#
+	@incremental
 	def moviment_helicoidal_ortoedre(self,centre=Vector([0,0,0]),costats=Vector([3,5,2]),opacity=1,origen=Vector([4,3,0]),eix='Z',angle=360,frames=1,rounds=1,translacio=0.0,stop=0,aligned=False):
 		"""
 		Draws an animation of the helical motion of an orthohedron around an affine line
@@ -7548,6 +10641,7 @@ class LinearAlgebra():
 	#
 	# Rotation or helical motion of a cylinder
 	#
+	@incremental
 	def moviment_helicoidal_cilindre(self,centre=Vector([0,0,0]),radi=3,altura=12,opacity=1,origen=Vector([4,3,0]),eix='Z',rounds=1,translacio=0.0,aligned=False,reverse=False):
 		"""
 		Draws an animation of the helical motion of an orthohedron around an affine line
@@ -7605,6 +10699,7 @@ class LinearAlgebra():
 	#
 	# Rotation or helical motion of a point
 	#
+	@incremental
 	def moviment_helicoidal_punt(self,punt=Vector([0,0,0]),origen=Vector([-3,-3,-4]),eix='Z',rounds=5,angle=360,stop=0,translacio=2,vectors=True,length=15,curve=True,reverse=False):
 		"""
 		Draws an animation of the helical motion of an orthohedron around an affine line
@@ -7660,29 +10755,28 @@ class LinearAlgebra():
 			obj2 = self.draw_vector(origin=origen,vector=punt-origen,name="VRed",color="Red")
 		if obj2 is None:
 			if reverse:
-				self.rotate_object(obj,axis=-u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
+				motion = self.rotate_object(obj,axis=-u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
 			else:
-				self.rotate_object(obj,axis=u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
+				motion = self.rotate_object(obj,axis=u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
 		else:
 			if reverse:
-				self.rotate_objects([obj,obj2],axis=-u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
+				motion = self.rotate_objects([obj,obj2],axis=-u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
 			else:
-				self.rotate_objects([obj,obj2],axis=u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
-		vec1 = (punt-origen).project(u)
-		center = origen + vec1
-		w1 = (punt-center).normalized()
-		w3 = u.normalized()
-		w2 = w3.cross(w1)
-		radius = (center-punt).length
+				motion = self.rotate_objects([obj,obj2],axis=u,origin=origen,translation=translacio,angle=angle,stop=stop,length=length,rounds=rounds,draw=True)
 		if curve:
+			#
+			# The helix is the trail of the point in the motion of the animation
+			#
 			if angle < 360:
-				self.curve(lambda t: (radius*math.cos(t),radius*math.sin(t),180*translacio*u.length/(angle*math.pi)*t),tmin=0,tmax=2*rounds*math.pi,steps=128,thickness=0.005,name="Hèlix",color="Yellow",o=center,u1=w1,u2=w2)
+				trail = motion.trail(punt,steps=128)
 			else:
-				self.curve(lambda t: (radius*math.cos(t),radius*math.sin(t),translacio*t/(2*math.pi)),tmin=-2*rounds*math.pi,tmax=2*rounds*math.pi,steps=128*rounds,thickness=0.005,name="Hèlix",color="Yellow",o=center,u1=w1,u2=w2)
+				trail = motion.trail(punt,-1.0,1.0,steps=256 * rounds)
+			self.draw_curves([trail],thickness=0.005,name="Hèlix",color="Yellow")
 		self.reset()
 	#
 	# Gir en el pla d'un poligon
 	#
+	@incremental
 	def gir_poligon(self,centre=Vector([0,0,0]),costats=6,origen=Vector([0,0,0]),radi=8):
 		"""
 		Draws an animation of the rotation around a point of a polygon in the plane XY
@@ -7723,6 +10817,7 @@ class LinearAlgebra():
 	#
 	# Esfera i cilindre el·liptic
 	#
+	@incremental
 	def esfera_cilindre_elliptic(self,radi=10,x0=5,a=5,b=5):
 		"""
 		Draws an sphere centered at (0,0,0), an elliptic cylinder and their intersection
@@ -7810,6 +10905,7 @@ class LinearAlgebra():
 	#
 	# Con i cilindre el·liptic
 	#
+	@incremental
 	def con_cilindre_elliptic(self,a2=1,b2=1,c2=1,x0=5,a=8,b=5,zmax=15):
 		"""
 		Draws a cone with vertex at (0,0,0) and equation x^2/a2 + y^2/b2 - z^2/c2 == 0,
@@ -7838,6 +10934,7 @@ class LinearAlgebra():
 	#
 	# Segment esfèric
 	#
+	@incremental
 	def segment_esferic(self,r=10,p1=math.pi/2,s1=0,p2=math.pi/2,s2=math.pi/2,name="Segment"):
 		"""
 		Draws an spheric segment in a sphere centered at origin with radius r from the point
@@ -7865,8 +10962,33 @@ class LinearAlgebra():
 		c = self.draw_curve(F,tmin=t0,tmax=t1,steps=256,thickness=0.05,color="Red",name=name,u1=b[0],u2=b[1])
 		return c
 	#
+	# Arc de circumferència màxima
+	#
+	def arc_esferic(self,r=10,p1=math.pi/2,s1=0,p2=math.pi/2,s2=math.pi/2,steps=256):
+		"""
+		Returns an array with the steps + 1 points of the arc of maximum circle in a sphere centered
+		at origin with radius r from the point with spherical coordinates (radi,p1,s1) to the point
+		(radi,p2,s2)
+		Parameters:
+		   r: radius of the sphere
+		   p1: polar angle of the first point
+		   s1: azimuthal angle of the first point
+		   p2: polar angle of the second point
+		   s2: azimuthal angle of the second point
+		   steps: number of steps
+		"""
+		x = Vector([r*math.sin(p1)*math.cos(s1),r*math.sin(p1)*math.sin(s1),r*math.cos(p1)])
+		y = Vector([r*math.sin(p2)*math.cos(s2),r*math.sin(p2)*math.sin(s2),r*math.cos(p2)])
+		R = EuclideanReference(u1=x,u2=y)
+		x1 = R.coordinates(x)
+		y1 = R.coordinates(y)
+		b = np.array(R.base())
+		t = np.linspace(math.atan2(x1[1],x1[0]),math.atan2(y1[1],y1[0]),steps + 1)
+		return r * (np.cos(t)[:,None] * b[0] + np.sin(t)[:,None] * b[1])
+	#
 	# Triangle esfèric
 	#
+	@incremental
 	def triangle_esferic(self,r=10,p1=math.pi/2,s1=0,p2=math.pi/2,s2=math.pi/2,p3=0,s3=0):
 		"""
 		Draws an spheric triangle in a sphere centered at origin with radius r  with vetices
@@ -7881,12 +11003,12 @@ class LinearAlgebra():
 		   s3: azimuthal angle of the third point
 		"""
 		es = self.esfera(radi=r,name="Esfera")
-		c1 = self.segment_esferic(r=r,p1=p1,s1=s1,p2=p2,s2=s2,name="Costat 1")
-		c2 = self.segment_esferic(r=r,p1=p2,s1=s2,p2=p3,s2=s3,name="Costat 2")
-		c3 = self.segment_esferic(r=r,p1=p3,s1=s3,p2=p1,s2=s1,name="Costat 3")
+		sides = [self.arc_esferic(r=r,p1=p1,s1=s1,p2=p2,s2=s2),self.arc_esferic(r=r,p1=p2,s1=s2,p2=p3,s2=s3),self.arc_esferic(r=r,p1=p3,s1=s3,p2=p1,s2=s1)]
+		return self.draw_curves(sides,thickness=0.05,color="Red",name="Triangle")
 	#
 	# Triangle esfèric aleatori
 	#
+	@incremental
 	def triangle_esferic_aleatori(self,r=10):
 		"""
 		Draws a random spheric triangle in a sphere centered at origin with radius r